@@ -0,0 +1,104 @@
+# IMPORTANT DISCLAIMER
+# ====================
+# This project uses SYNTHETIC DATA for educational purposes.
+# Data does NOT represent any real actual fleet performance.
+# All incidents, costs, and metrics are RANDOMLY GENERATED.
+
+"""
+Load test of the KPI HTTP service against localhost.
+Starts the server on generated events in a separate process and measures
+request latency of concurrent keep-alive clients on the reports (plain and
+conditional polls) and on filtered slices, against a p99 budget.
+Made for demonstration, testing, and learning purposes.
+
+Usage:
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --events 1000000 --clients 4 --requests 5000
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src import config
+from src.server import load_test
+
+# p99 latency budget per scenario
+LATENCY_BUDGET_MS = 1.0
+
+SCENARIOS = {
+    'reports': (['/kpis', '/aircraft', '/trend', '/kpis.csv'], False),
+    'reports (conditional)': (['/kpis', '/aircraft', '/trend', '/kpis.csv'], True),
+    'slices': (['/events?severity=Critical&limit=50', '/events?airport=GRU%20-%20Guarulhos&limit=50'], False)
+}
+
+def serve(num_events, seed, urls):
+    """
+    Serve generated events on a free port (child process).
+    
+    Args:
+        num_events (int): Events to generate
+        seed (int): Random seed
+        urls (Queue): Receives the server URL once it listens
+    """
+    from src.data_generator import SafetyEventGenerator
+    from src.server import KPIServer, MaterializedViews
+    
+    views = MaterializedViews(SafetyEventGenerator(seed=seed).generate_batch(num_events))
+    server = KPIServer(views, port=0, refresh_seconds=0)
+    urls.put(server.url)
+    server.serve_forever()
+
+def main(argv=None):
+    """
+    Run the load test.
+    
+    Args:
+        argv (list, optional): Command-line arguments
+    
+    Returns:
+        int: 0 when every scenario is within the budget, else 1
+    """
+    parser = argparse.ArgumentParser(description="Load test of the KPI HTTP service")
+    parser.add_argument('--events', type=int, default=100_000, help="events served")
+    parser.add_argument('--clients', type=int, default=config.SERVER_LOAD_CLIENTS,
+                        help="concurrent clients")
+    parser.add_argument('--requests', type=int, default=config.SERVER_LOAD_REQUESTS,
+                        help="requests per client")
+    parser.add_argument('--budget-ms', type=float, default=LATENCY_BUDGET_MS, help="p99 budget")
+    args = parser.parse_args(argv)
+    
+    urls = multiprocessing.Queue()
+    server = multiprocessing.Process(
+        target=serve, args=(args.events, config.RANDOM_SEED, urls), daemon=True
+    )
+    server.start()
+    try:
+        url = urls.get(timeout=120)
+        print(f"Serving {args.events} events on {url}; "
+              f"{args.clients} clients x {args.requests} requests (CPUs: {os.cpu_count()})")
+        print(f"{'scenario':<22} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>7}")
+        
+        within_budget = True
+        for name, (paths, conditional) in SCENARIOS.items():
+            # Warm-up: fills the slice cache and the connection threads
+            load_test(url, paths, args.clients, 20, conditional)
+            result = load_test(url, paths, args.clients, args.requests, conditional)
+            ok = result['errors'] == 0 and result['latency_ms_p99'] <= args.budget_ms
+            within_budget &= ok
+            print(f"{name:<22} {result['requests_per_second']:>10,.0f} {result['latency_ms_p50']:>8.3f} "
+                  f"{result['latency_ms_p99']:>8.3f} {result['latency_ms_max']:>8.3f} "
+                  f"{result['errors']:>7}{'' if ok else '  over budget'}")
+    finally:
+        server.terminate()
+        server.join()
+    
+    print(f"\n p99 budget {args.budget_ms} ms: {'met' if within_budget else 'NOT met'}")
+    return 0 if within_budget else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,490 @@
+# IMPORTANT DISCLAIMER
+# ====================
+# This project uses SYNTHETIC DATA for educational purposes.
+# Data does NOT represent any real actual fleet performance.
+# All incidents, costs, and metrics are RANDOMLY GENERATED.
+
+"""
+Benchmark suite for the generator, scorer, analyzer, exporters and pipeline.
+Runs each stage at several dataset sizes, appends the results to a JSON
+history and flags regressions against stored baselines.
+Made for demonstration, testing, and learning purposes.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --sizes 1000 100000 1000000 --stages score analyze
+    python benchmarks/run_benchmarks.py --save-baseline
+    python benchmarks/run_benchmarks.py --tolerance 0.10
+    python benchmarks/run_benchmarks.py --stages startup
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+from src import config
+from src.analyzers import PartitionedSafetyAnalyzer, SafetyAnalyzer
+from src.data_generator import SafetyEventGenerator
+from src.exporters import DataExporter
+from src.loaders import DataLoader
+from src.risk_calculator import RiskCalculator
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+STAGES = [
+    'startup', 'generate_event', 'generate_batch', 'score', 'analyze',
+    'export_csv', 'export_excel', 'export_parquet', 'load_csv', 'load_parquet',
+    'analyze_partitioned', 'pipeline'
+]
+
+# Largest size the slow stages run at unless --no-limits is given
+SIZE_LIMITS = {
+    'generate_event': 100_000,
+    'export_excel': 100_000,
+    'pipeline': 1_000_000
+}
+
+HISTORY_FILE = os.path.join(ROOT, 'benchmarks', 'history.jsonl')
+BASELINE_FILE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+DEFAULT_TOLERANCE = 0.25
+
+# Cold start of the CLI ('python main.py --help' in a new interpreter): the
+# stated budget, checked on every run that includes the 'startup' stage
+STARTUP_COMMAND = [sys.executable, os.path.join(ROOT, 'main.py'), '--help']
+STARTUP_BUDGET_SECONDS = 0.2
+STARTUP_RUNS = 5
+
+# Measure each run in a forked child: its peak resident memory (VmHWM)
+# starts from its own size at fork, so one untraced run gives both time and
+# peak memory, native allocations included. Elsewhere tracemalloc is used.
+FORK_MEASUREMENT = hasattr(os, 'fork') and os.path.exists('/proc/self/status')
+
+def _memory_mb(field):
+    """
+    Read a memory field of this process from /proc/self/status.
+    
+    Args:
+        field (str): 'VmRSS' (current) or 'VmHWM' (peak)
+    
+    Returns:
+        float: Size in MB
+    """
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(f'{field}:'):
+                return int(line.split()[1]) / 1024
+    raise OSError(f"{field} not found in /proc/self/status")
+
+def _run_in_child(func):
+    """
+    Run a function once in a forked child process.
+    
+    Args:
+        func (callable): Function to measure
+    
+    Returns:
+        dict: 'seconds' and 'peak_mb' (peak increase of resident memory)
+    """
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        try:
+            start_mb = _memory_mb('VmRSS')
+            started = time.perf_counter()
+            func()
+            result = {
+                'seconds': time.perf_counter() - started,
+                'peak_mb': _memory_mb('VmHWM') - start_mb
+            }
+        except BaseException as e:
+            result = {'error': f'{type(e).__name__}: {e}', 'import_error': isinstance(e, ImportError)}
+        with os.fdopen(write_fd, 'w') as f:
+            json.dump(result, f)
+        os._exit(0)
+    
+    os.close(write_fd)
+    with os.fdopen(read_fd) as f:
+        payload = f.read()
+    os.waitpid(pid, 0)
+    
+    result = json.loads(payload) if payload else {'error': 'benchmark process died', 'import_error': False}
+    if 'error' in result:
+        raise (ImportError if result['import_error'] else RuntimeError)(result['error'])
+    return result
+
+def measure(func, repeat=1, memory=True):
+    """
+    Time a function and measure its peak memory.
+    
+    With FORK_MEASUREMENT every run happens in a fresh child process and
+    reports its time and peak resident memory increase. Otherwise runs are
+    timed in process, and peak memory comes from one extra run under
+    tracemalloc (Python and NumPy allocations only).
+    
+    Args:
+        func (callable): Function to measure
+        repeat (int): Runs (the best one is kept)
+        memory (bool): Report peak memory
+    
+    Returns:
+        dict: 'seconds' and 'peak_mb' (None when memory is False)
+    """
+    if FORK_MEASUREMENT:
+        runs = [_run_in_child(func) for _ in range(repeat)]
+        return {
+            'seconds': min(run['seconds'] for run in runs),
+            'peak_mb': min(run['peak_mb'] for run in runs) if memory else None
+        }
+    
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+    
+    peak_mb = None
+    if memory:
+        tracemalloc.start()
+        try:
+            func()
+            peak_mb = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+        finally:
+            tracemalloc.stop()
+    
+    return {'seconds': min(times), 'peak_mb': peak_mb}
+
+def measure_startup(runs=STARTUP_RUNS):
+    """
+    Time the cold start of the CLI in fresh interpreters.
+    
+    Args:
+        runs (int): Runs (the best one is kept)
+    
+    Returns:
+        dict: Result for stage 'startup' (size 0)
+    """
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(STARTUP_COMMAND, cwd=ROOT, capture_output=True, check=True)
+        times.append(time.perf_counter() - started)
+    return {
+        'stage': 'startup',
+        'size': 0,
+        'seconds': round(min(times), 4),
+        'peak_mb': None,
+        'rows_per_sec': None
+    }
+
+def run_pipeline(size, folder):
+    """
+    Run main.py end to end with the stage cache and run metrics disabled.
+    
+    Args:
+        size (int): Number of events
+        folder (str): Working folder for the outputs
+    """
+    # Imported here so that only the pipeline benchmark loads the CLI module
+    import main as pipeline
+    
+    settings = {'NUM_EVENTS': size, 'CACHE_ENABLED': False, 'METRICS_ENABLED': False}
+    previous = {name: getattr(config, name) for name in settings}
+    cwd = os.getcwd()
+    try:
+        for name, value in settings.items():
+            setattr(config, name, value)
+        os.chdir(folder)
+        with contextlib.redirect_stdout(io.StringIO()):
+            if pipeline.main([]) != 0:
+                raise RuntimeError("Pipeline run failed")
+    finally:
+        os.chdir(cwd)
+        for name, value in previous.items():
+            setattr(config, name, value)
+
+def stage_functions(size, folder, stages=STAGES):
+    """
+    Build the function measured for each stage at one size.
+    
+    Inputs (raw and scored events, and the files read by the load stages)
+    are prepared once and are not part of the measurements of the stages
+    that consume them.
+    
+    Args:
+        size (int): Number of events
+        folder (str): Folder for exported files
+        stages (list): Stages that will run (input files are only written
+            for the load stages among them)
+    
+    Returns:
+        dict: Stage name -> callable
+    """
+    # Import lazily loaded modules up front so no stage pays for them
+    for module in ('openpyxl', 'pyarrow.parquet'):
+        try:
+            __import__(module)
+        except ImportError:
+            pass
+    
+    seed = config.RANDOM_SEED
+    raw = SafetyEventGenerator(seed=seed).generate_batch(size)
+    scored = RiskCalculator.add_classification(RiskCalculator.add_scores_to_dataframe(raw.copy()))
+    reports = SafetyAnalyzer(scored, copy=False).compute_all_reports()
+    
+    def score():
+        df = RiskCalculator.add_scores_to_dataframe(raw.copy())
+        RiskCalculator.add_classification(df)
+    
+    inputs = {
+        'load_csv': os.path.join(folder, 'input.csv'),
+        'load_parquet': os.path.join(folder, 'input_parquet')
+    }
+    with contextlib.redirect_stdout(io.StringIO()):
+        if 'load_csv' in stages:
+            DataExporter.export_csv(scored, inputs['load_csv'])
+        if 'load_parquet' in stages or 'analyze_partitioned' in stages:
+            try:
+                DataExporter.export_parquet(scored, folder=inputs['load_parquet'])
+            except ImportError:
+                pass
+    
+    return {
+        'generate_event': lambda: SafetyEventGenerator(seed=seed).generate_all_events(size),
+        'generate_batch': lambda: SafetyEventGenerator(seed=seed).generate_batch(size),
+        'score': score,
+        'analyze': lambda: SafetyAnalyzer(scored, copy=False).compute_all_reports(),
+        'export_csv': lambda: DataExporter.export_csv(scored, os.path.join(folder, 'events.csv')),
+        'export_excel': lambda: DataExporter.export_excel(
+            scored, reports['kpis'], reports['aircraft_analysis'], reports['time_trend'],
+            path=os.path.join(folder, 'events.xlsx')
+        ),
+        'export_parquet': lambda: DataExporter.export_parquet(
+            scored, folder=os.path.join(folder, 'events_parquet')
+        ),
+        'load_csv': lambda: DataLoader.load_csv(inputs['load_csv']),
+        'load_parquet': lambda: DataLoader.load_parquet(inputs['load_parquet']),
+        'analyze_partitioned': lambda: PartitionedSafetyAnalyzer(inputs['load_parquet']).run(),
+        'pipeline': lambda: run_pipeline(size, folder)
+    }
+
+def run_suite(sizes, stages, repeat=1, memory=True, limits=None):
+    """
+    Measure every stage at every size.
+    
+    Args:
+        sizes (list): Dataset sizes
+        stages (list): Stage names
+        repeat (int): Timed runs per measurement
+        memory (bool): Measure peak memory
+        limits (dict, optional): Stage -> largest size to run it at
+    
+    Returns:
+        list: One result dict per (stage, size)
+    """
+    limits = SIZE_LIMITS if limits is None else limits
+    results = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as folder:
+            functions = stage_functions(size, folder, stages)
+            for stage in stages:
+                if size > limits.get(stage, size):
+                    print(f"  {stage:<19} {size:>10,}  skipped (limit {limits[stage]:,})")
+                    continue
+                
+                try:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        result = measure(functions[stage], repeat, memory)
+                except ImportError as e:
+                    print(f"  {stage:<19} {size:>10,}  skipped ({e})")
+                    continue
+                
+                result = {
+                    'stage': stage,
+                    'size': size,
+                    'seconds': round(result['seconds'], 4),
+                    'peak_mb': None if result['peak_mb'] is None else round(result['peak_mb'], 1),
+                    'rows_per_sec': round(size / result['seconds'], 1)
+                }
+                results.append(result)
+                peak = '' if result['peak_mb'] is None else f"{result['peak_mb']:>9.1f} MB"
+                print(
+                    f"  {stage:<19} {size:>10,}  {result['seconds']:>9.3f} s"
+                    f"  {result['rows_per_sec']:>13,.0f} rows/s  {peak}"
+                )
+    return results
+
+def environment():
+    """
+    Describe the machine and code version the results belong to.
+    
+    Returns:
+        dict: Commit, Python/NumPy/pandas versions, platform, CPU count and
+            how memory was measured
+    """
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'memory_method': 'peak RSS (fork)' if FORK_MEASUREMENT else 'tracemalloc'
+    }
+
+def append_history(record, path=None):
+    """
+    Append a run to the JSON Lines history.
+    
+    Args:
+        record (dict): Run record
+        path (str, optional): History file (default HISTORY_FILE)
+    """
+    with open(path or HISTORY_FILE, 'a') as f:
+        f.write(json.dumps(record) + '\n')
+
+def load_baseline(path=None):
+    """
+    Read the stored baselines.
+    
+    Args:
+        path (str, optional): Baseline file (default BASELINE_FILE)
+    
+    Returns:
+        dict: 'stage@size' -> result (empty if there is no baseline)
+    """
+    try:
+        with open(path or BASELINE_FILE) as f:
+            return json.load(f)['results']
+    except (OSError, ValueError, KeyError):
+        return {}
+
+def save_baseline(record, path=None):
+    """
+    Store a run as the new baseline, keeping entries it did not measure.
+    
+    Args:
+        record (dict): Run record
+        path (str, optional): Baseline file (default BASELINE_FILE)
+    """
+    results = load_baseline(path)
+    for result in record['results']:
+        results[f"{result['stage']}@{result['size']}"] = result
+    
+    with open(path or BASELINE_FILE, 'w') as f:
+        json.dump({'environment': record['environment'], 'results': results}, f, indent=2)
+
+def find_regressions(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compare results with the baselines.
+    
+    A result regresses when its time or peak memory exceeds the baseline
+    by more than the tolerance (0.25 = 25%).
+    
+    Args:
+        results (list): Results of this run
+        baseline (dict): Stored baselines
+        tolerance (float): Allowed relative increase
+    
+    Returns:
+        list: Descriptions of the regressions
+    """
+    regressions = []
+    for result in results:
+        reference = baseline.get(f"{result['stage']}@{result['size']}")
+        if not reference:
+            continue
+        for metric in ('seconds', 'peak_mb'):
+            current, previous = result.get(metric), reference.get(metric)
+            if current is None or not previous:
+                continue
+            if current > previous * (1 + tolerance):
+                regressions.append(
+                    f"{result['stage']} @ {result['size']:,}: {metric} "
+                    f"{previous} -> {current} (+{current / previous - 1:.0%})"
+                )
+    return regressions
+
+def main(argv=None):
+    """
+    Run the benchmark suite from the command line.
+    
+    Returns:
+        int: 0, or 1 if a regression was found or startup is over budget
+    """
+    parser = argparse.ArgumentParser(description="Flight safety benchmark suite")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES)
+    parser.add_argument('--repeat', type=int, default=1, help="timed runs per measurement (best is kept)")
+    parser.add_argument('--no-memory', action='store_true', help="do not report peak memory")
+    parser.add_argument('--no-limits', action='store_true', help="run slow stages at every size")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--history', default=HISTORY_FILE)
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--save-baseline', action='store_true', help="store this run as the baseline")
+    args = parser.parse_args(argv)
+    
+    print(f"  {'stage':<19} {'size':>10}  {'time':>11}  {'throughput':>20}  {'peak':>12}")
+    results = []
+    if 'startup' in args.stages:
+        results.append(measure_startup(max(args.repeat, STARTUP_RUNS)))
+        print(f"  {'startup':<19} {'-':>10}  {results[0]['seconds']:>9.3f} s"
+              f"  (budget {STARTUP_BUDGET_SECONDS} s)")
+    results += run_suite(
+        args.sizes,
+        [stage for stage in args.stages if stage != 'startup'],
+        repeat=args.repeat, memory=not args.no_memory,
+        limits={} if args.no_limits else SIZE_LIMITS
+    )
+    record = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'environment': environment(),
+        'results': results
+    }
+    append_history(record, args.history)
+    print(f"\n Results appended to {args.history}")
+    
+    over_budget = [
+        f"startup: {result['seconds']} s over the {STARTUP_BUDGET_SECONDS} s budget"
+        for result in results
+        if result['stage'] == 'startup' and result['seconds'] > STARTUP_BUDGET_SECONDS
+    ]
+    if args.save_baseline:
+        save_baseline(record, args.baseline)
+        print(f" Baseline saved: {args.baseline}")
+        regressions = over_budget
+    else:
+        regressions = find_regressions(results, load_baseline(args.baseline), args.tolerance)
+        regressions += over_budget
+    
+    if regressions:
+        print(f"\n REGRESSIONS (tolerance {args.tolerance:.0%}):")
+        for regression in regressions:
+            print(f"   - {regression}")
+        return 1
+    print(f" No regressions (tolerance {args.tolerance:.0%})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -10,16 +10,29 @@ Orchestrates data generation, analysis, and export.
 Made for demonstration, testing, and learning purposes.
 
 Usage:
-    python main.py
+    python main.py                            # full pipeline
+    python main.py analyze --events 100000    # one stage: generate, score,
+    python main.py --help                     # analyze, export or summary
+    python main.py --input data/flight_safety_data.csv    # existing dataset
+    python main.py append --events 1200       # add a day of events
+
+NumPy, pandas and the package modules built on them are imported by the
+functions that need them (openpyxl only when Excel output is written), so
+the CLI starts without paying for them.
 """
 
+import argparse
+import os
 import sys
-from src import config
-from src.data_generator import SafetyEventGenerator
-from src.risk_calculator import RiskCalculator
-from src.analyzers import SafetyAnalyzer
-from src.exporters import DataExporter
-import pandas as pd
+from src import config, metrics
+from src.cache import ResultCache, stage_keys
+
+# Cached analysis results, and the outputs written from the event rows
+REPORT_STAGES = ['kpis', 'aircraft', 'trend', 'summary']
+MAIN_DATA_OUTPUTS = ['csv', 'excel', 'parquet', 'partials']
+
+# Output format option -> config flag
+OUTPUT_FORMATS = {'csv': 'EXPORT_CSV', 'excel': 'EXPORT_EXCEL', 'parquet': 'EXPORT_PARQUET'}
 
 def display_header():
     """Display program header."""
@@ -28,6 +41,25 @@ def display_header():
     print("=" * 70)
     print()
 
+def summarize_events(df):
+    """
+    Collect the counts shown in the data summary.
+    
+    Args:
+        df (DataFrame): Complete data
+    
+    Returns:
+        dict: Arguments of display_summary_counts (except kpis)
+    """
+    return {
+        'first_date': df['timestamp'].min(),
+        'last_date': df['timestamp'].max(),
+        'total': len(df),
+        'severity_counts': df['severity'].value_counts(),
+        'status_counts': df['status'].value_counts(),
+        'model_counts': df['aircraft_model'].value_counts()
+    }
+
 def display_data_summary(df, kpis):
     """
     Display statistical summary of generated data.
@@ -36,21 +68,37 @@ def display_data_summary(df, kpis):
         df (DataFrame): Complete data
         kpis (dict): Calculated KPIs
     """
+    display_summary_counts(kpis=kpis, **summarize_events(df))
+
+def display_summary_counts(first_date, last_date, total, severity_counts,
+                           status_counts, model_counts, kpis):
+    """
+    Display statistical summary from precomputed counts.
+    
+    Args:
+        first_date (Timestamp): Timestamp of the first event
+        last_date (Timestamp): Timestamp of the last event
+        total (int): Total events
+        severity_counts (Series): Events by severity
+        status_counts (Series): Events by status
+        model_counts (Series): Events by aircraft model
+        kpis (dict): Calculated KPIs
+    """
     print("\n" + "=" * 70)
     print("  GENERATED DATA SUMMARY")
     print("=" * 70)
     
-    print(f"\nPeriod: {df['date'].min()} to {df['date'].max()}")
-    print(f" Total events: {len(df)}")
+    print(f"\nPeriod: {first_date:%Y-%m-%d} to {last_date:%Y-%m-%d}")
+    print(f" Total events: {total}")
     
     print(f"\n SEVERITY:")
-    print(df['severity'].value_counts().to_string())
+    print(severity_counts.to_string())
     
     print(f"\n STATUS:")
-    print(df['status'].value_counts().to_string())
+    print(status_counts.to_string())
     
     print(f"\n BY MODEL:")
-    print(df['aircraft_model'].value_counts().to_string())
+    print(model_counts.to_string())
     
     print(f"\n Total Cost: ${kpis['total_cost_usd']:,.2f}")
     print(f" Average Resolution Time: {kpis['avg_resolution_time']} days")
@@ -59,55 +107,596 @@ def display_data_summary(df, kpis):
     
     print("\n" + "=" * 70)
 
-def main():
-    """Main execution function."""
+def run_streaming():
+    """
+    Run the pipeline chunk by chunk.
+    
+    Each chunk is generated, scored, appended to the main CSV and folded
+    into the running aggregates before the next one is generated, so peak
+    memory is bounded by config.CHUNK_SIZE. Outputs are written to
+    temporary paths and published as one snapshot at the end.
+    """
+    from src.analyzers import StreamingSafetyAnalyzer
+    from src.data_generator import SafetyEventGenerator
+    from src.exporters import DataExporter, ExportCoordinator, StreamingExcelWriter
+    from src.risk_calculator import RiskCalculator
+    
+    if config.INPUT_FILE:
+        raise ValueError("INPUT_FILE is not supported in streaming mode")
+    
+    print(f" Streaming {config.NUM_EVENTS} events in chunks of {config.CHUNK_SIZE}...")
+    generator = SafetyEventGenerator(seed=config.RANDOM_SEED)
+    analyzer = StreamingSafetyAnalyzer()
+    DataExporter.ensure_folder_exists()
+    ExportCoordinator.remove_stale_temps()
+    coordinator = ExportCoordinator()
+    
     try:
-        display_header()
-        
-        # Generate raw data
-        print(" Step 1/5: Generating safety events...")
-        generator = SafetyEventGenerator(seed=config.RANDOM_SEED)
-        events = generator.generate_all_events(config.NUM_EVENTS)
-        df = pd.DataFrame(events)
-        print(f" {len(df)} events generated successfully!")
+        csv_path = coordinator.temp_path(config.MAIN_DATA_FILE) if config.EXPORT_CSV else None
+        parquet_folder = (
+            coordinator.temp_path(config.PARQUET_FOLDER) if config.EXPORT_PARQUET else None
+        )
+        excel = (
+            StreamingExcelWriter(coordinator.temp_path(config.EXCEL_FILE))
+            if config.EXPORT_EXCEL else None
+        )
         
-        # Calculate risk scores
-        print("\n Step 2/5: Calculating risk scores...")
-        df = RiskCalculator.add_scores_to_dataframe(df)
-        df = RiskCalculator.add_classification(df)
-        print(" Risk scores calculated!")
+        if config.COUNTER_GENERATION:
+            chunks = generator.generate_counter_chunks(config.NUM_EVENTS, config.CHUNK_SIZE)
+        else:
+            chunks = generator.generate_chunks(config.NUM_EVENTS, config.CHUNK_SIZE)
+        for i, chunk in enumerate(chunks):
+            with metrics.stage('pipeline.chunk', rows=len(chunk)):
+                chunk = RiskCalculator.add_scores_to_dataframe(chunk)
+                chunk = RiskCalculator.add_classification(chunk)
+                DataExporter.append_main_data(
+                    chunk, chunk_index=i, csv_path=csv_path, parquet_folder=parquet_folder
+                )
+                if excel:
+                    excel.append(chunk)
+                analyzer.update(chunk)
+            print(f" Chunk {i + 1}: {analyzer.partials['total_events']} events processed")
         
-        # Perform analysess
-        print("\n Step 3/5: Running statistical analyses...")
-        analyzer = SafetyAnalyzer(df)
         kpis = analyzer.calculate_main_kpis()
         aircraft_analysis = analyzer.analyze_by_aircraft()
         trend = analyzer.generate_time_trend()
-        print(" Analyses completed!")
-        
-        #Export data
-        print("\n Step 4/5: Exporting data...")
-        DataExporter.export_main_data(df)
-        DataExporter.export_kpis(kpis)
-        DataExporter.export_aircraft_analysis(aircraft_analysis)
-        DataExporter.export_trend(trend)
-        print(" All files exported!")
-        
-        # Display summary
-        print("\n Step 5/5: Generating summary...")
-        display_data_summary(df, kpis)
+        if excel:
+            excel.add_reports(kpis, aircraft_analysis, trend)
+            excel.close()
+        DataExporter.export_kpis(kpis, coordinator.temp_path(config.KPIS_FILE))
+        DataExporter.export_aircraft_analysis(
+            aircraft_analysis, coordinator.temp_path(config.AIRCRAFT_ANALYSIS_FILE)
+        )
+        DataExporter.export_trend(trend, coordinator.temp_path(config.TREND_FILE))
+        DataExporter.export_partials(analyzer.partials, coordinator.temp_path(config.PARTIALS_FILE))
+    except BaseException:
+        coordinator.abort()
+        raise
+    
+    coordinator.commit(total_events=analyzer.partials['total_events'])
+    
+    p = analyzer.partials
+    display_summary_counts(
+        p['first_date'], p['last_date'], p['total_events'],
+        p['severity_counts'].astype(int).sort_values(ascending=False),
+        p['status_counts'].astype(int).sort_values(ascending=False),
+        p['aircraft']['total_events'].astype(int).sort_values(ascending=False),
+        kpis
+    )
+    
+    print("\n PROCESS COMPLETED SUCCESSFULLY!")
+
+def run_append():
+    """
+    Add new events to the current snapshot without reprocessing it.
+    
+    The new events (config.APPEND_EVENTS generated for the day of END_DATE,
+    or the events of config.INPUT_FILE) are numbered after the last stored
+    event_id and scored. The reports come from the stored partial
+    aggregates merged with those of the new events, and
+    ExportCoordinator.append only adds the new rows to the outputs, so the
+    cost follows the number of new events rather than the dataset size.
+    """
+    import numpy as np
+    from src.analyzers import StreamingSafetyAnalyzer
+    from src.exporters import ExportCoordinator
+    from src.loaders import DataLoader
+    
+    analyzer = StreamingSafetyAnalyzer()
+    analyzer.partials = DataLoader.load_partials()
+    last_event_id = analyzer.partials['last_event_id']
+    
+    print(f" Step 1/4: Adding events after {analyzer.partials['total_events']} stored events...")
+    with metrics.stage('pipeline.generate') as record:
+        if config.INPUT_FILE:
+            df = DataLoader.load(config.INPUT_FILE)
+            df['event_id'] = np.arange(last_event_id + 1, last_event_id + len(df) + 1, dtype=np.uint32)
+        else:
+            from src.data_generator import SafetyEventGenerator
+            
+            num_events = config.APPEND_EVENTS or max(
+                round(config.NUM_EVENTS / (config.PERIOD_DAYS + 1)), 1
+            )
+            # A different stream for every append, reproducible from the seed
+            seed = int(np.random.SeedSequence([config.RANDOM_SEED, last_event_id]).generate_state(1)[0])
+            df = SafetyEventGenerator(seed=seed).generate_day(num_events, first_index=last_event_id)
+        record['rows'] = len(df)
+    if df.empty:
+        print(" No new events")
+        return
+    print(f" {len(df)} new events (EVT{last_event_id + 1:04d} to EVT{last_event_id + len(df):04d})")
+    
+    print("\n Step 2/4: Calculating risk scores of the new events...")
+    with metrics.stage('pipeline.score', rows=len(df)):
+        df = score_events(df)
+    
+    print("\n Step 3/4: Merging the new aggregates...")
+    with metrics.stage('pipeline.analyze', rows=len(df)):
+        analyzer.update(df)
+        kpis = analyzer.calculate_main_kpis()
+        aircraft_analysis = analyzer.analyze_by_aircraft()
+        trend = analyzer.generate_time_trend()
+    
+    print("\n Step 4/4: Updating the exported files...")
+    with metrics.stage('pipeline.export', rows=len(df)):
+        ExportCoordinator().append(df, kpis, aircraft_analysis, trend, analyzer.partials)
+    
+    print(f"\n Total events: {kpis['total_events']}")
+    print(f" Safety Rate: {kpis['safety_rate']}%")
+    print("\n PROCESS COMPLETED SUCCESSFULLY!")
+
+def generate_events():
+    """
+    Generate the raw events with the configured generator, or load them
+    from config.INPUT_FILE when it is set.
+    
+    Returns:
+        DataFrame: Events in the compact schema
+    """
+    if config.INPUT_FILE:
+        from src.loaders import DataLoader
+        return DataLoader.load(config.INPUT_FILE)
+    
+    from src.data_generator import SafetyEventGenerator
+    
+    generator = SafetyEventGenerator(seed=config.RANDOM_SEED)
+    if config.COUNTER_GENERATION:
+        return generator.generate_counter(config.NUM_EVENTS)
+    if config.NUM_SHARDS > 1:
+        return generator.generate_sharded(config.NUM_EVENTS)
+    if config.BATCH_GENERATION:
+        return generator.generate_batch(config.NUM_EVENTS)
+    
+    import pandas as pd
+    from src import schema
+    events = generator.generate_all_events(config.NUM_EVENTS)
+    return schema.to_compact(pd.DataFrame(events))
+
+def score_events(df):
+    """
+    Add risk scores and classifications.
+    
+    Args:
+        df (DataFrame): Raw events
+    
+    Returns:
+        DataFrame: Scored events
+    """
+    from src.risk_calculator import RiskCalculator
+    
+    df = RiskCalculator.add_scores_to_dataframe(df)
+    return RiskCalculator.add_classification(df)
+
+def load_events(cache, keys):
+    """
+    Generate (or read from config.INPUT_FILE) the raw events, or load
+    them from the stage cache.
+    
+    Args:
+        cache (ResultCache): Stage cache
+        keys (dict): Stage keys
+    
+    Returns:
+        DataFrame: Raw events
+    """
+    df = cache.get('generate', keys['generate'])
+    if df is not None:
+        print(f" {len(df)} events loaded from cache")
+        return df
+    
+    with metrics.stage('pipeline.generate') as record:
+        df = generate_events()
+        cache.put('generate', keys['generate'], df)
+        record['rows'] = len(df)
+    if config.INPUT_FILE:
+        print(f" {len(df)} events loaded from {config.INPUT_FILE}")
+    else:
+        print(f" {len(df)} events generated successfully!")
+    return df
+
+def score_and_store(cache, keys, df):
+    """
+    Score raw events, or add the scores stored in the stage cache.
+    
+    Only the score columns are cached; the raw events are already cached
+    by the generate stage.
+    
+    Args:
+        cache (ResultCache): Stage cache
+        keys (dict): Stage keys
+        df (DataFrame): Raw events
+    
+    Returns:
+        DataFrame: Scored events
+    """
+    scores = cache.get('score', keys['score'])
+    if scores is not None:
+        print(" Risk scores loaded from cache")
+        return df.join(scores)
+    
+    from src import schema
+    
+    with metrics.stage('pipeline.score', rows=len(df)):
+        df = score_events(df)
+        cache.put('score', keys['score'], df[list(schema.SCORE_SCHEMA)])
+    print(" Risk scores calculated!")
+    return df
+
+def load_scored_events(cache, keys):
+    """
+    Get the scored events, running generation and scoring on a cache miss.
+    
+    Args:
+        cache (ResultCache): Stage cache
+        keys (dict): Stage keys
+    
+    Returns:
+        DataFrame: Scored events
+    """
+    return score_and_store(cache, keys, load_events(cache, keys))
+
+def load_reports(cache, keys, reports=None, df=None):
+    """
+    Get every report, computing (and caching) the ones not in the cache.
+    
+    Args:
+        cache (ResultCache): Stage cache
+        keys (dict): Stage keys
+        reports (dict, optional): Reports already looked up (None = missing)
+        df (DataFrame, optional): Scored events, loaded if a report is missing
+    
+    Returns:
+        dict: Stage name -> report ('kpis', 'aircraft', 'trend', 'summary')
+    """
+    if reports is None:
+        reports = {stage: cache.get(stage, keys[stage]) for stage in REPORT_STAGES}
+    if all(report is not None for report in reports.values()):
+        print(" Analyses are unchanged (cached)")
+        return reports
+    
+    from src.analyzers import SafetyAnalyzer
+    
+    if df is None:
+        df = load_scored_events(cache, keys)
+    with metrics.stage('pipeline.analyze', rows=len(df)):
+        analyzer = SafetyAnalyzer(df, copy=False)
+        compute = {
+            'kpis': analyzer.calculate_main_kpis,
+            'aircraft': analyzer.analyze_by_aircraft,
+            'trend': analyzer.generate_time_trend,
+            'summary': lambda: summarize_events(df)
+        }
+        for stage, report in reports.items():
+            if report is None:
+                reports[stage] = compute[stage]()
+                cache.put(stage, keys[stage], reports[stage])
+    print(" Analyses completed!")
+    return reports
+
+def run_batch(show_summary=True):
+    """
+    Run the pipeline on the whole dataset, reusing cached stage results.
+    
+    Args:
+        show_summary (bool): Display the data summary after exporting
+    """
+    from src.exporters import ExportCoordinator
+    
+    steps = 5 if show_summary else 4
+    
+    # Stage results are reused when nothing they depend on changed
+    cache = ResultCache()
+    keys = stage_keys()
+    coordinator = ExportCoordinator()
+    reports = {stage: cache.get(stage, keys[stage]) for stage in REPORT_STAGES}
+    export_keys = keys['export'] if cache.enabled else None
+    needs_events = (
+        any(report is None for report in reports.values()) or
+        any(kind in MAIN_DATA_OUTPUTS for kind, _ in coordinator.stale_outputs(export_keys))
+    )
+    
+    # Generate raw data
+    source = "Loading" if config.INPUT_FILE else "Generating"
+    print(f" Step 1/{steps}: {source} safety events...")
+    df = None
+    if needs_events:
+        df = load_events(cache, keys)
         
-        print("\n PROCESS COMPLETED SUCCESSFULLY!")
-        print("\n Files generated in 'data/' folder:")
+        # Calculate risk scores
+        print(f"\n Step 2/{steps}: Calculating risk scores...")
+        df = score_and_store(cache, keys, df)
+    else:
+        print(" Events and risk scores are unchanged (cached)")
+        print(f"\n Step 2/{steps}: Calculating risk scores... skipped")
+    
+    # Perform analysess
+    print(f"\n Step 3/{steps}: Running statistical analyses...")
+    reports = load_reports(cache, keys, reports, df)
+    kpis = reports['kpis']
+    
+    #Export data
+    print(f"\n Step 4/{steps}: Exporting data...")
+    with metrics.stage('pipeline.export', rows=reports['summary']['total']):
+        coordinator.export(
+            df, kpis, reports['aircraft'], reports['trend'],
+            keys=export_keys, total_events=reports['summary']['total']
+        )
+    print(" All files exported!")
+    
+    # Display summary
+    if show_summary:
+        print(f"\n Step 5/{steps}: Generating summary...")
+        with metrics.stage('pipeline.summary'):
+            display_summary_counts(kpis=kpis, **reports['summary'])
+    
+    print("\n PROCESS COMPLETED SUCCESSFULLY!")
+    print("\n Files generated in 'data/' folder:")
+    if config.EXPORT_CSV:
         print("   - flight_safety_data.csv")
+    if config.EXPORT_EXCEL:
         print("   - flight_safety_data.xlsx")
-        print("   - safety_kpis.csv")
-        print("   - aircraft_analysis.csv")
-        print("   - monthly_trend.csv")
-        print("\n Next step: Import data into Power BI!")
+    if config.EXPORT_PARQUET:
+        print("   - flight_safety_data_parquet/")
+    print("   - safety_kpis.csv")
+    print("   - aircraft_analysis.csv")
+    print("   - monthly_trend.csv")
+    print("   - analysis_partials.pkl")
+    print("   - manifest.json")
+    if config.METRICS_ENABLED:
+        print(f"   - {os.path.basename(config.METRICS_FILE)}")
+    print("\n Next step: Import data into Power BI!")
+
+def command_run():
+    """Run the full pipeline (the default command)."""
+    if config.STREAMING:
+        run_streaming()
+    else:
+        run_batch()
+
+def command_append():
+    """Append new events to the exported dataset and update the reports."""
+    run_append()
+
+def command_generate():
+    """Generate the raw events (cached for the later stages)."""
+    load_events(ResultCache(), stage_keys())
+
+def command_score():
+    """Score the events and display the risk classification counts."""
+    df = load_scored_events(ResultCache(), stage_keys())
+    print(f"\n RISK CLASSIFICATION ({len(df)} events):")
+    print(df['risk_classification'].value_counts().to_string())
+
+def command_analyze():
+    """
+    Run the analyses and display the main KPIs.
+    
+    In streaming mode an INPUT_FILE dataset is analyzed out of core, one
+    partition and chunk at a time, instead of being loaded whole.
+    """
+    if config.STREAMING and config.INPUT_FILE:
+        from src.analyzers import PartitionedSafetyAnalyzer
         
-        return 0
+        kpis = PartitionedSafetyAnalyzer(config.INPUT_FILE).calculate_main_kpis()
+        print(f" {kpis['total_events']} events analyzed from {config.INPUT_FILE}")
+    else:
+        kpis = load_reports(ResultCache(), stage_keys())['kpis']
+    print("\n KPIS:")
+    for name, value in kpis.items():
+        print(f"   {name:<24} {value}")
+
+def command_export():
+    """Run every stage up to the exports, without the data summary."""
+    if config.STREAMING:
+        run_streaming()
+    else:
+        run_batch(show_summary=False)
+
+def command_summary():
+    """Display the data summary (from cached analyses when available)."""
+    reports = load_reports(ResultCache(), stage_keys())
+    display_summary_counts(kpis=reports['kpis'], **reports['summary'])
+
+def command_simulate():
+    """Display Monte Carlo confidence intervals of the KPIs."""
+    from src.simulation import KPISimulator
+    
+    simulator = KPISimulator()
+    print(f" Simulating {simulator.num_scenarios} fleet-years of "
+          f"{simulator.events_per_scenario} events...")
+    coverage = f"{config.MONTE_CARLO_CONFIDENCE:.0%}"
+    for by in ['fleet', 'aircraft_model', 'airport']:
+        summary = simulator.summary(by)[['mean', 'p50', 'ci_low', 'ci_high']]
+        print(f"\n KPI INTERVALS ({coverage}) - {by.upper().replace('_', ' ')}:")
+        print(summary.to_string(float_format=lambda value: f"{value:,.2f}"))
+
+def command_serve():
+    """
+    Serve the reports and event slices over HTTP until interrupted.
+    
+    Events come from config.INPUT_FILE or the published dataset (Parquet
+    when exported, else the CSV), which is polled for new data; without
+    either they are generated (through the stage cache) and never refreshed.
+    """
+    from src.server import KPIServer, MaterializedViews
+    
+    sources = [config.INPUT_FILE] if config.INPUT_FILE else [
+        path for path, enabled in [
+            (config.PARQUET_FOLDER, config.EXPORT_PARQUET), (config.MAIN_DATA_FILE, config.EXPORT_CSV)
+        ] if enabled and os.path.exists(path)
+    ]
+    if sources:
+        print(f" Loading {sources[0]}...")
+        views = MaterializedViews(source=sources[0])
+    else:
+        views = MaterializedViews(load_scored_events(ResultCache(), stage_keys()))
+    
+    server = KPIServer(views)
+    print(f" Serving {len(views.df)} events on {server.url} (Ctrl+C to stop)")
+    for path in ['/kpis', '/aircraft', '/trend', '/events?severity=Critical', '/status']:
+        print(f"   - {server.url}{path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n Server stopped")
+    finally:
+        server.server_close()
+
+COMMANDS = {
+    'run': (command_run, "run the full pipeline (default)"),
+    'generate': (command_generate, "generate the raw events"),
+    'score': (command_score, "calculate risk scores"),
+    'analyze': (command_analyze, "run the statistical analyses"),
+    'export': (command_export, "write every output file"),
+    'summary': (command_summary, "display the data summary"),
+    'append': (command_append, "add new events to the exported dataset"),
+    'simulate': (command_simulate, "simulate KPI confidence intervals"),
+    'serve': (command_serve, "serve the reports over HTTP")
+}
+
+def add_options(parser):
+    """
+    Add the options shared by every command.
+    
+    Args:
+        parser (ArgumentParser): Main parser or command parser
+    """
+    parser.add_argument('--events', type=int,
+                        help="number of events (NUM_EVENTS; APPEND_EVENTS for append)")
+    parser.add_argument('--seed', type=int, help="random seed (RANDOM_SEED)")
+    parser.add_argument('--scenarios', type=int,
+                        help="Monte Carlo fleet-years for simulate (MONTE_CARLO_SCENARIOS)")
+    parser.add_argument('--port', type=int, help="port of the serve command (SERVER_PORT)")
+    parser.add_argument('--input', metavar='PATH',
+                        help="analyze an existing CSV/XLSX/Parquet/Arrow dataset (INPUT_FILE)")
+    parser.add_argument('--reference-date', help="last day of the period, YYYY-MM-DD (REFERENCE_DATE)")
+    parser.add_argument('--formats', nargs='+', choices=list(OUTPUT_FORMATS),
+                        help="main data formats to export (EXPORT_CSV/EXCEL/PARQUET)")
+    parser.add_argument('--streaming', action='store_true', help="process in chunks of CHUNK_SIZE (STREAMING)")
+    parser.add_argument('--no-cache', action='store_true', help="ignore the stage cache")
+    parser.add_argument('--no-metrics', action='store_true', help="do not write run metrics")
+    parser.add_argument('--profile', metavar='STAGE', help="run a stage under cProfile (PROFILE_STAGE)")
+
+def build_parser():
+    """
+    Build the command-line parser.
+    
+    Options are accepted before or after the command. Command parsers do
+    not set defaults, so they never overwrite options given before the
+    command.
+    
+    Returns:
+        ArgumentParser: Parser
+    """
+    parser = argparse.ArgumentParser(description="Flight safety data generator")
+    add_options(parser)
+    commands = parser.add_subparsers(dest='command', metavar='command')
+    for name, (_, description) in COMMANDS.items():
+        command = commands.add_parser(
+            name, help=description, description=description,
+            argument_default=argparse.SUPPRESS
+        )
+        add_options(command)
+    return parser
+
+def apply_options(args):
+    """
+    Override config settings with the command-line options given.
+    
+    Args:
+        args (Namespace): Parsed arguments
+    """
+    overrides = {
+        'APPEND_EVENTS' if args.command == 'append' else 'NUM_EVENTS': args.events,
+        'RANDOM_SEED': args.seed,
+        'MONTE_CARLO_SCENARIOS': args.scenarios,
+        'SERVER_PORT': args.port,
+        'REFERENCE_DATE': args.reference_date,
+        'INPUT_FILE': args.input,
+        'STREAMING': True if args.streaming else None,
+        'PROFILE_STAGE': args.profile
+    }
+    for name, value in overrides.items():
+        if value is not None:
+            setattr(config, name, value)
+    
+    if args.formats:
+        for output_format, name in OUTPUT_FORMATS.items():
+            setattr(config, name, output_format in args.formats)
+    if args.no_cache:
+        config.CACHE_ENABLED = False
+    if args.no_metrics:
+        config.METRICS_ENABLED = False
+
+def display_timings(recorder):
+    """
+    Display wall and CPU time of the pipeline steps.
+    
+    Args:
+        recorder (MetricsRecorder): Recorder of the run
+    """
+    stages = recorder.report()['stages']
+    steps = [name for name in stages if name.startswith('pipeline')]
+    if not steps:
+        return
+    
+    print("\n TIMINGS:")
+    for name in steps:
+        values = stages[name]
+        rate = f"  {values['rows_per_sec']:>14,.0f} rows/s" if values['rows_per_sec'] else ""
+        print(f"   {name:<20} {values['wall_seconds']:>9.3f} s wall"
+              f" {values['cpu_seconds']:>9.3f} s cpu{rate}")
+
+def main(argv=None):
+    """
+    Main execution function.
+    
+    Args:
+        argv (list, optional): Command-line arguments (default sys.argv[1:])
+    
+    Returns:
+        int: Exit code
+    """
+    args = build_parser().parse_args(argv)
+    apply_options(args)
+    command = COMMANDS[args.command or 'run'][0]
+    
+    try:
+        display_header()
+        
+        with metrics.recording(
+            config.METRICS_ENABLED,
+            trace_memory=config.METRICS_TRACE_MEMORY,
+            profile_stage=config.PROFILE_STAGE
+        ) as recorder:
+            with metrics.stage('pipeline'):
+                command()
         
+        if recorder:
+            display_timings(recorder)
+            recorder.write()
+        return 0
+    
     except Exception as e:
         print(f"\n ERROR: {str(e)}", file=sys.stderr)
         return 1
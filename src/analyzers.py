@@ -10,25 +10,226 @@ Generates KPIs, trends, and insights from raw data.
 Made for demonstration, testing, and learning purposes.
 """
 
+import functools
+import numpy as np
+import os
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from . import config, metrics, schema
+from .loaders import DataLoader
+from .query import EventIndex
+from .risk_calculator import RiskCalculator
 
 class SafetyAnalyzer:
     """Safety data analyzer."""
     
-    def __init__(self, df):
+    def __init__(self, df, copy=True):
         """
         Initialize analyzer with DataFrame.
         
         Args:
-            df (DataFrame): Event data
+            df (DataFrame): Event data (compact schema or text layout)
+            copy (bool): Copy the caller's frame. With copy=False a compact
+                frame is read in place and never modified; derived columns
+                are kept on the analyzer instead of added to the frame.
         """
-        self.df = df.copy()
-        self._prepare_data()
+        if not schema.is_compact(df):
+            self.df = schema.to_compact(df)
+        else:
+            self.df = df.copy() if copy else df
+        self._derived = {}
+        self._reports = None
+        self._index = None
     
-    def _prepare_data(self):
-        """Prepare data by adding calculated columns."""
-        self.df['date_datetime'] = pd.to_datetime(self.df['date'])
-        self.df['week_of_year'] = self.df['date_datetime'].dt.isocalendar().week
+    def derived(self, name):
+        """
+        Get a derived column, computing it once on first use.
+        
+        Args:
+            name (str): One of schema.DERIVED_COLUMNS, 'date_datetime'
+                (alias of 'date') or 'week_of_year'
+        
+        Returns:
+            Series: Derived values, aligned with the event data
+        """
+        if name not in self._derived:
+            if name == 'date_datetime':
+                values = self.derived('date')
+            elif name == 'week_of_year':
+                values = self.derived('date').dt.isocalendar().week
+            else:
+                values = schema.derive(self.df, name)
+            self._derived[name] = values
+        return self._derived[name]
+    
+    @staticmethod
+    def _count_of(counts, categories, value):
+        """Get the count of one category from a bincount result."""
+        return int(counts[categories.get_loc(value)]) if value in categories else 0
+    
+    @staticmethod
+    def _mode_of(counts, categories):
+        """Get the most frequent category (ties resolve alphabetically, like Series.mode()[0])."""
+        return _mode_from_counts(pd.Series(counts, index=categories))
+    
+    @staticmethod
+    def _factorize(values):
+        """
+        Get integer codes and their labels for a grouping column.
+        
+        Categoricals use their own codes; other columns (e.g. text read
+        back from a file) are factorized in sorted order, like groupby.
+        
+        Args:
+            values (Series): Column values
+        
+        Returns:
+            tuple: Codes (ndarray, -1 for missing) and labels (Index)
+        """
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            return values.cat.codes.to_numpy(), values.cat.categories
+        codes, labels = pd.factorize(values, sort=True)
+        return codes, labels
+    
+    def compute_all_reports(self):
+        """
+        Compute every report in one fused pass over the data.
+        
+        The grouping keys are factorized once (categorical codes and month
+        numbers) and every count, sum and mode comes from np.bincount over
+        those codes, instead of repeated boolean-mask scans and groupbys.
+        Results are computed once and cached.
+        
+        Returns:
+            dict: 'kpis', 'aircraft_analysis', 'time_trend' and
+                'critical_patterns', as returned by the individual methods
+                ('critical_patterns' is None without High/Critical events)
+        
+        Raises:
+            ValueError: If there are no events
+        """
+        if self._reports is None:
+            self._reports = self._compute_reports()
+        return self._reports
+    
+    @metrics.instrument('analyze.reports', rows=lambda self: len(self.df))
+    def _compute_reports(self):
+        """Run the fused pass of compute_all_reports."""
+        df = self.df
+        total = len(df)
+        if not total:
+            raise ValueError("No events to analyze")
+        
+        # Factorize grouping keys once
+        categories = {}
+        codes = {}
+        for column in ['severity', 'status', 'aircraft_model', 'incident_type',
+                       'flight_phase', 'airport']:
+            codes[column], categories[column] = self._factorize(df[column])
+        
+        def count(column, mask=None):
+            column_codes = codes[column] if mask is None else codes[column][mask]
+            return np.bincount(
+                column_codes[column_codes >= 0], minlength=len(categories[column])
+            )
+        
+        # Main KPIs
+        severity_counts = count('severity')
+        status_counts = count('status')
+        critical = self._count_of(severity_counts, categories['severity'], 'Critical')
+        high = self._count_of(severity_counts, categories['severity'], 'High')
+        resolution = df['resolution_days']
+        resolution_valid = resolution.notna().to_numpy()
+        resolution_values = resolution.to_numpy(dtype=np.float64, na_value=np.nan)
+        model_counts = count('aircraft_model')
+        
+        kpis = {
+            'total_events': total,
+            'critical_events': critical,
+            'high_events': high,
+            'safety_rate': round((1 - (critical + high) / total) * 100, 2),
+            'total_injuries': int(df['injuries'].sum()),
+            'avg_resolution_time': (
+                round(float(resolution_values[resolution_valid].mean()), 1)
+                if resolution_valid.any() else np.nan
+            ),
+            'total_cost_usd': round(df['estimated_cost_usd'].sum(), 2),
+            'pending_events': (
+                self._count_of(status_counts, categories['status'], 'Under Investigation') +
+                self._count_of(status_counts, categories['status'], 'Corrective Action')
+            ),
+            'most_incidents_model': self._mode_of(model_counts, categories['aircraft_model']),
+            'most_common_type': self._mode_of(count('incident_type'), categories['incident_type'])
+        }
+        
+        # Analysis by aircraft model
+        model_codes = codes['aircraft_model']
+        valid = model_codes >= 0
+        size = len(categories['aircraft_model'])
+        
+        def model_sum(values, mask=valid):
+            return np.bincount(model_codes[mask], weights=values[mask], minlength=size)
+        
+        with_resolution = valid & resolution_valid
+        resolution_counts = np.bincount(model_codes[with_resolution], minlength=size)
+        resolution_means = pd.array(
+            model_sum(resolution_values, with_resolution) / np.maximum(resolution_counts, 1),
+            dtype='Float64'
+        )
+        resolution_means[resolution_counts == 0] = pd.NA
+        
+        observed = model_counts > 0
+        aircraft_analysis = pd.DataFrame({
+            'total_events': model_counts[observed].astype(np.int64),
+            'risk_score': (
+                model_sum(df['risk_score'].to_numpy(dtype=np.float64)) / np.maximum(model_counts, 1)
+            )[observed],
+            'estimated_cost_usd': model_sum(df['estimated_cost_usd'].to_numpy())[observed],
+            'resolution_days': resolution_means[observed]
+        }, index=pd.Index(
+            categories['aircraft_model'][observed], name='aircraft_model'
+        ).astype(df['aircraft_model'].dtype)).round(2)
+        
+        # Monthly trend (months since 1970-01)
+        months = df['timestamp'].to_numpy().astype('datetime64[M]').astype(np.int64)
+        first_month = months.min() if total else 0
+        month_counts = np.bincount(months - first_month)
+        present = np.flatnonzero(month_counts) + first_month
+        time_trend = pd.DataFrame({
+            'year': (present // 12 + 1970).astype(np.int16),
+            'month': (present % 12 + 1).astype(np.int8),
+            'events': month_counts[month_counts > 0].astype(np.int64)
+        })
+        time_trend['year_month'] = (
+            time_trend['year'].astype(str) + '-' + 
+            time_trend['month'].astype(str).str.zfill(2)
+        )
+        
+        # Critical patterns (High and Critical events; None when there are none)
+        critical_mask = np.isin(
+            codes['severity'],
+            [categories['severity'].get_loc(level) for level in ['Critical', 'High']
+             if level in categories['severity']]
+        )
+        critical_patterns = None if not critical_mask.any() else {
+            'most_common_critical_type': self._mode_of(
+                count('incident_type', critical_mask), categories['incident_type']
+            ),
+            'most_critical_phase': self._mode_of(
+                count('flight_phase', critical_mask), categories['flight_phase']
+            ),
+            'most_incidents_airport': self._mode_of(
+                count('airport', critical_mask), categories['airport']
+            ),
+            'critical_percentage': round(int(critical_mask.sum()) / total * 100, 2)
+        }
+        
+        return {
+            'kpis': kpis,
+            'aircraft_analysis': aircraft_analysis,
+            'time_trend': time_trend,
+            'critical_patterns': critical_patterns
+        }
     
     def calculate_main_kpis(self):
         """
@@ -37,23 +238,218 @@ class SafetyAnalyzer:
         Returns:
             dict: Dictionary with KPIs
         """
-        total = len(self.df)
-        critical = len(self.df[self.df['severity'] == 'Critical'])
-        high = len(self.df[self.df['severity'] == 'High'])
+        return dict(self.compute_all_reports()['kpis'])
+    
+    def analyze_by_aircraft(self):
+        """
+        Generate aggregated analysis by aircraft model.
+        
+        Returns:
+            DataFrame: Analysis by model
+        """
+        return self.compute_all_reports()['aircraft_analysis'].copy()
+    
+    def generate_time_trend(self):
+        """
+        Generate time series of events by month.
+        
+        Returns:
+            DataFrame: Monthly trend
+        """
+        return self.compute_all_reports()['time_trend'].copy()
+    
+    def identify_critical_patterns(self):
+        """
+        Identify patterns in critical events.
+        
+        Returns:
+            dict: Identified patterns
+        """
+        patterns = self.compute_all_reports()['critical_patterns']
+        if patterns is None:
+            raise ValueError("No High or Critical events to analyze")
+        return dict(patterns)
+    
+    def query(self, start=None, end=None, **predicates):
+        """
+        Select events for a drill-down through the bitmap index.
+        
+        The index is built on first use and reused by later queries.
+        
+        Args:
+            start (optional): Keep events at or after this time
+            end (optional): Keep events before this time
+            **predicates: column=value or column=[values] on the indexed
+                columns (see query.INDEXED_COLUMNS)
+        
+        Returns:
+            QueryResult: Matching events (count(), rows(), frame(), sum(), ...)
+        """
+        if self._index is None:
+            self._index = EventIndex(self.df)
+        return self._index.query(start=start, end=end, **predicates)
+
+def _mode_from_counts(counts):
+    """
+    Get the most frequent value from a frequency table.
+    
+    Ties resolve to the smallest value, like Series.mode()[0].
+    
+    Args:
+        counts (Series): Occurrences indexed by value
+    
+    Returns:
+        object: Most frequent value
+    """
+    counts = counts[counts > 0]
+    if counts.empty:
+        raise ValueError("Cannot take the mode of no values")
+    # Compare labels as values: a categorical index sorts in category order
+    return min(counts.index[counts.to_numpy() == counts.max()].tolist())
+
+class StreamingSafetyAnalyzer:
+    """
+    Safety analyzer fed chunk by chunk.
+    
+    Each chunk is reduced to small partial aggregates (counters and sums)
+    that are merged into running totals, so memory does not grow with the
+    number of events. Counts and sums are exact integers (costs are
+    summed in cents), so reports are identical to SafetyAnalyzer's on the
+    same data however it is split. The partials are published with each
+    snapshot, so append runs extend them with new events instead of
+    rescanning history.
+    """
+    
+    def __init__(self):
+        """Initialize analyzer with empty aggregates."""
+        self.partials = None
+    
+    @staticmethod
+    @metrics.instrument('analyze.partials', rows_arg=0)
+    def compute_partials(df):
+        """
+        Reduce a chunk of scored events to mergeable partial aggregates.
+        
+        Args:
+            df (DataFrame): Chunk of event data in the compact schema
+        
+        Returns:
+            dict: Partial aggregates
+        """
+        by_model = df.groupby('aircraft_model', observed=True)
+        # Summed as Int64: grouped sums of the UInt16 column keep its dtype and wrap
+        resolution = df['resolution_days'].astype('Int64').groupby(df['aircraft_model'], observed=True)
+        cost_cents = pd.Series(
+            np.round(df['estimated_cost_usd'].to_numpy(dtype=np.float64) * 100).astype(np.int64),
+            index=df.index
+        )
+        aircraft = pd.DataFrame({
+            'total_events': by_model['event_id'].count(),
+            'risk_score_sum': (
+                by_model['risk_score'].sum() if 'risk_score' in df.columns else np.nan
+            ),
+            'estimated_cost_cents': cost_cents.groupby(df['aircraft_model'], observed=True).sum(),
+            'resolution_days_sum': resolution.sum(),
+            'resolution_days_count': resolution.count()
+        })
+        critical = df[df['severity'].isin(['Critical', 'High'])]
+        
+        return {
+            'total_events': len(df),
+            'first_date': df['timestamp'].min(),
+            'last_date': df['timestamp'].max(),
+            'last_event_id': int(df['event_id'].max()),
+            'severity_counts': df['severity'].value_counts(),
+            'status_counts': df['status'].value_counts(),
+            'type_counts': df['incident_type'].value_counts(),
+            'total_injuries': int(df['injuries'].sum()),
+            'resolution_sum': df['resolution_days'].sum(),
+            'resolution_count': int(df['resolution_days'].count()),
+            'total_cost_cents': int(cost_cents.sum()),
+            'aircraft': aircraft,
+            'trend': df.groupby([schema.derive(df, 'year'), schema.derive(df, 'month')]).size(),
+            'critical_events': len(critical),
+            'critical_type_counts': critical['incident_type'].value_counts(),
+            'critical_phase_counts': critical['flight_phase'].value_counts(),
+            'critical_airport_counts': critical['airport'].value_counts()
+        }
+    
+    @staticmethod
+    def merge_partials(left, right):
+        """
+        Merge two partial aggregates.
+        
+        Args:
+            left (dict): Partial aggregates
+            right (dict): Partial aggregates
+        
+        Returns:
+            dict: Combined partial aggregates
+        """
+        merged = {}
+        for key, value in left.items():
+            if key == 'first_date':
+                merged[key] = min(value, right[key])
+            elif key in ('last_date', 'last_event_id'):
+                merged[key] = max(value, right[key])
+            elif isinstance(value, pd.DataFrame):
+                # fill_value only stands in for models absent from one side; a
+                # missing sum (risk_score_sum of an unscored chunk) stays missing
+                combined = value.add(right[key], fill_value=0)
+                unknown = (
+                    value.isna().reindex(combined.index, fill_value=False)
+                    | right[key].isna().reindex(combined.index, fill_value=False)
+                )
+                merged[key] = combined.mask(unknown)
+            elif isinstance(value, pd.Series):
+                merged[key] = value.add(right[key], fill_value=0)
+            else:
+                merged[key] = value + right[key]
+        return merged
+    
+    def update(self, df):
+        """
+        Add a chunk of scored events to the running aggregates.
+        
+        Args:
+            df (DataFrame): Chunk of event data
+        """
+        partials = self.compute_partials(df)
+        if self.partials is None:
+            self.partials = partials
+        else:
+            self.partials = self.merge_partials(self.partials, partials)
+    
+    def calculate_main_kpis(self):
+        """
+        Calculate main dashboard KPIs from the running aggregates.
+        
+        Returns:
+            dict: Dictionary with KPIs (same keys as SafetyAnalyzer)
+        """
+        p = self.partials
+        total = p['total_events']
+        critical = int(p['severity_counts'].get('Critical', 0))
+        high = int(p['severity_counts'].get('High', 0))
         
         kpis = {
             'total_events': total,
             'critical_events': critical,
             'high_events': high,
             'safety_rate': round((1 - (critical + high) / total) * 100, 2),
-            'total_injuries': int(self.df['injuries'].sum()),
-            'avg_resolution_time': round(self.df['resolution_days'].mean(), 1),
-            'total_cost_usd': round(self.df['estimated_cost_usd'].sum(), 2),
-            'pending_events': len(self.df[
-                self.df['status'].isin(['Under Investigation', 'Corrective Action'])
-            ]),
-            'most_incidents_model': self.df['aircraft_model'].mode()[0],
-            'most_common_type': self.df['incident_type'].mode()[0]
+            'total_injuries': p['total_injuries'],
+            'avg_resolution_time': (
+                round(p['resolution_sum'] / p['resolution_count'], 1)
+                if p['resolution_count'] else np.nan
+            ),
+            'total_cost_usd': round(p['total_cost_cents'] / 100, 2),
+            'pending_events': int(
+                p['status_counts'].reindex(
+                    ['Under Investigation', 'Corrective Action'], fill_value=0
+                ).sum()
+            ),
+            'most_incidents_model': _mode_from_counts(p['aircraft']['total_events']),
+            'most_common_type': _mode_from_counts(p['type_counts'])
         }
         
         return kpis
@@ -65,14 +461,16 @@ class SafetyAnalyzer:
         Returns:
             DataFrame: Analysis by model
         """
-        analysis = self.df.groupby('aircraft_model').agg({
-            'event_id': 'count',
-            'risk_score': 'mean',
-            'estimated_cost_usd': 'sum',
-            'resolution_days': 'mean'
-        }).rename(columns={
-            'event_id': 'total_events'
+        aircraft = self.partials['aircraft'].sort_index()
+        analysis = pd.DataFrame({
+            'total_events': aircraft['total_events'].astype(int),
+            'risk_score': aircraft['risk_score_sum'] / aircraft['total_events'],
+            'estimated_cost_usd': aircraft['estimated_cost_cents'] / 100,
+            'resolution_days': (
+                aircraft['resolution_days_sum'] / aircraft['resolution_days_count']
+            )
         }).round(2)
+        analysis.index.name = 'aircraft_model'
         
         return analysis
     
@@ -83,13 +481,115 @@ class SafetyAnalyzer:
         Returns:
             DataFrame: Monthly trend
         """
-        trend = self.df.groupby(['year', 'month']).size().reset_index(name='events')
+        trend = (
+            self.partials['trend'].sort_index().astype(int)
+            .reset_index(name='events')
+        )
         trend['year_month'] = (
             trend['year'].astype(str) + '-' + 
             trend['month'].astype(str).str.zfill(2)
         )
         return trend
     
+    def identify_critical_patterns(self):
+        """
+        Identify patterns in critical events from the running aggregates.
+        
+        Returns:
+            dict: Identified patterns (same keys as SafetyAnalyzer)
+        """
+        p = self.partials
+        if not p['critical_events']:
+            raise ValueError("No High or Critical events to analyze")
+        return {
+            'most_common_critical_type': _mode_from_counts(p['critical_type_counts']),
+            'most_critical_phase': _mode_from_counts(p['critical_phase_counts']),
+            'most_incidents_airport': _mode_from_counts(p['critical_airport_counts']),
+            'critical_percentage': round(p['critical_events'] / p['total_events'] * 100, 2)
+        }
+
+class IncrementalSafetyAnalyzer(StreamingSafetyAnalyzer):
+    """
+    KPI engine that keeps running aggregates instead of rescanning history.
+    
+    A StreamingSafetyAnalyzer that also accepts batches in the text layout
+    and single events. update() costs O(batch); add_event() is O(1)
+    amortized: events are buffered and folded in as one batch every
+    EVENT_BATCH_SIZE events, or when a report is read. Reports return the
+    same values as SafetyAnalyzer.
+    """
+    
+    EVENT_BATCH_SIZE = 1_000
+    
+    def __init__(self, df=None):
+        """
+        Initialize analyzer, optionally with existing events.
+        
+        Args:
+            df (DataFrame, optional): Initial event data
+        """
+        super().__init__()
+        self._events = []
+        if df is not None:
+            self.update(df)
+    
+    @metrics.instrument('analyze.incremental', rows_arg=1)
+    def update(self, df):
+        """
+        Add a batch of events to the running aggregates in O(batch).
+        
+        Args:
+            df (DataFrame): New event data (compact schema or text layout)
+        """
+        super().update(schema.to_compact(df))
+    
+    def add_event(self, event):
+        """
+        Add a single event, without building a DataFrame per event.
+        
+        Args:
+            event (dict): Event data as produced by generate_event
+        """
+        self._events.append(event)
+        if len(self._events) >= self.EVENT_BATCH_SIZE:
+            self.flush()
+    
+    def flush(self):
+        """Fold the buffered single events into the running aggregates."""
+        if self._events:
+            events, self._events = self._events, []
+            self.update(pd.DataFrame(events))
+    
+    def calculate_main_kpis(self):
+        """
+        Calculate main dashboard KPIs from the running aggregates.
+        
+        Returns:
+            dict: Dictionary with KPIs (same keys as SafetyAnalyzer)
+        """
+        self.flush()
+        return super().calculate_main_kpis()
+    
+    def analyze_by_aircraft(self):
+        """
+        Generate aggregated analysis by aircraft model.
+        
+        Returns:
+            DataFrame: Analysis by model
+        """
+        self.flush()
+        return super().analyze_by_aircraft()
+    
+    def generate_time_trend(self):
+        """
+        Generate time series of events by month.
+        
+        Returns:
+            DataFrame: Monthly trend
+        """
+        self.flush()
+        return super().generate_time_trend()
+    
     def identify_critical_patterns(self):
         """
         Identify patterns in critical events.
@@ -97,13 +597,105 @@ class SafetyAnalyzer:
         Returns:
             dict: Identified patterns
         """
-        critical_events = self.df[self.df['severity'].isin(['Critical', 'High'])]
+        self.flush()
+        return super().identify_critical_patterns()
+
+def _partition_partials(path, chunk_size):
+    """
+    Reduce one on-disk partition to partial aggregates (the map step).
+    
+    Runs in a worker process. The partition is read chunk by chunk and
+    scored like the pipeline does with loaded events.
+    
+    Args:
+        path (str): Partition file
+        chunk_size (int): Rows per chunk
+    
+    Returns:
+        dict: Partial aggregates, or None for an empty partition
+    """
+    partials = None
+    for chunk in DataLoader.iter_chunks(path, PartitionedSafetyAnalyzer.COLUMNS, chunk_size):
+        chunk = RiskCalculator.add_scores_to_dataframe(chunk)
+        chunk_partials = StreamingSafetyAnalyzer.compute_partials(chunk)
+        partials = (
+            chunk_partials if partials is None
+            else StreamingSafetyAnalyzer.merge_partials(partials, chunk_partials)
+        )
+    return partials
+
+class PartitionedSafetyAnalyzer(StreamingSafetyAnalyzer):
+    """
+    Out-of-core safety analyzer over datasets on disk.
+    
+    Reports run as a map-reduce job: every partition (a file of a Parquet
+    dataset, or each file given) is reduced to partial aggregates on a
+    process pool, reading one chunk at a time and only the columns the
+    reports need, and the partials are merged. Nothing larger than a chunk
+    is loaded, and the reports are identical to SafetyAnalyzer's on the
+    loaded and scored events. The job runs on first use of a report.
+    """
+    
+    # Columns read from the partitions (risk scores are recalculated from them)
+    COLUMNS = [
+        'event_id', 'timestamp', 'aircraft_model', 'incident_type', 'severity',
+        'flight_phase', 'airport', 'status', 'resolution_days', 'injuries',
+        'aircraft_damage', 'estimated_cost_usd'
+    ]
+    
+    def __init__(self, paths, max_workers=None, chunk_size=None):
+        """
+        Initialize analyzer over one or more datasets.
         
-        patterns = {
-            'most_common_critical_type': critical_events['incident_type'].mode()[0],
-            'most_critical_phase': critical_events['flight_phase'].mode()[0],
-            'most_incidents_airport': critical_events['airport'].mode()[0],
-            'critical_percentage': round(len(critical_events) / len(self.df) * 100, 2)
-        }
+        Args:
+            paths (str or list): Parquet dataset folder or data file (see
+                DataLoader.load), or a list of them
+            max_workers (int, optional): Worker processes (default
+                config.NUM_WORKERS, None = all cores)
+            chunk_size (int, optional): Rows per chunk (default config.CHUNK_SIZE)
+        """
+        self.paths = [paths] if isinstance(paths, (str, os.PathLike)) else list(paths)
+        self.max_workers = max_workers or config.NUM_WORKERS or os.cpu_count()
+        self.chunk_size = chunk_size or config.CHUNK_SIZE
+        super().__init__()
+    
+    @property
+    def partials(self):
+        """dict: Merged partial aggregates (computed by run() on first use)."""
+        if self._partials is None:
+            self._partials = self.run()
+        return self._partials
+    
+    @partials.setter
+    def partials(self, value):
+        self._partials = value
+    
+    def run(self):
+        """
+        Run the map-reduce job over every partition.
+        
+        Returns:
+            dict: Merged partial aggregates
+        
+        Raises:
+            ValueError: If the partitions hold no events
+        """
+        partitions = [
+            partition for path in self.paths for partition in DataLoader.partitions(path)
+        ]
+        max_workers = min(self.max_workers, len(partitions))
         
-        return patterns
\ No newline at end of file
+        with metrics.stage('analyze.partitioned') as record:
+            chunk_sizes = [self.chunk_size] * len(partitions)
+            if max_workers > 1:
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    results = list(executor.map(_partition_partials, partitions, chunk_sizes))
+            else:
+                results = list(map(_partition_partials, partitions, chunk_sizes))
+            
+            results = [partials for partials in results if partials is not None]
+            if not results:
+                raise ValueError("No events to analyze")
+            partials = functools.reduce(self.merge_partials, results)
+            record['rows'] = partials['total_events']
+        return partials
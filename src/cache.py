@@ -0,0 +1,296 @@
+# IMPORTANT DISCLAIMER
+# ====================
+# This project uses SYNTHETIC DATA for educational purposes.
+# Data does NOT represent any real actual fleet performance.
+# All incidents, costs, and metrics are RANDOMLY GENERATED.
+
+"""
+Module for the content-addressed cache of pipeline stage results.
+Each stage result is stored under a fingerprint of everything it depends
+on, so unchanged stages are reused by later runs.
+Made for demonstration, testing, and learning purposes.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import pickle
+from . import config
+
+SOURCE_FOLDER = os.path.dirname(os.path.abspath(__file__))
+
+# Pipeline script, which holds the summary stage
+PIPELINE_SCRIPT = os.path.join(os.path.dirname(SOURCE_FOLDER), 'main.py')
+
+# Config settings each stage depends on (beyond its upstream stages)
+GENERATION_SETTINGS = [
+    'RANDOM_SEED', 'NUM_EVENTS', 'PERIOD_DAYS', 'BATCH_GENERATION', 'NUM_SHARDS',
+    'COUNTER_GENERATION',
+    'AIRCRAFT_MODELS', 'INCIDENT_TYPES', 'SEVERITY_LEVELS', 'DAMAGE_LEVELS',
+    'STATUS_OPTIONS', 'FLIGHT_PHASES', 'BRAZILIAN_AIRPORTS'
+]
+SCORING_SETTINGS = ['RISK_CATEGORIES']
+
+# Settings the loaded events depend on when reading config.INPUT_FILE
+# (the config lists give the categories of the compact schema)
+LOADING_SETTINGS = [
+    'AIRCRAFT_MODELS', 'INCIDENT_TYPES', 'SEVERITY_LEVELS', 'DAMAGE_LEVELS',
+    'STATUS_OPTIONS', 'FLIGHT_PHASES', 'BRAZILIAN_AIRPORTS'
+]
+
+# Export kind -> (stages whose results it writes, config settings)
+EXPORT_INPUTS = {
+    'csv': (['score'], []),
+    'excel': (['score', 'kpis', 'aircraft', 'trend'], ['EXCEL_MAX_ROWS']),
+    'parquet': (['score'], ['PARQUET_COMPRESSION']),
+    'partials': (['score', 'kpis'], []),  # 'kpis' brings in the analyzers code
+    'kpis': (['kpis'], []),
+    'aircraft': (['aircraft'], []),
+    'trend': (['trend'], [])
+}
+
+def fingerprint(*parts):
+    """
+    Hash JSON-serializable parts into a stable key.
+    
+    Args:
+        *parts: Values to hash (dicts are hashed with sorted keys)
+    
+    Returns:
+        str: Hex digest
+    """
+    text = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def source_fingerprint(*modules):
+    """
+    Hash the source of package modules, so code changes invalidate results.
+    
+    Args:
+        *modules (str): Module names inside src ('data_generator', ...), or
+            'main' for the pipeline script
+    
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    for module in modules:
+        if module == 'main':
+            path = PIPELINE_SCRIPT
+        else:
+            path = os.path.join(SOURCE_FOLDER, f'{module}.py')
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def input_fingerprint(path):
+    """
+    Identify an input dataset by the size and modification time of its files.
+    
+    Args:
+        path (str): Input file, or folder (e.g. a Parquet dataset)
+    
+    Returns:
+        list: Path, size and modification time of every file
+    """
+    if os.path.isdir(path):
+        paths = sorted(glob.glob(os.path.join(path, '**', '*'), recursive=True))
+    else:
+        paths = [path]
+    
+    files = []
+    for file in paths:
+        if os.path.isfile(file):
+            stat = os.stat(file)
+            files.append([os.path.abspath(file), stat.st_size, stat.st_mtime_ns])
+    return files
+
+def settings(names):
+    """
+    Get the current values of config settings.
+    
+    Args:
+        names (list): Setting names
+    
+    Returns:
+        dict: Setting name -> value
+    """
+    return {name: getattr(config, name) for name in names}
+
+def stage_keys():
+    """
+    Compute the cache key of every pipeline stage.
+    
+    Keys only depend on config, source code and upstream keys, never on
+    data, so all of them are known before anything runs. The generation
+    key includes the reference date: with REFERENCE_DATE unset it changes
+    once a day. With config.INPUT_FILE set, it identifies the input files
+    by size and modification time instead of hashing their content.
+    
+    Returns:
+        dict: Stage name -> key ('generate', 'score', 'kpis', 'aircraft',
+            'trend', 'summary'), and under 'export' a dict of export
+            kind -> key
+    """
+    keys = {}
+    if config.INPUT_FILE:
+        keys['generate'] = fingerprint(
+            'load', input_fingerprint(config.INPUT_FILE), settings(LOADING_SETTINGS),
+            source_fingerprint('loaders', 'schema')
+        )
+    else:
+        keys['generate'] = fingerprint(
+            'generate', settings(GENERATION_SETTINGS), config.START_DATE.date(),
+            source_fingerprint('data_generator', 'schema')
+        )
+    keys['score'] = fingerprint(
+        'score', keys['generate'], settings(SCORING_SETTINGS),
+        source_fingerprint('risk_calculator', 'schema')
+    )
+    for stage in ('kpis', 'aircraft', 'trend'):
+        keys[stage] = fingerprint(stage, keys['score'], source_fingerprint('analyzers', 'schema'))
+    keys['summary'] = fingerprint('summary', keys['score'], source_fingerprint('main', 'schema'))
+    
+    export_source = source_fingerprint('exporters', 'schema')
+    keys['export'] = {
+        kind: fingerprint(
+            'export', kind, [keys[stage] for stage in stages], settings(names), export_source
+        )
+        for kind, (stages, names) in EXPORT_INPUTS.items()
+    }
+    return keys
+
+class ResultCache:
+    """
+    On-disk cache of stage results with size-bounded LRU eviction.
+    
+    Entries are pickles named '<stage>-<key>.pkl' in config.CACHE_FOLDER.
+    A hit refreshes the entry's modification time; after each store the
+    least recently used entries are removed until the folder fits in
+    config.CACHE_MAX_BYTES. A disabled cache misses on every lookup.
+    """
+    
+    def __init__(self, folder=None, max_bytes=None, enabled=None):
+        """
+        Initialize cache.
+        
+        Args:
+            folder (str, optional): Cache folder (default config.CACHE_FOLDER)
+            max_bytes (int, optional): Size limit (default config.CACHE_MAX_BYTES)
+            enabled (bool, optional): Use the cache (default config.CACHE_ENABLED)
+        """
+        self.folder = folder or config.CACHE_FOLDER
+        self.max_bytes = max_bytes or config.CACHE_MAX_BYTES
+        self.enabled = config.CACHE_ENABLED if enabled is None else enabled
+    
+    def path(self, stage, key):
+        """
+        Get the file of a cache entry.
+        
+        Args:
+            stage (str): Stage name
+            key (str): Stage key
+        
+        Returns:
+            str: Entry path
+        """
+        return os.path.join(self.folder, f'{stage}-{key}.pkl')
+    
+    def get(self, stage, key):
+        """
+        Load a stage result.
+        
+        Args:
+            stage (str): Stage name
+            key (str): Stage key
+        
+        Returns:
+            Stored result, or None on a miss (or unreadable entry)
+        """
+        if not self.enabled:
+            return None
+        
+        path = self.path(stage, key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # Entries written by an incompatible version are just misses
+            os.remove(path)
+            return None
+        
+        os.utime(path)
+        return value
+    
+    def put(self, stage, key, value):
+        """
+        Store a stage result and evict old entries if over the size limit.
+        
+        Args:
+            stage (str): Stage name
+            key (str): Stage key
+            value: Result to store (must be picklable)
+        """
+        if not self.enabled:
+            return
+        
+        os.makedirs(self.folder, exist_ok=True)
+        path = self.path(stage, key)
+        temp = f'{path}.tmp-{os.getpid()}'
+        with open(temp, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp, path)
+        self.evict(keep=path)
+    
+    def fetch(self, stage, key, compute):
+        """
+        Load a stage result, computing and storing it on a miss.
+        
+        Args:
+            stage (str): Stage name
+            key (str): Stage key
+            compute (callable): Produces the result
+        
+        Returns:
+            Stage result
+        """
+        value = self.get(stage, key)
+        if value is None:
+            value = compute()
+            self.put(stage, key, value)
+        return value
+    
+    def evict(self, keep=None):
+        """
+        Remove least recently used entries until the cache fits its limit.
+        
+        Args:
+            keep (str, optional): Entry never evicted (the one just stored)
+        
+        Returns:
+            int: Number of entries removed
+        """
+        entries = []
+        for path in glob.glob(os.path.join(self.folder, '*.pkl')):
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+        
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            os.remove(path)
+            total -= size
+            removed += 1
+        return removed
+    
+    def clear(self):
+        """Remove every cache entry."""
+        for path in glob.glob(os.path.join(self.folder, '*.pkl')):
+            os.remove(path)
\ No newline at end of file
@@ -10,8 +10,6 @@ Defines constants and parameters used throughout the system.
 Generates simulated data for demonstration, testing and learning purposes.
 """
 
-
-
 from datetime import datetime, timedelta
 
 # Data generation settings
@@ -19,9 +17,46 @@ RANDOM_SEED = 42
 NUM_EVENTS = 450
 PERIOD_DAYS = 365
 
-# Reference dates
-END_DATE = datetime.now()
-START_DATE = END_DATE - timedelta(days=PERIOD_DAYS)
+# Use the vectorized batch generator instead of the per-event generator
+BATCH_GENERATION = True
+
+# Counter-based generation: every event is drawn from its own block of
+# Philox counters keyed by RANDOM_SEED and the event index, so any event or
+# range can be generated on its own and the output is the same however the
+# work is chunked (CHUNK_SIZE) or spread over NUM_WORKERS processes.
+# Overrides BATCH_GENERATION and NUM_SHARDS, also in streaming mode.
+COUNTER_GENERATION = False
+
+# Streaming mode: generate, score and export in fixed-size chunks so
+# peak memory depends on CHUNK_SIZE instead of NUM_EVENTS
+STREAMING = False
+CHUNK_SIZE = 100_000
+
+# Append mode ('python main.py append'): APPEND_EVENTS new events dated on
+# the day of END_DATE (None: the daily average of NUM_EVENTS) are added to
+# the current snapshot, numbered after its last event_id. Only the new
+# events are scored; new Parquet files go into the partitions they belong
+# to, the CSV gets the new rows, and the reports come from the stored
+# partials merged with those of the new events.
+APPEND_EVENTS = None
+
+# Parallel generation: the event range is split into NUM_SHARDS shards with
+# independent random streams. Output depends on the seed and NUM_SHARDS only;
+# NUM_WORKERS (None = all cores) just sets the process pool size.
+NUM_SHARDS = 1
+NUM_WORKERS = None
+
+# Existing dataset to analyze instead of generating events: an exported
+# CSV or XLSX file, a Parquet file or dataset folder, or an Arrow/Feather
+# file (see src/loaders.py). None generates NUM_EVENTS events.
+INPUT_FILE = None
+
+# Reference dates: events cover the PERIOD_DAYS days up to REFERENCE_DATE.
+# Pin it (e.g. '2026-01-31') to get the same data from the same seed on any
+# day; None uses the current date. START_DATE and END_DATE are resolved on
+# first use (see __getattr__ below), so REFERENCE_DATE and PERIOD_DAYS can
+# still be changed after import, e.g. from command-line options.
+REFERENCE_DATE = None
 
 # fictional and simulated aircraft models and their weights for simulation
 AIRCRAFT_MODELS = {
@@ -55,6 +90,12 @@ INCIDENT_TYPES = {
 # Severity levels
 SEVERITY_LEVELS = ['Low', 'Medium', 'High', 'Critical']
 
+# Aircraft damage levels
+DAMAGE_LEVELS = ['None', 'Minor', 'Moderate', 'Significant', 'Severe']
+
+# Risk score categories, from lowest to highest
+RISK_CATEGORIES = ['Low', 'Moderate', 'High', 'Very High']
+
 # Possible statuses
 STATUS_OPTIONS = ['Under Investigation', 'Corrective Action', 'Resolved', 'Monitoring']
 
@@ -86,4 +127,133 @@ MAIN_DATA_FILE = f'{DATA_FOLDER}/flight_safety_data.csv'
 EXCEL_FILE = f'{DATA_FOLDER}/flight_safety_data.xlsx'
 KPIS_FILE = f'{DATA_FOLDER}/safety_kpis.csv'
 AIRCRAFT_ANALYSIS_FILE = f'{DATA_FOLDER}/aircraft_analysis.csv'
-TREND_FILE = f'{DATA_FOLDER}/monthly_trend.csv'
\ No newline at end of file
+TREND_FILE = f'{DATA_FOLDER}/monthly_trend.csv'
+
+# Mergeable aggregates behind the KPI, aircraft and trend reports (a pickle
+# of StreamingSafetyAnalyzer partials), read by append runs
+PARTIALS_FILE = f'{DATA_FOLDER}/analysis_partials.pkl'
+
+# Main data output formats. Parquet is written as a dataset partitioned by
+# year/month (year=2025/month=3/...) and requires the 'pyarrow' package.
+EXPORT_CSV = True
+EXPORT_EXCEL = True
+EXPORT_PARQUET = False
+PARQUET_FOLDER = f'{DATA_FOLDER}/flight_safety_data_parquet'
+PARQUET_COMPRESSION = 'zstd'
+
+# Excel rows per sheet including the header (Excel's hard limit); events
+# beyond it continue on 'Events 2', 'Events 3', ...
+EXCEL_MAX_ROWS = 1_048_576
+
+# Outputs are written concurrently by EXPORT_WORKERS threads into a new
+# folder under SNAPSHOTS_FOLDER, listed in its MANIFEST_FILE (snapshot id,
+# sizes and checksums) and published together by switching the
+# CURRENT_SNAPSHOT link; the published paths above link through it. The
+# newest SNAPSHOTS_KEPT snapshots are kept; staging folders of interrupted
+# runs are removed once older than STALE_TEMP_SECONDS.
+EXPORT_WORKERS = 4
+MANIFEST_FILE = f'{DATA_FOLDER}/manifest.json'
+SNAPSHOTS_FOLDER = f'{DATA_FOLDER}/snapshots'
+CURRENT_SNAPSHOT = f'{DATA_FOLDER}/current'
+SNAPSHOTS_KEPT = 2
+STALE_TEMP_SECONDS = 24 * 60 * 60
+
+# Monte Carlo KPI intervals (src/simulation.py): MONTE_CARLO_SCENARIOS
+# independent fleet-years of NUM_EVENTS events, drawn MONTE_CARLO_BLOCK
+# scenarios at a time on NUM_WORKERS processes; intervals cover
+# MONTE_CARLO_CONFIDENCE of the simulated values
+MONTE_CARLO_SCENARIOS = 10_000
+MONTE_CARLO_BLOCK = 1_000
+MONTE_CARLO_CONFIDENCE = 0.95
+
+# Live feed (src/live_feed.py): events are emitted at LIVE_RATE events per
+# second in micro-batches of LIVE_BATCH_SIZE; at most LIVE_QUEUE_SIZE batches
+# wait for the LIVE_CONSUMERS consumers before the producer is slowed down
+LIVE_RATE = 5_000
+LIVE_BATCH_SIZE = 250
+LIVE_QUEUE_SIZE = 16
+LIVE_CONSUMERS = 2
+LIVE_FEED_FILE = f'{DATA_FOLDER}/live_feed.csv'
+
+# Sketch-backed live view (src/sketches.py): with LIVE_SKETCHES the feed also
+# keeps fixed-size sketches. Top-k counts are off by at most events /
+# SKETCH_TOP_K_CAPACITY, quantiles by SKETCH_RELATIVE_ACCURACY of the value
+# (at most SKETCH_MAX_BINS buckets each) and distinct counts have a standard
+# error of 1.04 / sqrt(2 ** SKETCH_HLL_PRECISION)
+LIVE_SKETCHES = False
+SKETCH_TOP_K_CAPACITY = 64
+SKETCH_RELATIVE_ACCURACY = 0.01
+SKETCH_MAX_BINS = 2048
+SKETCH_HLL_PRECISION = 12
+
+# KPI HTTP service ('python main.py serve', src/server.py): reports and
+# filtered event slices served from memory on SERVER_HOST:SERVER_PORT. The
+# source dataset is polled every SERVER_REFRESH_SECONDS (0 = never) and new
+# events are folded in. Slices return at most SERVER_SLICE_LIMIT rows; the
+# last SERVER_SLICE_CACHE rendered slices are kept until the next refresh.
+# load_test() defaults: SERVER_LOAD_CLIENTS clients sending
+# SERVER_LOAD_REQUESTS requests each.
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 8050
+SERVER_REFRESH_SECONDS = 5
+SERVER_SLICE_LIMIT = 1_000
+SERVER_SLICE_CACHE = 256
+SERVER_LOAD_CLIENTS = 8
+SERVER_LOAD_REQUESTS = 2_000
+
+# Rolling-window views (src/rolling.py): window lengths and the bucket size
+# they are computed on (each window must be a multiple of the bucket)
+ROLLING_WINDOWS = ['24h', '7d', '30d']
+ROLLING_BUCKET = '1h'
+
+# Stage cache: generation, scoring, each analysis and each export are keyed
+# on a fingerprint of their inputs, config, reference date and code, and
+# skipped when unchanged. Results live in CACHE_FOLDER; least recently used
+# entries are evicted above CACHE_MAX_BYTES.
+CACHE_ENABLED = True
+CACHE_FOLDER = '.cache'
+CACHE_MAX_BYTES = 2 * 1024 ** 3
+
+# Run metrics (src/metrics.py): wall time, CPU time and rows of every stage
+# and hot path, written to METRICS_FILE as 'json' or 'prometheus' text.
+# METRICS_TRACE_MEMORY adds peak allocation per stage (tracemalloc, slower).
+# PROFILE_STAGE names a stage ('pipeline.score', 'export.csv', ...) to run
+# under cProfile; its profile is written to DATA_FOLDER/profile-<stage>.prof
+METRICS_ENABLED = True
+METRICS_TRACE_MEMORY = False
+METRICS_FORMAT = 'json'
+METRICS_FILE = f'{DATA_FOLDER}/metrics.json'
+PROFILE_STAGE = None
+
+# Current time used when REFERENCE_DATE is None (fixed at first use so every
+# stage of a run sees the same dates)
+_now = None
+
+def reference_dates():
+    """
+    Resolve the period covered by the generated events.
+    
+    Returns:
+        tuple: (START_DATE, END_DATE) as datetimes
+    """
+    global _now
+    if REFERENCE_DATE:
+        end_date = datetime.fromisoformat(REFERENCE_DATE)
+    else:
+        if _now is None:
+            _now = datetime.now()
+        end_date = _now
+    return end_date - timedelta(days=PERIOD_DAYS), end_date
+
+def __getattr__(name):
+    """
+    Resolve START_DATE and END_DATE lazily (module attribute hook).
+    
+    Assigning config.START_DATE or config.END_DATE directly still works and
+    takes precedence, as for any other setting.
+    """
+    if name == 'START_DATE':
+        return reference_dates()[0]
+    if name == 'END_DATE':
+        return reference_dates()[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
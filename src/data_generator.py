@@ -11,10 +11,157 @@ Made for demonstration, testing, and learning purposes.
 """
 
 import numpy as np
+import os
 import pandas as pd
 import random
+from concurrent.futures import ProcessPoolExecutor
 from datetime import timedelta
-from . import config
+from . import config, metrics, schema
+
+# Conditional severity distributions by incident type group
+# (incident types, severity levels, probabilities).
+# Calibrated to produce a Safety Rate of about 95-96%.
+SEVERITY_DISTRIBUTIONS = [
+    (['Near Miss', 'Runway Incursion', 'Engines'],
+     ['Medium', 'High', 'Critical'], [0.68, 0.25, 0.07]),
+    (['Bird Strike', 'Weather Diversion', 'Ground Damage'],
+     ['Low', 'Medium', 'High'], [0.90, 0.09, 0.01]),
+    (['Minor Technical Failure', 'Communication Failure'],
+     ['Low', 'Medium', 'High'], [0.89, 0.10, 0.01]),
+]
+DEFAULT_SEVERITY_PROBABILITIES = [0.91, 0.06, 0.02, 0.01]
+
+# Resolution time range in days by severity (upper bound exclusive)
+RESOLUTION_RANGES = {
+    'Low': (1, 15),
+    'Medium': (10, 45),
+    'High': (30, 90),
+    'Critical': (60, 180)
+}
+
+class CounterStream:
+    """
+    Counter-based random draws: a fixed block of draws per event.
+    
+    Draws come from the Philox bit generator keyed by the seed. Draw j of
+    event k is output k * DRAWS_PER_EVENT + j of the stream, and Philox can
+    start at any counter, so an event's draws depend only on the key and
+    its index: generating events start..stop-1 costs O(1) setup and gives
+    the same values however the range is split into chunks or workers.
+    Provides the part of the numpy Generator API used by
+    SafetyEventGenerator.sample_event_columns; every call takes the next
+    draw of each event.
+    """
+    
+    # Draws reserved per event (a multiple of Philox's 4 outputs per counter)
+    DRAWS_PER_EVENT = 20
+    
+    def __init__(self, key, start, stop):
+        """
+        Draw the uniforms of events start..stop-1.
+        
+        Args:
+            key (int): Philox key (128 bits)
+            start (int): Index of the first event
+            stop (int): Index after the last event
+        """
+        bit_generator = np.random.Philox(key=key, counter=start * self.DRAWS_PER_EVENT // 4)
+        raw = bit_generator.random_raw((stop - start) * self.DRAWS_PER_EVENT)
+        # 53 random bits per double in [0, 1)
+        self.uniforms = (raw >> np.uint64(11)).reshape(-1, self.DRAWS_PER_EVENT) * 2.0 ** -53
+        self.draw = 0
+    
+    def _next(self, size=None):
+        """Take the next draw of every event."""
+        if self.draw == self.DRAWS_PER_EVENT:
+            raise RuntimeError("CounterStream ran out of draws per event")
+        if size is not None and size != len(self.uniforms):
+            raise ValueError("CounterStream draws exactly one value per event")
+        values = self.uniforms[:, self.draw]
+        self.draw += 1
+        return values
+    
+    def random(self, size=None):
+        """Uniform floats in [0, 1), one per event."""
+        return self._next(size)
+    
+    def uniform(self, low, high, size=None):
+        """Uniform floats in [low, high), one per event."""
+        return low + (np.asarray(high) - low) * self._next(size)
+    
+    def integers(self, low, high, size=None):
+        """Integers in [low, high), one per event."""
+        low = np.asarray(low, dtype=np.int64)
+        span = np.asarray(high, dtype=np.int64) - low
+        return low + np.minimum((self._next(size) * span).astype(np.int64), span - 1)
+    
+    def choice(self, a, size=None, p=None):
+        """Indexes 0..a-1 drawn with probabilities p, one per event."""
+        return self.choice_by_group(np.zeros(len(self.uniforms), dtype=np.int8), np.array([p]), size)
+    
+    def choice_by_group(self, groups, table, size=None):
+        """
+        Draw one outcome per event from the distribution of its group.
+        
+        Args:
+            groups (ndarray): Group code of each event
+            table (ndarray): Outcome probabilities, one row per group
+            size (int, optional): Number of events (checked)
+        
+        Returns:
+            ndarray: Outcome codes
+        """
+        cumulative = np.cumsum(table, axis=1)
+        draws = self._next(size)
+        outcomes = (draws[:, None] >= cumulative[groups]).sum(axis=1)
+        return np.minimum(outcomes, table.shape[1] - 1).astype(np.int8)
+
+def _counter_events(key, day_counts, start, stop):
+    """
+    Generate events start..stop-1 from their counter-based draws.
+    
+    Args:
+        key (int): Philox key
+        day_counts (ndarray): Global event count per day offset
+        start (int): Index of the first event
+        stop (int): Index after the last event
+    
+    Returns:
+        DataFrame: Events in the compact schema (event_id start+1..stop)
+    """
+    day_offsets = SafetyEventGenerator.day_offsets_for_range(day_counts, start, stop)
+    return pd.DataFrame(SafetyEventGenerator.sample_event_columns(
+        CounterStream(key, start, stop), day_offsets, first_index=start
+    ))
+
+def _init_shard_worker(start_date, end_date, period_days):
+    """
+    Pin the reference dates in a worker process.
+    
+    Workers may re-import config, which would recompute END_DATE from the
+    clock; every shard must use the parent's dates.
+    """
+    config.START_DATE = start_date
+    config.END_DATE = end_date
+    config.PERIOD_DAYS = period_days
+
+def _generate_shard(seed_sequence, day_counts, start, stop):
+    """
+    Generate one shard of events in a worker process.
+    
+    Args:
+        seed_sequence (SeedSequence): Shard's own seed sequence
+        day_counts (ndarray): Global event count per day offset
+        start (int): Global index of the first event in the shard
+        stop (int): Global index after the last event in the shard
+    
+    Returns:
+        DataFrame: Events start..stop-1
+    """
+    rng = np.random.default_rng(seed_sequence)
+    day_offsets = SafetyEventGenerator.day_offsets_for_range(day_counts, start, stop)
+    columns = SafetyEventGenerator.sample_event_columns(rng, day_offsets, first_index=start)
+    return pd.DataFrame(columns)
 
 class SafetyEventGenerator:
     """Generator for aviation safety events."""
@@ -30,6 +177,12 @@ class SafetyEventGenerator:
             np.random.seed(seed)
             random.seed(seed)
         
+        # Independent generator used by the vectorized batch mode
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        # Root of the counter-based mode (fresh entropy, fixed once, without a seed)
+        self.counter_sequence = np.random.SeedSequence(seed)
+        
         self.generated_dates = []
         self.events = []
     
@@ -57,20 +210,11 @@ class SafetyEventGenerator:
         Determine severity based on incident type.
         Calibrado para gerar Safety Rate ≈ 95–96%
         """
-
-        if incident_type in ['Near Miss', 'Runway Incursion', 'Engines']:
-            return np.random.choice(['Medium', 'High', 'Critical'], p=[0.68, 0.25, 0.07])
-
-        elif incident_type in ['Bird Strike', 'Weather Diversion', 'Ground Damage']:
-            return np.random.choice(['Low', 'Medium', 'High'], p=[0.90, 0.09, 0.01])
-
-        elif incident_type in ['Minor Technical Failure', 'Communication Failure']:
-            return np.random.choice(['Low', 'Medium', 'High'], p=[0.89, 0.10, 0.01])
-
-        else:
-            return np.random.choice(config.SEVERITY_LEVELS, p=[0.91, 0.06, 0.02, 0.01])
-
-
+        for types, levels, probabilities in SEVERITY_DISTRIBUTIONS:
+            if incident_type in types:
+                return np.random.choice(levels, p=probabilities)
+        
+        return np.random.choice(config.SEVERITY_LEVELS, p=DEFAULT_SEVERITY_PROBABILITIES)
     
     def calculate_resolution_time(self, severity, days_since_event):
         """
@@ -83,15 +227,7 @@ class SafetyEventGenerator:
         Returns:
             int or None: Days to resolution (None if still open)
         """
-        # Define time range by severity
-        ranges = {
-            'Low': (1, 15),
-            'Medium': (10, 45),
-            'High': (30, 90),
-            'Critical': (60, 180)
-        }
-        
-        base_time = np.random.randint(*ranges[severity])
+        base_time = np.random.randint(*RESOLUTION_RANGES[severity])
         
         # Recent events may not be resolved
         if days_since_event < base_time * 0.5:
@@ -235,6 +371,7 @@ class SafetyEventGenerator:
         
         return event
     
+    @metrics.instrument('generate.events', rows_arg=1)
     def generate_all_events(self, num_events):
         """
         Generate complete set of events.
@@ -252,4 +389,434 @@ class SafetyEventGenerator:
             for i, date in enumerate(dates)
         ]
         
-        return self.events
\ No newline at end of file
+        return self.events
+    
+    def sample_day_counts(self, num_events):
+        """
+        Sample how many events fall on each day of the period.
+        
+        Equivalent to sorting num_events uniform draws over the period,
+        but drawn as per-day counts so no sort is needed.
+        
+        Args:
+            num_events (int): Number of events to generate
+            
+        Returns:
+            ndarray: Event count per day offset (0 to PERIOD_DAYS)
+        """
+        num_days = config.PERIOD_DAYS + 1
+        return self.rng.multinomial(num_events, np.full(num_days, 1 / num_days))
+    
+    @staticmethod
+    def day_offsets_for_range(day_counts, start, stop):
+        """
+        Get the sorted day offsets of events start..stop-1.
+        
+        Args:
+            day_counts (ndarray): Event count per day offset
+            start (int): Index of the first event
+            stop (int): Index after the last event
+        
+        Returns:
+            ndarray: Day offsets from START_DATE
+        """
+        boundaries = np.cumsum(day_counts)
+        offsets = np.searchsorted(boundaries, np.arange(start, stop), side='right')
+        return offsets.astype(np.int16)
+    
+    def sample_day_offsets(self, num_events):
+        """
+        Sample sorted event day offsets from START_DATE.
+        
+        Args:
+            num_events (int): Number of events to generate
+            
+        Returns:
+            ndarray: Sorted day offsets (0 to PERIOD_DAYS)
+        """
+        counts = self.sample_day_counts(num_events)
+        return np.repeat(np.arange(len(counts), dtype=np.int16), counts)
+    
+    @staticmethod
+    def _choice_by_group(rng, groups, table):
+        """
+        Draw one outcome per row from the distribution of its group.
+        
+        Args:
+            rng (Generator): Random generator
+            groups (ndarray): Group code of each row
+            table (ndarray): Outcome probabilities, one row per group
+        
+        Returns:
+            ndarray: Outcome codes
+        """
+        if isinstance(rng, CounterStream):
+            # One draw per row, so each event's outcome depends on its own draws
+            return rng.choice_by_group(groups, table)
+        outcomes = np.zeros(len(groups), dtype=np.int8)
+        for group, probabilities in enumerate(table):
+            mask = groups == group
+            count = np.count_nonzero(mask)
+            if count:
+                outcomes[mask] = rng.choice(len(probabilities), size=count, p=probabilities)
+        return outcomes
+    
+    @staticmethod
+    @metrics.instrument('generate.columns', rows_arg=1)
+    def sample_event_columns(rng, day_offsets, first_index=0):
+        """
+        Sample every event column as whole arrays.
+        
+        Uses the same distributions as generate_event, including the
+        conditional severity, status, consequence and cost rules, and
+        returns the columns in the compact schema (see schema.py).
+        
+        Args:
+            rng (Generator): Random generator
+            day_offsets (ndarray): Sorted day offsets from START_DATE
+            first_index (int): Index of the first event (for event_id)
+        
+        Returns:
+            dict: Column name -> array of values
+        """
+        n = len(day_offsets)
+        severities = config.SEVERITY_LEVELS
+        types = config.INCIDENT_TYPES['types']
+        models = config.AIRCRAFT_MODELS['models']
+        damages = config.DAMAGE_LEVELS
+        
+        # Incident type and conditional severity
+        type_codes = rng.choice(len(types), size=n, p=config.INCIDENT_TYPES['weights'])
+        type_groups = np.full(len(types), len(SEVERITY_DISTRIBUTIONS), dtype=np.int8)
+        severity_table = np.zeros((len(SEVERITY_DISTRIBUTIONS) + 1, len(severities)))
+        for group, (group_types, levels, probabilities) in enumerate(SEVERITY_DISTRIBUTIONS):
+            type_groups[[types.index(t) for t in group_types]] = group
+            severity_table[group, [severities.index(l) for l in levels]] = probabilities
+        severity_table[-1] = DEFAULT_SEVERITY_PROBABILITIES
+        severity_codes = SafetyEventGenerator._choice_by_group(rng, type_groups[type_codes], severity_table)
+        
+        model_codes = rng.choice(len(models), size=n, p=config.AIRCRAFT_MODELS['weights'])
+        
+        # Resolution time and status
+        days_since = config.PERIOD_DAYS - day_offsets.astype(np.int64)
+        bounds = np.array([RESOLUTION_RANGES[level] for level in severities])
+        base_time = rng.integers(bounds[severity_codes, 0], bounds[severity_codes, 1])
+        resolved = days_since >= base_time * 0.5
+        
+        # Status groups: open recent, open older, past resolution, before resolution
+        status_groups = np.where(
+            resolved,
+            np.where(days_since >= base_time, 2, 3),
+            np.where(days_since < 30, 0, 1)
+        )
+        status_table = np.array([
+            [0.6, 0.4, 0.0, 0.0],
+            [0.3, 0.7, 0.0, 0.0],
+            [0.0, 0.0, 0.8, 0.2],
+            [0.0, 1.0, 0.0, 0.0]
+        ])
+        status_codes = SafetyEventGenerator._choice_by_group(rng, status_groups, status_table)
+        
+        # Consequences by severity class: Low, Medium, High/Critical
+        severity_class = np.minimum(severity_codes, 2)
+        injuries = SafetyEventGenerator._choice_by_group(rng, severity_class, np.array([
+            [1.0, 0.0, 0.0],
+            [1.0, 0.0, 0.0],
+            [0.6, 0.2, 0.2]
+        ]))
+        damage_codes = SafetyEventGenerator._choice_by_group(rng, severity_class, np.array([
+            [2 / 3, 1 / 3, 0, 0, 0],
+            [1 / 3, 1 / 3, 1 / 3, 0, 0],
+            [0, 0, 1 / 3, 1 / 3, 1 / 3]
+        ]))
+        delay_bounds = np.array([(0, 60), (30, 180), (120, 600)])
+        delay = rng.integers(delay_bounds[severity_class, 0], delay_bounds[severity_class, 1])
+        
+        # Cost tiers: High/Critical, severe damage, everything else
+        cost_tier = np.where(
+            severity_class == 2, 0,
+            np.where(damage_codes >= damages.index('Significant'), 1, 2)
+        )
+        cost_bounds = np.array([(10000, 500000), (5000, 150000), (100, 50000)])
+        cost = np.round(rng.uniform(cost_bounds[cost_tier, 0], cost_bounds[cost_tier, 1]), 2)
+        
+        # Remaining independent attributes
+        minute_of_day = rng.integers(0, 24, size=n) * 60 + rng.integers(0, 60, size=n)
+        registration_number = rng.integers(100, 1000, size=n)
+        phase_codes = rng.integers(0, len(config.FLIGHT_PHASES), size=n)
+        airport_codes = rng.integers(0, len(config.BRAZILIAN_AIRPORTS), size=n)
+        investigator = rng.integers(1, 16, size=n)
+        immediate_action = rng.integers(0, 2, size=n)
+        anac_notification = rng.random(n) < 2 / 3
+        
+        # Build the compact schema directly from the codes
+        def categorical(column, codes):
+            return pd.Categorical.from_codes(codes, dtype=schema.EVENT_SCHEMA[column])
+        
+        prefixes = schema.registration_prefixes()
+        prefix_codes = np.array([prefixes.index(m[:3].upper()) for m in models])
+        
+        start_day = np.datetime64(config.START_DATE.date(), 'D')
+        timestamps = (
+            (start_day + day_offsets.astype('timedelta64[D]')).astype('datetime64[m]')
+            + minute_of_day.astype('timedelta64[m]')
+        ).astype('datetime64[ns]')
+        
+        return {
+            'event_id': np.arange(first_index + 1, first_index + n + 1, dtype=np.uint32),
+            'timestamp': timestamps,
+            'aircraft_model': categorical('aircraft_model', model_codes),
+            'registration': categorical(
+                'registration', prefix_codes[model_codes] * 900 + registration_number - 100
+            ),
+            'incident_type': categorical('incident_type', type_codes),
+            'severity': categorical('severity', severity_codes),
+            'flight_phase': categorical('flight_phase', phase_codes),
+            'airport': categorical('airport', airport_codes),
+            'status': categorical('status', status_codes),
+            'resolution_days': pd.arrays.IntegerArray(
+                base_time.astype(np.uint16), mask=~resolved
+            ),
+            'injuries': injuries,
+            'aircraft_damage': categorical('aircraft_damage', damage_codes),
+            'delay_minutes': delay.astype(np.int16),
+            'investigator': categorical('investigator', investigator - 1),
+            'immediate_action': immediate_action == 0,
+            'anac_notification': anac_notification,
+            'estimated_cost_usd': cost
+        }
+    
+    @metrics.instrument('generate.batch', rows_arg=1)
+    def generate_batch(self, num_events, as_arrow=False):
+        """
+        Generate complete set of events in vectorized batch mode.
+        
+        Same distributions as generate_all_events, but every column is
+        sampled as a whole NumPy array instead of event by event, and the
+        events use the compact schema (schema.to_legacy gives the text layout).
+        
+        Args:
+            num_events (int): Total number of events
+            as_arrow (bool): Return a pyarrow Table instead of a DataFrame
+        
+        Returns:
+            DataFrame or pyarrow.Table: Generated events
+        """
+        day_offsets = self.sample_day_offsets(num_events)
+        df = pd.DataFrame(self.sample_event_columns(self.rng, day_offsets))
+        
+        if as_arrow:
+            try:
+                import pyarrow as pa
+            except ImportError as e:
+                raise ImportError("as_arrow=True requires the 'pyarrow' package") from e
+            return pa.Table.from_pandas(df, preserve_index=False)
+        
+        return df
+    
+    def counter_setup(self, num_events):
+        """
+        Get the Philox key and day counts of a counter-based dataset.
+        
+        Both derive from the seed alone (through SeedSequence), so any
+        process rebuilds them without generating events.
+        
+        Args:
+            num_events (int): Total number of events
+        
+        Returns:
+            tuple: (key, day_counts)
+        """
+        # Fixed children (spawn() would give new ones on every call)
+        days_sequence, key_sequence = (
+            np.random.SeedSequence(self.counter_sequence.entropy, spawn_key=(i,)) for i in range(2)
+        )
+        high, low = key_sequence.generate_state(2, np.uint64)
+        num_days = config.PERIOD_DAYS + 1
+        day_counts = np.random.default_rng(days_sequence).multinomial(
+            num_events, np.full(num_days, 1 / num_days)
+        )
+        return (int(high) << 64) | int(low), day_counts
+    
+    @metrics.instrument('generate.range', rows=lambda self, start, stop, num_events: stop - start)
+    def generate_range(self, start, stop, num_events):
+        """
+        Generate events start..stop-1 of a counter-based dataset.
+        
+        Each event is drawn from its own Philox counters (see CounterStream),
+        keyed by the seed and the event index, so a single event or any range
+        is produced directly and equals the same rows of generate_counter.
+        
+        Args:
+            start (int): Index of the first event (event_id start + 1)
+            stop (int): Index after the last event
+            num_events (int): Total number of events in the dataset
+        
+        Returns:
+            DataFrame: Events in the compact schema
+        """
+        if not 0 <= start <= stop <= num_events:
+            raise ValueError(f"Event range {start}..{stop} is outside 0..{num_events}")
+        key, day_counts = self.counter_setup(num_events)
+        return _counter_events(key, day_counts, start, stop)
+    
+    def generate_counter_chunks(self, num_events, chunk_size=None, max_workers=None):
+        """
+        Generate counter-based events as a stream of DataFrame chunks.
+        
+        Chunks are generated on a process pool when there is more than one
+        and yielded in order. The events depend only on the seed and
+        num_events: chunk size and workers change how the work is split,
+        never the output.
+        
+        Args:
+            num_events (int): Total number of events
+            chunk_size (int, optional): Events per chunk (default config.CHUNK_SIZE)
+            max_workers (int, optional): Worker processes (default config.NUM_WORKERS)
+        
+        Yields:
+            DataFrame: Next chunk of events
+        """
+        chunk_size = chunk_size or config.CHUNK_SIZE
+        key, day_counts = self.counter_setup(num_events)
+        starts = list(range(0, num_events, chunk_size))
+        stops = [min(start + chunk_size, num_events) for start in starts]
+        
+        max_workers = min(max_workers or config.NUM_WORKERS or os.cpu_count(), len(starts))
+        if max_workers <= 1:
+            for start, stop in zip(starts, stops):
+                yield _counter_events(key, day_counts, start, stop)
+            return
+        
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_shard_worker,
+            initargs=(config.START_DATE, config.END_DATE, config.PERIOD_DAYS)
+        ) as executor:
+            yield from executor.map(
+                _counter_events, [key] * len(starts), [day_counts] * len(starts), starts, stops
+            )
+    
+    @metrics.instrument('generate.counter', rows_arg=1)
+    def generate_counter(self, num_events, chunk_size=None, max_workers=None):
+        """
+        Generate complete set of events in counter-based mode.
+        
+        Args:
+            num_events (int): Total number of events
+            chunk_size (int, optional): Events per chunk (default config.CHUNK_SIZE)
+            max_workers (int, optional): Worker processes (default config.NUM_WORKERS)
+        
+        Returns:
+            DataFrame: Generated events
+        """
+        if num_events == 0:
+            return self.generate_range(0, 0, 0)
+        chunks = self.generate_counter_chunks(num_events, chunk_size, max_workers)
+        return pd.concat(list(chunks), ignore_index=True)
+    
+    @metrics.instrument('generate.day', rows_arg=1)
+    def generate_day(self, num_events, first_index=0, day=None):
+        """
+        Generate the events of one day, e.g. to append to an existing dataset.
+        
+        Same distributions as generate_batch for events on that day; status
+        and resolution are drawn as of config.END_DATE.
+        
+        Args:
+            num_events (int): Number of events
+            first_index (int): Events already in the dataset (numbering
+                continues at first_index + 1)
+            day (date, optional): Day of the events (default the day of
+                config.END_DATE)
+        
+        Returns:
+            DataFrame: Generated events in the compact schema
+        """
+        day = day or config.END_DATE.date()
+        offset = (day - config.START_DATE.date()).days
+        day_offsets = np.full(num_events, offset, dtype=np.int16)
+        return pd.DataFrame(self.sample_event_columns(self.rng, day_offsets, first_index))
+    
+    def generate_chunks(self, num_events, chunk_size=None):
+        """
+        Generate events as a stream of fixed-size DataFrame chunks.
+        
+        Dates stay globally sorted and event_id numbering continues across
+        chunks, so concatenating the chunks gives one consistent dataset.
+        Only one chunk is held in memory at a time.
+        
+        Args:
+            num_events (int): Total number of events
+            chunk_size (int, optional): Events per chunk (default config.CHUNK_SIZE)
+        
+        Yields:
+            DataFrame: Next chunk of events
+        """
+        chunk_size = chunk_size or config.CHUNK_SIZE
+        day_counts = self.sample_day_counts(num_events)
+        
+        for start in range(0, num_events, chunk_size):
+            stop = min(start + chunk_size, num_events)
+            day_offsets = self.day_offsets_for_range(day_counts, start, stop)
+            yield pd.DataFrame(
+                self.sample_event_columns(self.rng, day_offsets, first_index=start)
+            )
+    
+    def generate_shards(self, num_events, num_shards=None, max_workers=None):
+        """
+        Generate events in parallel shards on a process pool.
+        
+        The event range is split into num_shards contiguous shards. Day
+        counts come from one stream and each shard samples its columns from
+        its own stream, all derived from the seed through SeedSequence.spawn.
+        The output therefore depends only on the seed and num_shards, not on
+        the number of workers or on scheduling. Shards are yielded in order,
+        so dates stay sorted and event_id numbering stays global.
+        
+        Args:
+            num_events (int): Total number of events
+            num_shards (int, optional): Number of shards (default config.NUM_SHARDS)
+            max_workers (int, optional): Worker processes (default config.NUM_WORKERS)
+        
+        Yields:
+            DataFrame: Next shard of events
+        """
+        num_shards = num_shards or config.NUM_SHARDS
+        max_workers = min(max_workers or config.NUM_WORKERS or os.cpu_count(), num_shards)
+        
+        days_sequence, *shard_sequences = np.random.SeedSequence(self.seed).spawn(num_shards + 1)
+        num_days = config.PERIOD_DAYS + 1
+        day_counts = np.random.default_rng(days_sequence).multinomial(
+            num_events, np.full(num_days, 1 / num_days)
+        )
+        bounds = [num_events * k // num_shards for k in range(num_shards + 1)]
+        
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_shard_worker,
+            initargs=(config.START_DATE, config.END_DATE, config.PERIOD_DAYS)
+        ) as executor:
+            yield from executor.map(
+                _generate_shard,
+                shard_sequences,
+                [day_counts] * num_shards,
+                bounds[:-1],
+                bounds[1:]
+            )
+    
+    @metrics.instrument('generate.sharded', rows_arg=1)
+    def generate_sharded(self, num_events, num_shards=None, max_workers=None):
+        """
+        Generate complete set of events on a process pool.
+        
+        Args:
+            num_events (int): Total number of events
+            num_shards (int, optional): Number of shards (default config.NUM_SHARDS)
+            max_workers (int, optional): Worker processes (default config.NUM_WORKERS)
+        
+        Returns:
+            DataFrame: Generated events
+        """
+        shards = self.generate_shards(num_events, num_shards, max_workers)
+        return pd.concat(list(shards), ignore_index=True)
@@ -10,9 +10,20 @@ Saves in CSV and Excel formats for Power BI consumption.
 Made for demonstration, testing, and learning purposes.
 """
 
+import glob
+import hashlib
+import json
 import pandas as pd
 import os
-from . import config
+import pickle
+import shutil
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from . import config, metrics, schema
+from .analyzers import StreamingSafetyAnalyzer
+from .loaders import DataLoader
 
 class DataExporter:
     """Data exporter to files."""
@@ -23,55 +34,878 @@ class DataExporter:
         os.makedirs(config.DATA_FOLDER, exist_ok=True)
     
     @staticmethod
-    def export_main_data(df):
+    def _output_path(path, default):
         """
-        Export main DataFrame to CSV and Excel.
+        Resolve an output path, detaching the published link when writing it directly.
+        
+        Published outputs are links into the current snapshot (see
+        ExportCoordinator); writing through one would modify the snapshot.
+        
+        Args:
+            path (str, optional): Path given by the caller
+            default (str): Published path used when path is None
+        
+        Returns:
+            str: Path to write to
+        """
+        if path is None:
+            path = default
+            if os.path.islink(path):
+                os.remove(path)
+        return path
+    
+    @staticmethod
+    def export_main_data(df, kpis=None, aircraft_analysis=None, trend=None):
+        """
+        Export main DataFrame in the formats enabled in config.
+        
+        CSV and Excel use the published text layout (see schema.to_legacy);
+        Parquet keeps the compact schema. The Excel workbook is streamed
+        chunk by chunk and also gets the reports passed in as extra sheets.
         
         Args:
             df (DataFrame): Complete data
+            kpis (dict, optional): KPIs for the Excel 'KPIs' sheet
+            aircraft_analysis (DataFrame, optional): Sheet 'Aircraft Analysis'
+            trend (DataFrame, optional): Sheet 'Monthly Trend'
         """
-        DataExporter.ensure_folder_exists()
+        if not (config.EXPORT_CSV or config.EXPORT_EXCEL or config.EXPORT_PARQUET):
+            print("⚠️  Main data not saved: EXPORT_CSV, EXPORT_EXCEL and EXPORT_PARQUET are all off")
+            return
         
-        df.to_csv(config.MAIN_DATA_FILE, index=False)
-        df.to_excel(config.EXCEL_FILE, index=False)
+        DataExporter.ensure_folder_exists()
         
         print(f"✅ Main data saved:")
-        print(f"   - {config.MAIN_DATA_FILE}")
-        print(f"   - {config.EXCEL_FILE}")
+        
+        if config.EXPORT_CSV:
+            DataExporter.export_csv(df)
+            print(f"   - {config.MAIN_DATA_FILE}")
+        
+        if config.EXPORT_EXCEL:
+            DataExporter.export_excel(df, kpis, aircraft_analysis, trend)
+            print(f"   - {config.EXCEL_FILE}")
+        
+        if config.EXPORT_PARQUET:
+            DataExporter.export_parquet(df)
+            print(f"   - {config.PARQUET_FOLDER}/")
+    
+    @staticmethod
+    @metrics.instrument('export.csv', rows_arg=0)
+    def export_csv(df, path=None, append=False):
+        """
+        Export main DataFrame to CSV in the published text layout.
+        
+        Args:
+            df (DataFrame): Complete data
+            path (str, optional): Output file (default config.MAIN_DATA_FILE)
+            append (bool): Add the rows, without a header, to the end of
+                an existing file
+        """
+        path = DataExporter._output_path(path, config.MAIN_DATA_FILE)
+        schema.to_legacy(df).to_csv(
+            path, mode='a' if append else 'w', header=not append, index=False
+        )
+    
+    @staticmethod
+    @metrics.instrument('export.excel', rows_arg=0)
+    def export_excel(df, kpis=None, aircraft_analysis=None, trend=None, path=None):
+        """
+        Export main DataFrame and reports to Excel through StreamingExcelWriter.
+        
+        Args:
+            df (DataFrame): Complete data
+            kpis (dict, optional): KPIs for the 'KPIs' sheet
+            aircraft_analysis (DataFrame, optional): Sheet 'Aircraft Analysis'
+            trend (DataFrame, optional): Sheet 'Monthly Trend'
+            path (str, optional): Output file (default config.EXCEL_FILE)
+        """
+        writer = StreamingExcelWriter(DataExporter._output_path(path, config.EXCEL_FILE))
+        for start in range(0, len(df), config.CHUNK_SIZE):
+            writer.append(df.iloc[start:start + config.CHUNK_SIZE])
+        writer.add_reports(kpis, aircraft_analysis, trend)
+        writer.close()
+    
+    @staticmethod
+    @metrics.instrument('export.append', rows_arg=0)
+    def append_main_data(df_chunk, chunk_index=0, csv_path=None, parquet_folder=None):
+        """
+        Append a chunk of the main data to the CSV file and Parquet dataset.
+        
+        The first chunk replaces existing outputs (and writes the CSV header).
+        
+        Args:
+            df_chunk (DataFrame): Chunk of event data
+            chunk_index (int): Position of the chunk in the run
+            csv_path (str, optional): CSV file (default config.MAIN_DATA_FILE)
+            parquet_folder (str, optional): Dataset folder (default config.PARQUET_FOLDER)
+        """
+        first_chunk = chunk_index == 0
+        if first_chunk:
+            DataExporter.ensure_folder_exists()
+        
+        if config.EXPORT_CSV:
+            if first_chunk:
+                csv_path = DataExporter._output_path(csv_path, config.MAIN_DATA_FILE)
+            schema.to_legacy(df_chunk).to_csv(
+                csv_path or config.MAIN_DATA_FILE,
+                mode='w' if first_chunk else 'a',
+                header=first_chunk,
+                index=False
+            )
+        
+        if config.EXPORT_PARQUET:
+            DataExporter.export_parquet(df_chunk, part=chunk_index, folder=parquet_folder)
+    
+    @staticmethod
+    @metrics.instrument('export.parquet', rows_arg=0)
+    def export_parquet(df, part=None, folder=None):
+        """
+        Write events as a Parquet dataset partitioned by year and month.
+        
+        Types are preserved (categoricals are stored dictionary-encoded), so
+        readers can prune partitions and columns instead of parsing text,
+        e.g. pd.read_parquet(folder, columns=[...], filters=[('year', '=', 2025)]).
+        
+        Args:
+            df (DataFrame): Event data
+            part (int or str, optional): Chunk number (or another label
+                for the part files) when adding to the dataset; None (or 0)
+                replaces the whole dataset
+            folder (str, optional): Dataset folder (default config.PARQUET_FOLDER)
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet export requires the 'pyarrow' package") from e
+        
+        if not part:
+            folder = DataExporter._output_path(folder, config.PARQUET_FOLDER)
+        folder = folder or config.PARQUET_FOLDER
+        if not part and os.path.exists(folder):
+            shutil.rmtree(folder)
+        
+        df = schema.to_compact(df)
+        table = pa.Table.from_pandas(
+            df.assign(year=schema.derive(df, 'year'), month=schema.derive(df, 'month')),
+            preserve_index=False
+        )
+        pq.write_to_dataset(
+            table,
+            root_path=folder,
+            partition_cols=['year', 'month'],
+            basename_template=f'part-{part or 0}-{{i}}.parquet',
+            existing_data_behavior='overwrite_or_ignore',
+            compression=config.PARQUET_COMPRESSION
+        )
+    
+    @staticmethod
+    @metrics.instrument('export.partials', rows=lambda *args, **kwargs: 1)
+    def export_partials(partials, path=None):
+        """
+        Save StreamingSafetyAnalyzer partial aggregates for later append runs.
+        
+        Args:
+            partials (dict): Partial aggregates
+            path (str, optional): Output file (default config.PARTIALS_FILE)
+        """
+        path = DataExporter._output_path(path, config.PARTIALS_FILE)
+        with open(path, 'wb') as f:
+            pickle.dump(partials, f, protocol=pickle.HIGHEST_PROTOCOL)
     
     @staticmethod
-    def export_kpis(kpis_dict):
+    @metrics.instrument('export.kpis', rows=lambda *args, **kwargs: 1)
+    def export_kpis(kpis_dict, path=None):
         """
         Export KPIs to CSV.
         
         Args:
             kpis_dict (dict): Dictionary with KPIs
+            path (str, optional): Output file (default config.KPIS_FILE)
         """
+        published = path is None
+        path = DataExporter._output_path(path, config.KPIS_FILE)
         df_kpis = pd.DataFrame([kpis_dict])
-        df_kpis.to_csv(config.KPIS_FILE, index=False)
+        df_kpis.to_csv(path, index=False)
         
-        print(f"✅ KPIs saved: {config.KPIS_FILE}")
+        if published:
+            print(f"✅ KPIs saved: {path}")
     
     @staticmethod
-    def export_aircraft_analysis(df_analysis):
+    @metrics.instrument('export.aircraft', rows_arg=0)
+    def export_aircraft_analysis(df_analysis, path=None):
         """
         Export aircraft analysis to CSV.
         
         Args:
             df_analysis (DataFrame): Aggregated analysis
+            path (str, optional): Output file (default config.AIRCRAFT_ANALYSIS_FILE)
         """
-        df_analysis.to_csv(config.AIRCRAFT_ANALYSIS_FILE)
+        published = path is None
+        path = DataExporter._output_path(path, config.AIRCRAFT_ANALYSIS_FILE)
+        df_analysis.to_csv(path)
         
-        print(f"✅ Aircraft analysis saved: {config.AIRCRAFT_ANALYSIS_FILE}")
+        if published:
+            print(f"✅ Aircraft analysis saved: {path}")
     
     @staticmethod
-    def export_trend(df_trend):
+    @metrics.instrument('export.trend', rows_arg=0)
+    def export_trend(df_trend, path=None):
         """
         Export time trend to CSV.
         
         Args:
             df_trend (DataFrame): Time series
+            path (str, optional): Output file (default config.TREND_FILE)
+        """
+        published = path is None
+        path = DataExporter._output_path(path, config.TREND_FILE)
+        df_trend.to_csv(path, index=False)
+        
+        if published:
+            print(f"✅ Monthly trend saved: {path}")
+
+def _write_output(kind, path, df=None, kpis=None, aircraft_analysis=None, trend=None,
+                  metrics_options=None):
+    """
+    Write one output file (run in an ExportCoordinator worker thread).
+    
+    Args:
+        kind (str): 'csv', 'excel', 'parquet', 'partials', 'kpis',
+            'aircraft' or 'trend'
+        path (str): Staging path to write to
+        df (DataFrame, optional): Complete data (main data outputs and
+            partials)
+        kpis (dict, optional): Main KPIs
+        aircraft_analysis (DataFrame, optional): Analysis by model
+        trend (DataFrame, optional): Monthly trend
+        metrics_options (dict, optional): metrics.recording arguments to
+            record the write in this thread (None: not recording)
+    
+    Returns:
+        tuple: Path written, and the thread's recorded stages (None when
+            not recording) for the caller to merge
+    """
+    options = metrics_options or {}
+    with metrics.recording(metrics_options is not None, **options) as recorder:
+        if kind == 'csv':
+            DataExporter.export_csv(df, path)
+        elif kind == 'excel':
+            DataExporter.export_excel(df, kpis, aircraft_analysis, trend, path=path)
+        elif kind == 'parquet':
+            DataExporter.export_parquet(df, folder=path)
+        elif kind == 'partials':
+            DataExporter.export_partials(StreamingSafetyAnalyzer.compute_partials(df), path)
+        elif kind == 'kpis':
+            DataExporter.export_kpis(kpis, path)
+        elif kind == 'aircraft':
+            DataExporter.export_aircraft_analysis(aircraft_analysis, path)
+        elif kind == 'trend':
+            DataExporter.export_trend(trend, path)
+        else:
+            raise ValueError(f"Unknown output kind: {kind}")
+    return path, recorder.stages if recorder else None
+
+def _link_or_copy(source, target):
+    """Hard-link a file into another snapshot, copying where links are unsupported."""
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+class ExportCoordinator:
+    """
+    Writes all outputs of a run as one consistent snapshot.
+    
+    Every output is first written into a staging folder under
+    config.SNAPSHOTS_FOLDER (independent outputs in parallel on a thread
+    pool); outputs whose stage key is unchanged are linked over from the
+    previous snapshot. Only when all of them succeed is the staging folder
+    renamed to 'snapshots/<id>' and the config.CURRENT_SNAPSHOT link switched
+    to it in one os.replace. The published paths (config.MAIN_DATA_FILE,
+    config.MANIFEST_FILE, ...) are links through CURRENT_SNAPSHOT, so a
+    reader sees either the previous snapshot or the new one, never a mix.
+    If any write fails, the staging folder is removed and the previous
+    snapshot stays current. The manifest lists every file with its size
+    and SHA-256.
+    
+    Where symbolic links are unavailable (e.g. Windows without developer
+    mode), outputs are copied into place one by one instead, which is not
+    atomic across files.
+    """
+    
+    def __init__(self, max_workers=None):
+        """
+        Initialize coordinator.
+        
+        Args:
+            max_workers (int, optional): Worker threads (default config.EXPORT_WORKERS)
+        """
+        self.max_workers = max_workers or config.EXPORT_WORKERS
+        self.snapshot_id = f"{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        self.staging = os.path.join(config.SNAPSHOTS_FOLDER, f'{self.snapshot_id}.tmp')
+        self.pending = {}
+        self.keys = {}
+        self.known = {}
+    
+    @staticmethod
+    def remove_stale_temps(max_age=None):
+        """
+        Remove staging folders left behind by interrupted runs.
+        
+        Only folders untouched for max_age seconds are removed, so the
+        staging folder of a run still in progress is left alone.
+        
+        Args:
+            max_age (float, optional): Age in seconds (default config.STALE_TEMP_SECONDS)
+        """
+        max_age = config.STALE_TEMP_SECONDS if max_age is None else max_age
+        cutoff = time.time() - max_age
+        for path in glob.glob(os.path.join(config.SNAPSHOTS_FOLDER, '*.tmp')):
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    shutil.rmtree(path, ignore_errors=True)
+            except OSError:
+                pass  # Removed by another run meanwhile
+    
+    def temp_path(self, final_path):
+        """
+        Reserve a staging path for an output.
+        
+        Args:
+            final_path (str): Path the output is published to
+        
+        Returns:
+            str: Path of the output in this run's staging folder
+        """
+        temp = os.path.join(self.staging, os.path.relpath(final_path, config.DATA_FOLDER))
+        os.makedirs(os.path.dirname(temp), exist_ok=True)
+        self.pending[final_path] = temp
+        return temp
+    
+    @staticmethod
+    def outputs():
+        """
+        List the outputs enabled in config.
+        
+        Returns:
+            list: (kind, final path) pairs
+        """
+        outputs = []
+        if config.EXPORT_CSV:
+            outputs.append(('csv', config.MAIN_DATA_FILE))
+        if config.EXPORT_EXCEL:
+            outputs.append(('excel', config.EXCEL_FILE))
+        if config.EXPORT_PARQUET:
+            outputs.append(('parquet', config.PARQUET_FOLDER))
+        outputs.append(('partials', config.PARTIALS_FILE))
+        outputs.append(('kpis', config.KPIS_FILE))
+        outputs.append(('aircraft', config.AIRCRAFT_ANALYSIS_FILE))
+        outputs.append(('trend', config.TREND_FILE))
+        return outputs
+    
+    @staticmethod
+    def load_manifest():
+        """
+        Read the committed manifest.
+        
+        Returns:
+            dict: Manifest, or None if there is no readable manifest
+        """
+        try:
+            with open(config.MANIFEST_FILE) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    @staticmethod
+    def _size(path):
+        """Get the total size of an output file or folder (-1 if missing)."""
+        if os.path.isdir(path):
+            files = glob.glob(os.path.join(path, '**', '*'), recursive=True)
+            return sum(os.path.getsize(f) for f in files if os.path.isfile(f))
+        return os.path.getsize(path) if os.path.exists(path) else -1
+    
+    def stale_outputs(self, keys=None):
+        """
+        List the enabled outputs that have to be written.
+        
+        An output is up to date when the manifest records the same stage
+        key for it (see cache.stage_keys) and the file still has the
+        recorded size.
+        
+        Args:
+            keys (dict, optional): Export kind -> stage key (None: all stale)
+        
+        Returns:
+            list: (kind, final path) pairs to write
+        """
+        outputs = self.outputs()
+        if not keys:
+            return outputs
+        
+        files = (self.load_manifest() or {}).get('files', {})
+        stale = []
+        for kind, path in outputs:
+            entry = files.get(os.path.relpath(path, config.DATA_FOLDER), {})
+            if entry.get('key') != keys.get(kind) or self._size(path) != entry.get('bytes'):
+                stale.append((kind, path))
+        return stale
+    
+    def export(self, df, kpis, aircraft_analysis, trend, keys=None, total_events=None):
+        """
+        Write every stale output concurrently and commit the snapshot.
+        
+        Outputs are written on threads, which share the DataFrame instead of
+        copying it to worker processes.
+        
+        Args:
+            df (DataFrame): Complete data (may be None when the main data
+                outputs are up to date)
+            kpis (dict): Main KPIs
+            aircraft_analysis (DataFrame): Analysis by model
+            trend (DataFrame): Monthly trend
+            keys (dict, optional): Export kind -> stage key; outputs whose
+                key is unchanged are kept (default: write everything)
+            total_events (int, optional): Events in the snapshot (default len(df))
+        
+        Returns:
+            dict: Committed manifest
+        """
+        DataExporter.ensure_folder_exists()
+        self.remove_stale_temps()
+        
+        stale = self.stale_outputs(keys)
+        if not stale:
+            print(f"✅ Outputs up to date: {config.MANIFEST_FILE}")
+            return self.load_manifest()
+        
+        recorder = metrics.active()
+        # tracemalloc peaks are process-wide, so they are not measured per thread
+        options = dict(recorder.options(), trace_memory=False) if recorder else None
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(stale))) as executor:
+                futures = [
+                    executor.submit(
+                        _write_output, kind, self.temp_path(path),
+                        df if kind in ('csv', 'excel', 'parquet', 'partials') else None,
+                        kpis, aircraft_analysis, trend, options
+                    )
+                    for kind, path in stale
+                ]
+                for future in futures:
+                    _, stages = future.result()
+                    if recorder and stages:
+                        recorder.merge(stages)
+        except BaseException:
+            self.abort()
+            raise
+        
+        if keys:
+            self.keys = {path: keys[kind] for kind, path in self.outputs() if kind in keys}
+        return self.commit(total_events=len(df) if total_events is None else total_events)
+    
+    def append(self, df, kpis, aircraft_analysis, trend, partials):
+        """
+        Publish the current snapshot extended with new events.
+        
+        The new snapshot links the files of the current one and only adds
+        the new events: the CSV is copied and gets the new rows at the end,
+        and the Parquet dataset gets new part files in the year/month
+        partitions of the new events, next to links to the existing ones.
+        The reports are replaced. An Excel workbook cannot be extended in
+        place, so it is rebuilt from the events read back from it.
+        
+        Args:
+            df (DataFrame): New scored events (numbered after the current ones)
+            kpis (dict): Main KPIs over all events
+            aircraft_analysis (DataFrame): Analysis by model over all events
+            trend (DataFrame): Monthly trend over all events
+            partials (dict): Merged partial aggregates of all events
+        
+        Returns:
+            dict: Committed manifest
+        
+        Raises:
+            ValueError: If an enabled output is not in the current snapshot
+        """
+        DataExporter.ensure_folder_exists()
+        self.remove_stale_temps()
+        
+        previous = (self.load_manifest() or {}).get('files', {})
+        for kind, final in self.outputs():
+            if kind in ('csv', 'excel', 'parquet') and (
+                os.path.relpath(final, config.DATA_FOLDER) not in previous
+                or not os.path.exists(final)
+            ):
+                raise ValueError(f"{final} is not in the current snapshot; run the full pipeline first")
+        
+        try:
+            for kind, final in self.outputs():
+                temp = self.temp_path(final)
+                source = os.path.realpath(final)
+                if kind == 'csv':
+                    shutil.copyfile(source, temp)
+                    DataExporter.export_csv(df, temp, append=True)
+                elif kind == 'parquet':
+                    shutil.copytree(source, temp, copy_function=_link_or_copy)
+                    DataExporter.export_parquet(df, part=self.snapshot_id, folder=temp)
+                    name = os.path.relpath(final, config.DATA_FOLDER)
+                    self.known[final] = previous[name].get('checksums')
+                elif kind == 'excel':
+                    print(f"⚠️  Rebuilding {final}: its cost grows with the dataset (disable EXPORT_EXCEL for appends)")
+                    stored = DataLoader.load_excel(
+                        source, list(schema.EVENT_SCHEMA) + list(schema.SCORE_SCHEMA)
+                    )
+                    DataExporter.export_excel(
+                        schema.conform(pd.concat([stored, df], ignore_index=True)),
+                        kpis, aircraft_analysis, trend, path=temp
+                    )
+                elif kind == 'partials':
+                    DataExporter.export_partials(partials, temp)
+                elif kind == 'kpis':
+                    DataExporter.export_kpis(kpis, temp)
+                elif kind == 'aircraft':
+                    DataExporter.export_aircraft_analysis(aircraft_analysis, temp)
+                elif kind == 'trend':
+                    DataExporter.export_trend(trend, temp)
+        except BaseException:
+            self.abort()
+            raise
+        
+        return self.commit(total_events=partials['total_events'])
+    
+    @staticmethod
+    def _checksum(path):
+        """Get the SHA-256 of a file."""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    @staticmethod
+    def _describe(path, known=None):
+        """
+        Get size and checksum of an output file or folder.
+        
+        A folder gets the SHA-256 of each file under 'checksums', and as
+        'sha256' the SHA-256 of those in sorted order, so files kept from
+        a previous snapshot need not be read again.
+        
+        Args:
+            path (str): File or folder
+            known (dict, optional): Relative file name -> SHA-256 of files
+                of the folder known to be unchanged
+        
+        Returns:
+            dict: Bytes, SHA-256 and file count (and per-file checksums
+                for a folder)
+        """
+        if not os.path.isdir(path):
+            return {
+                'bytes': os.path.getsize(path),
+                'sha256': ExportCoordinator._checksum(path),
+                'files': 1
+            }
+        
+        known = known or {}
+        files = sorted(glob.glob(os.path.join(path, '**', '*'), recursive=True))
+        files = [f for f in files if os.path.isfile(f)]
+        checksums = {}
+        for file in files:
+            name = os.path.relpath(file, path).replace(os.sep, '/')
+            checksums[name] = known.get(name) or ExportCoordinator._checksum(file)
+        
+        digest = hashlib.sha256()
+        for name, checksum in checksums.items():
+            digest.update(f'{name} {checksum}\n'.encode('utf-8'))
+        return {
+            'bytes': sum(os.path.getsize(f) for f in files),
+            'sha256': digest.hexdigest(),
+            'files': len(files),
+            'checksums': checksums
+        }
+    
+    def _carry_over(self, final):
+        """
+        Put an unchanged output of the previous snapshot into the staging folder.
+        
+        Args:
+            final (str): Published path of the output
+        """
+        source = os.path.realpath(final)
+        target = os.path.join(self.staging, os.path.relpath(final, config.DATA_FOLDER))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if os.path.isdir(source):
+            shutil.copytree(source, target, copy_function=_link_or_copy)
+        else:
+            _link_or_copy(source, target)
+    
+    def commit(self, total_events=None):
+        """
+        Publish all pending outputs and the manifest as one snapshot.
+        
+        Args:
+            total_events (int, optional): Events in the snapshot
+        
+        Returns:
+            dict: Committed manifest
+        """
+        # Outputs kept from the previous snapshot keep their manifest entry
+        previous = (self.load_manifest() or {}).get('files', {})
+        files = {}
+        try:
+            for kind, final in self.outputs():
+                name = os.path.relpath(final, config.DATA_FOLDER)
+                if final in self.pending:
+                    files[name] = self._describe(self.pending[final], self.known.get(final))
+                    if final in self.keys:
+                        files[name]['key'] = self.keys[final]
+                elif name in previous and os.path.exists(final):
+                    self._carry_over(final)
+                    files[name] = previous[name]
+            for final, temp in self.pending.items():
+                name = os.path.relpath(final, config.DATA_FOLDER)
+                if name not in files:
+                    files[name] = self._describe(temp)
+            
+            manifest = {
+                'snapshot_id': self.snapshot_id,
+                'created_at': datetime.now().isoformat(timespec='seconds'),
+                'total_events': total_events,
+                'files': files
+            }
+            manifest_name = os.path.relpath(config.MANIFEST_FILE, config.DATA_FOLDER)
+            os.makedirs(self.staging, exist_ok=True)
+            with open(os.path.join(self.staging, manifest_name), 'w') as f:
+                json.dump(manifest, f, indent=2)
+            
+            snapshot = os.path.join(config.SNAPSHOTS_FOLDER, self.snapshot_id)
+            os.replace(self.staging, snapshot)
+        except BaseException:
+            self.abort()
+            raise
+        self.pending = {}
+        
+        self._publish(snapshot, list(files) + [manifest_name])
+        # Outputs no longer enabled would otherwise be left as broken links
+        for name in set(previous) - set(files):
+            path = os.path.join(config.DATA_FOLDER, name)
+            if os.path.islink(path):
+                os.remove(path)
+        self.prune()
+        
+        print(f"✅ Snapshot {self.snapshot_id} committed: {config.MANIFEST_FILE}")
+        for name in files:
+            print(f"   - {os.path.join(config.DATA_FOLDER, name)}")
+        return manifest
+    
+    @staticmethod
+    def _replace_link(target, path, suffix):
+        """Atomically point path at target, replacing whatever is there."""
+        link = f'{path}.tmp-{suffix}'
+        os.symlink(target, link)
+        if os.path.isdir(path) and not os.path.islink(path):
+            # Real folder from before snapshots: a link cannot replace it in one step
+            shutil.rmtree(path)
+        os.replace(link, path)
+    
+    def _publish(self, snapshot, names):
+        """
+        Make a committed snapshot current.
+        
+        Args:
+            snapshot (str): Snapshot folder
+            names (list): Output names relative to config.DATA_FOLDER
+        """
+        current = config.CURRENT_SNAPSHOT
+        try:
+            self._replace_link(
+                os.path.relpath(snapshot, os.path.dirname(current)), current, self.snapshot_id
+            )
+        except (OSError, NotImplementedError):
+            self._publish_copies(snapshot, names)
+            return
+        
+        for name in names:
+            path = os.path.join(config.DATA_FOLDER, name)
+            target = os.path.relpath(os.path.join(current, name), os.path.dirname(path))
+            if os.path.islink(path) and os.readlink(path) == target:
+                continue
+            self._replace_link(target, path, self.snapshot_id)
+    
+    def _publish_copies(self, snapshot, names):
+        """Copy a snapshot's outputs over the published paths (no symlink support)."""
+        for name in names:
+            source = os.path.join(snapshot, name)
+            path = os.path.join(config.DATA_FOLDER, name)
+            temp = f'{path}.tmp-{self.snapshot_id}'
+            if os.path.isdir(source):
+                shutil.copytree(source, temp, copy_function=_link_or_copy)
+                if os.path.exists(path):
+                    shutil.rmtree(path)
+            else:
+                _link_or_copy(source, temp)
+            os.replace(temp, path)
+    
+    def prune(self, keep=None):
+        """
+        Delete old snapshots.
+        
+        The newest snapshots are kept so that readers still holding files
+        of the previous snapshot are not cut off.
+        
+        Args:
+            keep (int, optional): Snapshots to keep (default config.SNAPSHOTS_KEPT)
+        """
+        keep = config.SNAPSHOTS_KEPT if keep is None else keep
+        current = os.path.realpath(config.CURRENT_SNAPSHOT)
+        # Oldest first (ids only have one-second resolution)
+        snapshots = sorted(
+            (path for path in glob.glob(os.path.join(config.SNAPSHOTS_FOLDER, '*'))
+             if os.path.isdir(path) and not path.endswith('.tmp')),
+            key=lambda path: (os.path.getmtime(path), path)
+        )
+        for path in snapshots[:max(len(snapshots) - keep, 0)]:
+            if os.path.realpath(path) != current:
+                shutil.rmtree(path, ignore_errors=True)
+    
+    def abort(self):
+        """Remove this run's staging folder."""
+        shutil.rmtree(self.staging, ignore_errors=True)
+        self.pending = {}
+
+class StreamingExcelWriter:
+    """
+    Constant-memory Excel writer fed chunk by chunk.
+    
+    Uses an openpyxl write-only workbook, which streams rows to disk instead
+    of keeping cells in memory. Event rows continue on a new sheet
+    ('Events 2', 'Events 3', ...) whenever a sheet reaches
+    config.EXCEL_MAX_ROWS (Excel's limit is 1,048,576 rows including the header).
+    """
+    
+    def __init__(self, path, max_rows=None):
+        """
+        Initialize writer.
+        
+        Args:
+            path (str): Output .xlsx file
+            max_rows (int, optional): Rows per sheet including the header
+                (default config.EXCEL_MAX_ROWS)
+        """
+        from openpyxl import Workbook
+        
+        self.path = path
+        self.max_rows = max_rows or config.EXCEL_MAX_ROWS
+        self.workbook = Workbook(write_only=True)
+        self.sheet = None
+        self.sheet_rows = 0
+        self.sheets = 0
+        self.rows_written = 0
+        self.write_seconds = 0.0
+    
+    @staticmethod
+    def _rows(df):
+        """
+        Convert a DataFrame to plain row tuples (missing values as None).
+        
+        Args:
+            df (DataFrame): Data to convert
+        
+        Returns:
+            iterator: One tuple per row
+        """
+        columns = [
+            df[column].astype(object).where(df[column].notna(), None).tolist()
+            for column in df.columns
+        ]
+        return zip(*columns)
+    
+    def _new_events_sheet(self, header):
+        """Open the next events sheet and write the header row."""
+        self.sheets += 1
+        title = 'Events' if self.sheets == 1 else f'Events {self.sheets}'
+        self.sheet = self.workbook.create_sheet(title)
+        self.sheet.append(header)
+        self.sheet_rows = 1
+    
+    def append(self, df_chunk):
+        """
+        Append a chunk of events, splitting across sheets at the row limit.
+        
+        Args:
+            df_chunk (DataFrame): Chunk of event data
+        """
+        started = time.perf_counter()
+        legacy = schema.to_legacy(df_chunk)
+        header = list(legacy.columns)
+        
+        for row in self._rows(legacy):
+            if self.sheet is None or self.sheet_rows >= self.max_rows:
+                self._new_events_sheet(header)
+            self.sheet.append(row)
+            self.sheet_rows += 1
+        self.rows_written += len(legacy)
+        self.write_seconds += time.perf_counter() - started
+    
+    def add_table(self, title, df, index=False):
+        """
+        Write a small table (e.g. a report) as its own sheet.
+        
+        Args:
+            title (str): Sheet title
+            df (DataFrame): Table to write
+            index (bool): Whether to write the index as the first column
+        """
+        if index:
+            df = df.reset_index()
+        sheet = self.workbook.create_sheet(title)
+        sheet.append(list(df.columns))
+        for row in self._rows(df):
+            sheet.append(row)
+    
+    def add_reports(self, kpis=None, aircraft_analysis=None, trend=None):
+        """
+        Write the KPI, aircraft and trend reports as extra sheets.
+        
+        Args:
+            kpis (dict, optional): Main KPIs
+            aircraft_analysis (DataFrame, optional): Analysis by model
+            trend (DataFrame, optional): Monthly trend
+        """
+        if kpis is not None:
+            self.add_table('KPIs', pd.DataFrame([kpis]))
+        if aircraft_analysis is not None:
+            self.add_table('Aircraft Analysis', aircraft_analysis, index=True)
+        if trend is not None:
+            self.add_table('Monthly Trend', trend)
+    
+    def close(self):
+        """
+        Save the workbook and report write throughput.
+        
+        Throughput counts the time spent writing event rows and saving,
+        not the time spent producing the chunks.
+        
+        Returns:
+            dict: Rows written, sheets used, seconds and rows per second
         """
-        df_trend.to_csv(config.TREND_FILE, index=False)
+        started = time.perf_counter()
+        if self.sheet is None:
+            self._new_events_sheet(schema.LEGACY_COLUMNS)
+        self.workbook.save(self.path)
         
-        print(f"✅ Monthly trend saved: {config.TREND_FILE}")
\ No newline at end of file
+        seconds = self.write_seconds + time.perf_counter() - started
+        stats = {
+            'rows': self.rows_written,
+            'sheets': self.sheets,
+            'seconds': round(seconds, 2),
+            'rows_per_second': round(self.rows_written / seconds) if seconds else 0
+        }
+        print(
+            f"✅ Excel: {stats['rows']} rows on {stats['sheets']} sheet(s) "
+            f"in {stats['seconds']}s ({stats['rows_per_second']} rows/s)"
+        )
+        return stats
@@ -0,0 +1,245 @@
+# IMPORTANT DISCLAIMER
+# ====================
+# This project uses SYNTHETIC DATA for educational purposes.
+# Data does NOT represent any real actual fleet performance.
+# All incidents, costs, and metrics are RANDOMLY GENERATED.
+
+"""
+Module simulating a live control-room event feed with asyncio.
+A rate-limited producer emits micro-batches into a bounded queue; concurrent
+consumers score them, update the KPIs and append them to a sink.
+Made for demonstration, testing, and learning purposes.
+"""
+
+import asyncio
+import time
+import numpy as np
+import pandas as pd
+from . import config, schema
+from .analyzers import IncrementalSafetyAnalyzer
+from .data_generator import SafetyEventGenerator
+from .exporters import DataExporter
+from .risk_calculator import RiskCalculator
+from .rolling import RollingWindowTracker
+from .sketches import SafetySketches
+
+class MemorySink:
+    """Local stand-in sink that keeps received events in memory (for tests)."""
+    
+    def __init__(self):
+        """Initialize empty sink."""
+        self.batches = []
+        self.events = 0
+    
+    async def write(self, df):
+        """
+        Store a micro-batch.
+        
+        Args:
+            df (DataFrame): Scored events
+        """
+        self.batches.append(df)
+        self.events += len(df)
+    
+    def to_frame(self):
+        """
+        Get every received event.
+        
+        Returns:
+            DataFrame: Concatenated micro-batches
+        """
+        return pd.concat(self.batches, ignore_index=True)
+
+class CsvSink:
+    """Sink appending events to a CSV file in the published text layout."""
+    
+    def __init__(self, path=None):
+        """
+        Initialize sink.
+        
+        Args:
+            path (str, optional): Output file (default config.LIVE_FEED_FILE)
+        """
+        self.path = path or config.LIVE_FEED_FILE
+        self.events = 0
+        self._lock = asyncio.Lock()
+    
+    def _append(self, df):
+        """Write a micro-batch (the first one replaces the file)."""
+        first_batch = self.events == 0
+        if first_batch:
+            DataExporter.ensure_folder_exists()
+        schema.to_legacy(df).to_csv(
+            self.path,
+            mode='w' if first_batch else 'a',
+            header=first_batch,
+            index=False
+        )
+    
+    async def write(self, df):
+        """
+        Append a micro-batch without blocking the event loop.
+        
+        Writes are serialized so batches from concurrent consumers never
+        interleave.
+        
+        Args:
+            df (DataFrame): Scored events
+        """
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._append, df)
+            self.events += len(df)
+
+class LiveEventFeed:
+    """
+    Rate-limited live event producer with concurrent consumers.
+    
+    The producer emits micro-batches of batch_size events at events_per_second
+    into a queue of at most queue_size batches. When consumers fall behind
+    the queue fills up and the producer waits (backpressure) instead of
+    buffering without bound. Each consumer scores a batch, folds it into the
+    shared IncrementalSafetyAnalyzer and RollingWindowTracker (and, in
+    sketch mode, SafetySketches) and writes it to the sink. Latency is
+    measured from batch creation to sink write.
+    """
+    
+    def __init__(self, sink, events_per_second=None, batch_size=None,
+                 queue_size=None, consumers=None, seed=None, sketches=None):
+        """
+        Initialize feed.
+        
+        Args:
+            sink: Object with an async write(df) method (MemorySink, CsvSink)
+            events_per_second (float, optional): Target rate (default config.LIVE_RATE)
+            batch_size (int, optional): Events per micro-batch (default config.LIVE_BATCH_SIZE)
+            queue_size (int, optional): Max queued batches (default config.LIVE_QUEUE_SIZE)
+            consumers (int, optional): Concurrent consumers (default config.LIVE_CONSUMERS)
+            seed (int, optional): Seed for reproducibility
+            sketches (bool, optional): Keep fixed-memory top-k, quantile and
+                distinct-count sketches (default config.LIVE_SKETCHES)
+        """
+        self.sink = sink
+        self.events_per_second = events_per_second or config.LIVE_RATE
+        self.batch_size = batch_size or config.LIVE_BATCH_SIZE
+        self.queue_size = queue_size or config.LIVE_QUEUE_SIZE
+        self.consumers = consumers or config.LIVE_CONSUMERS
+        self.generator = SafetyEventGenerator(seed=seed)
+        self.analyzer = IncrementalSafetyAnalyzer()
+        self.rolling = RollingWindowTracker()
+        if sketches is None:
+            sketches = config.LIVE_SKETCHES
+        self.sketches = SafetySketches() if sketches else None
+        self.latencies = []
+        self.batch_sizes = []
+        self.backpressure_waits = 0
+    
+    def _next_batch(self, first_index, size):
+        """
+        Sample a micro-batch of events happening now.
+        
+        Args:
+            first_index (int): Index of the first event (for event_id)
+            size (int): Number of events
+        
+        Returns:
+            DataFrame: Events in the compact schema
+        """
+        day_offsets = np.full(size, config.PERIOD_DAYS, dtype=np.int16)
+        df = pd.DataFrame(SafetyEventGenerator.sample_event_columns(
+            self.generator.rng, day_offsets, first_index=first_index
+        ))
+        df['timestamp'] = np.datetime64(pd.Timestamp.now().floor('min'), 'ns')
+        return df
+    
+    async def _produce(self, queue, num_events):
+        """Emit micro-batches at the target rate until num_events are sent."""
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        emitted = 0
+        while emitted < num_events:
+            # Pace batches on a fixed schedule so the average rate holds
+            delay = started + emitted / self.events_per_second - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            
+            size = min(self.batch_size, num_events - emitted)
+            # Sample off the event loop so consumers keep running meanwhile
+            batch = await loop.run_in_executor(None, self._next_batch, emitted, size)
+            if queue.full():
+                self.backpressure_waits += 1
+            await queue.put((time.perf_counter(), batch))
+            emitted += size
+        
+        for _ in range(self.consumers):
+            await queue.put(None)
+    
+    async def _consume(self, queue):
+        """Score, aggregate and store batches until the producer is done."""
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            created, batch = item
+            batch = RiskCalculator.add_scores_to_dataframe(batch)
+            batch = RiskCalculator.add_classification(batch)
+            self.analyzer.update(batch)
+            self.rolling.update(batch)
+            if self.sketches:
+                self.sketches.update(batch)
+            await self.sink.write(batch)
+            self.latencies.append(time.perf_counter() - created)
+            self.batch_sizes.append(len(batch))
+    
+    async def run(self, num_events):
+        """
+        Run the feed until num_events have been produced and consumed.
+        
+        Args:
+            num_events (int): Events to emit
+        
+        Returns:
+            dict: Throughput, latency percentiles (ms), backpressure count,
+                KPIs and, in sketch mode, the sketch summary
+        """
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        started = time.perf_counter()
+        await asyncio.gather(
+            self._produce(queue, num_events),
+            *(self._consume(queue) for _ in range(self.consumers))
+        )
+        seconds = time.perf_counter() - started
+        
+        # Every event in a batch shares the batch latency
+        latencies = np.repeat(self.latencies, self.batch_sizes) * 1000
+        # Latencies and KPIs are None when no event was emitted
+        def latency(q):
+            return round(float(np.percentile(latencies, q)), 3) if latencies.size else None
+        
+        return {
+            'events': int(latencies.size),
+            'seconds': round(seconds, 3),
+            'events_per_second': round(latencies.size / seconds, 1) if seconds > 0 else 0.0,
+            'latency_ms_p50': latency(50),
+            'latency_ms_p95': latency(95),
+            'latency_ms_p99': latency(99),
+            'latency_ms_max': latency(100),
+            'backpressure_waits': self.backpressure_waits,
+            'kpis': self.analyzer.calculate_main_kpis() if latencies.size else None,
+            'sketches': self.sketches.summary() if self.sketches else None
+        }
+
+def run_live_feed(num_events, sink=None, **options):
+    """
+    Run a live feed to completion from synchronous code.
+    
+    Args:
+        num_events (int): Events to emit
+        sink (optional): Sink with async write(df) (default MemorySink)
+        **options: LiveEventFeed options (events_per_second, batch_size, ...)
+    
+    Returns:
+        dict: Feed statistics (see LiveEventFeed.run)
+    """
+    feed = LiveEventFeed(sink or MemorySink(), **options)
+    return asyncio.run(feed.run(num_events))
\ No newline at end of file
@@ -0,0 +1,499 @@
+# IMPORTANT DISCLAIMER
+# ====================
+# This project uses SYNTHETIC DATA for educational purposes.
+# Data does NOT represent any real actual fleet performance.
+# All incidents, costs, and metrics are RANDOMLY GENERATED.
+
+"""
+Module responsible for loading existing event datasets.
+Reads exported CSV, Excel, Parquet and Arrow files into the compact schema,
+so they can be scored and analyzed without regenerating them.
+Made for demonstration, testing, and learning purposes.
+"""
+
+import numpy as np
+import os
+import pandas as pd
+import pickle
+from . import config, metrics, schema
+
+# Columns of the published text layout that hold stored data ('month',
+# 'year', 'quarter' and 'day_of_week' are derived from the timestamp)
+TEXT_COLUMNS = ['event_id', 'date', 'time'] + list(schema.EVENT_SCHEMA)[2:]
+
+# Loader method by file extension (a folder is read as a Parquet dataset)
+FORMATS = {
+    '.csv': 'load_csv',
+    '.xlsx': 'load_excel',
+    '.parquet': 'load_parquet',
+    '.arrow': 'load_arrow',
+    '.feather': 'load_arrow'
+}
+
+# Approximate size of an event in the published CSV, used to turn a chunk
+# size in rows into the block size of the streaming CSV reader
+CSV_ROW_BYTES = 160
+
+def _compact_columns(columns):
+    """
+    List the compact schema columns to load.
+    
+    Args:
+        columns (list, optional): Columns asked for (default every event
+            column, without the score columns)
+    
+    Returns:
+        list: Columns, always starting with 'event_id' and 'timestamp'
+    """
+    if columns is None:
+        return list(schema.EVENT_SCHEMA)
+    return ['event_id', 'timestamp'] + [
+        column for column in columns if column not in ('event_id', 'timestamp')
+    ]
+
+def _text_columns(columns):
+    """
+    Map compact schema columns to the text layout columns holding them.
+    
+    Args:
+        columns (list, optional): Compact schema columns
+    
+    Returns:
+        list: Text layout columns ('timestamp' is read from 'date' and 'time')
+    """
+    text_columns = []
+    for column in _compact_columns(columns):
+        text_columns.extend(['date', 'time'] if column == 'timestamp' else [column])
+    return text_columns
+
+def _arrow_types(text_columns):
+    """
+    Build the Arrow column types used to parse the text layout.
+    
+    Low-cardinality text is read dictionary-encoded (it becomes a
+    categorical without materializing one string per row), dates as
+    date32, flags as booleans and 'resolution_days' as a uint16 whose empty
+    cells are nulls.
+    
+    Args:
+        text_columns (list): Columns to read
+    
+    Returns:
+        dict: Column name -> Arrow type
+    """
+    import pyarrow as pa
+    
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    types = {
+        'event_id': pa.string(),
+        'date': pa.date32(),
+        'time': dictionary,
+        'resolution_days': pa.uint16(),
+        'risk_score': pa.int8(),
+        'risk_classification': dictionary
+    }
+    for column in text_columns:
+        dtype = schema.EVENT_SCHEMA.get(column)
+        if column in types or dtype is None:
+            continue
+        if isinstance(dtype, pd.CategoricalDtype):
+            types[column] = dictionary
+        elif column in schema.FLAG_COLUMNS:
+            types[column] = pa.bool_()
+        else:
+            types[column] = pa.from_numpy_dtype(np.dtype(dtype))
+    return {column: types[column] for column in text_columns if column in types}
+
+def _pandas_dtypes(text_columns):
+    """
+    Build the pd.read_csv dtypes used to parse the text layout.
+    
+    Dates, times and flags are read as categoricals, so each distinct
+    value is parsed once when converting to the compact schema.
+    
+    Args:
+        text_columns (list): Columns to read
+    
+    Returns:
+        dict: Column name -> dtype
+    """
+    dtypes = {}
+    for column in text_columns:
+        if column == 'event_id':
+            dtypes[column] = str
+        elif column in ('date', 'time') or column in schema.FLAG_COLUMNS:
+            dtypes[column] = 'category'
+        elif column in schema.EVENT_SCHEMA:
+            dtypes[column] = schema.EVENT_SCHEMA[column]
+        elif column in schema.SCORE_SCHEMA:
+            dtypes[column] = schema.SCORE_SCHEMA[column]
+    return dtypes
+
+def _csv_convert_options(text_columns):
+    """
+    Build the pyarrow CSV conversion options for the text layout.
+    
+    Only empty cells are missing ('None' is a damage level).
+    
+    Args:
+        text_columns (list): Columns to read
+    
+    Returns:
+        ConvertOptions: Column types, Yes/No flags and null values
+    """
+    import pyarrow.csv as pv
+    
+    return pv.ConvertOptions(
+        column_types=_arrow_types(text_columns),
+        include_columns=text_columns,
+        true_values=['Yes'],
+        false_values=['No'],
+        null_values=[''],
+        strings_can_be_null=True
+    )
+
+def _event_numbers(table):
+    """
+    Replace the text event ids of an Arrow table with their numbers.
+    
+    Args:
+        table (Table): Table with a string 'event_id' column
+    
+    Returns:
+        Table: Table with a uint32 'event_id' column
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    
+    event_ids = table['event_id']
+    if not pa.types.is_string(event_ids.type):
+        return table
+    if not pc.all(pc.starts_with(event_ids, 'EVT')).as_py():
+        raise ValueError("event_id values must look like 'EVT0001'")
+    numbers = pc.cast(pc.utf8_slice_codeunits(event_ids, 3), pa.uint32())
+    return table.set_column(table.schema.get_field_index('event_id'), 'event_id', numbers)
+
+def _to_frame(table):
+    """
+    Convert an Arrow table to a DataFrame in the compact schema.
+    
+    Args:
+        table (Table): Events in the text layout or in the compact schema
+    
+    Returns:
+        DataFrame: Event data in the compact schema
+    """
+    import pyarrow as pa
+    
+    if 'event_id' in table.column_names:
+        table = _event_numbers(table)
+    # Nullable counts and flags become pandas' nullable dtypes instead of
+    # floats and objects (conform narrows flags without nulls to bool)
+    nullable = {pa.uint16(): pd.UInt16Dtype(), pa.bool_(): pd.BooleanDtype()}
+    df = table.to_pandas(types_mapper=nullable.get, date_as_object=False)
+    return schema.conform(df) if schema.is_compact(df) else schema.to_compact(df)
+
+def _table_columns(columns, names):
+    """
+    Choose the columns to read from a typed file.
+    
+    Args:
+        columns (list, optional): Compact schema columns
+        names (list): Columns in the file
+    
+    Returns:
+        list: Columns to read, in the file's layout
+    """
+    if 'timestamp' in names:
+        wanted = _compact_columns(columns)
+    else:
+        wanted = _text_columns(columns)
+    missing = [column for column in wanted if column not in names]
+    if missing:
+        raise ValueError(f"Columns not found in the input: {', '.join(missing)}")
+    return wanted
+
+class DataLoader:
+    """Loader of existing event datasets into the compact schema."""
+    
+    @staticmethod
+    def load(path, columns=None):
+        """
+        Load events from a file, choosing the reader by its extension.
+        
+        Args:
+            path (str): CSV, XLSX, Parquet (file or dataset folder), Arrow
+                or Feather file
+            columns (list, optional): Compact schema columns to load
+                (default every event column, without the score columns,
+                which the pipeline recalculates); 'event_id' and
+                'timestamp' are always loaded
+        
+        Returns:
+            DataFrame: Event data in the compact schema
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Input not found: {path}")
+        if os.path.isdir(path):
+            return DataLoader.load_parquet(path, columns)
+        
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in FORMATS:
+            raise ValueError(
+                f"Unknown input format '{extension}' (expected {', '.join(FORMATS)} or a Parquet folder)"
+            )
+        return getattr(DataLoader, FORMATS[extension])(path, columns)
+    
+    @staticmethod
+    def load_csv(path, columns=None, engine=None):
+        """
+        Load events from a CSV file in the published text layout.
+        
+        The pyarrow engine parses blocks of the file on all cores straight
+        into typed columns; only the requested columns are converted. The
+        pandas engine reads the same schema with pd.read_csv.
+        
+        Args:
+            path (str): CSV file (e.g. config.MAIN_DATA_FILE)
+            columns (list, optional): Compact schema columns to load
+            engine (str, optional): 'pyarrow' or 'pandas' (default pyarrow
+                when installed)
+        
+        Returns:
+            DataFrame: Event data in the compact schema
+        """
+        if engine is None:
+            try:
+                import pyarrow.csv
+                engine = 'pyarrow'
+            except ImportError:
+                engine = 'pandas'
+        text_columns = _text_columns(columns)
+        
+        with metrics.stage('load.csv') as record:
+            if engine == 'pyarrow':
+                import pyarrow.csv as pv
+                
+                table = pv.read_csv(
+                    path,
+                    read_options=pv.ReadOptions(use_threads=True),
+                    convert_options=_csv_convert_options(text_columns)
+                )
+                df = _to_frame(table)
+            elif engine == 'pandas':
+                # Only empty cells are missing ('None' is a damage level)
+                df = schema.to_compact(
+                    pd.read_csv(
+                        path, usecols=text_columns, dtype=_pandas_dtypes(text_columns),
+                        keep_default_na=False, na_values=['']
+                    )
+                )
+            else:
+                raise ValueError(f"Unknown CSV engine: {engine}")
+            record['rows'] = len(df)
+        return df
+    
+    @staticmethod
+    def load_excel(path, columns=None):
+        """
+        Load events from an Excel workbook written by export_excel.
+        
+        Events are read from the 'Events', 'Events 2', ... sheets; report
+        sheets are skipped.
+        
+        Args:
+            path (str): Workbook (e.g. config.EXCEL_FILE)
+            columns (list, optional): Compact schema columns to load
+        
+        Returns:
+            DataFrame: Event data in the compact schema
+        """
+        text_columns = _text_columns(columns)
+        
+        with metrics.stage('load.excel') as record:
+            with pd.ExcelFile(path) as workbook:
+                names = [
+                    name for name in workbook.sheet_names
+                    if name == 'Events' or name.startswith('Events ')
+                ]
+                if not names:
+                    raise ValueError(f"No 'Events' sheet in {path}")
+                events = pd.read_excel(
+                    workbook, sheet_name=names, usecols=text_columns,
+                    dtype={'event_id': str, 'resolution_days': 'UInt16'},
+                    keep_default_na=False, na_values=['']
+                ).values()
+            df = schema.to_compact(pd.concat(events, ignore_index=True))
+            record['rows'] = len(df)
+        return df
+    
+    @staticmethod
+    def load_parquet(path, columns=None, filters=None):
+        """
+        Load events from a Parquet file or a dataset written by export_parquet.
+        
+        Files are memory-mapped and only the requested columns are read;
+        filters on the partition columns skip whole partitions.
+        
+        Args:
+            path (str): Parquet file or dataset folder (e.g. config.PARQUET_FOLDER)
+            columns (list, optional): Compact schema columns to load
+            filters (list, optional): pyarrow filters, e.g.
+                [('year', '=', 2025), ('month', 'in', [1, 2])]
+        
+        Returns:
+            DataFrame: Event data in the compact schema
+        """
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet input requires the 'pyarrow' package") from e
+        
+        with metrics.stage('load.parquet') as record:
+            names = pq.ParquetDataset(path).schema.names
+            table = pq.read_table(
+                path, columns=_table_columns(columns, names), filters=filters, memory_map=True
+            )
+            df = _to_frame(table)
+            record['rows'] = len(df)
+        return df
+    
+    @staticmethod
+    def load_arrow(path, columns=None):
+        """
+        Load events from an Arrow IPC (Feather v2) file.
+        
+        The file is memory-mapped: uncompressed columns are used in place
+        instead of being read into memory first.
+        
+        Args:
+            path (str): Arrow or Feather file
+            columns (list, optional): Compact schema columns to load
+        
+        Returns:
+            DataFrame: Event data in the compact schema
+        """
+        try:
+            import pyarrow.feather as feather
+            import pyarrow.ipc as ipc
+        except ImportError as e:
+            raise ImportError("Arrow input requires the 'pyarrow' package") from e
+        
+        with metrics.stage('load.arrow') as record:
+            with ipc.open_file(path) as reader:
+                names = reader.schema.names
+            table = feather.read_table(
+                path, columns=_table_columns(columns, names), memory_map=True
+            )
+            df = _to_frame(table)
+            record['rows'] = len(df)
+        return df
+    
+    @staticmethod
+    def partitions(path):
+        """
+        List the files of a dataset, one per partition.
+        
+        Args:
+            path (str): Parquet dataset folder, or a single file
+        
+        Returns:
+            list: Data files (the path itself for a file)
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Input not found: {path}")
+        if not os.path.isdir(path):
+            return [path]
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet input requires the 'pyarrow' package") from e
+        return sorted(pq.ParquetDataset(path).files)
+    
+    @staticmethod
+    def iter_chunks(path, columns=None, chunk_size=None):
+        """
+        Read events from a file or dataset one chunk at a time.
+        
+        Only one chunk is held in memory: Parquet files are read by batches
+        of rows, Arrow files are memory-mapped and sliced, and CSV files are
+        parsed by blocks of about chunk_size rows. Excel workbooks cannot be
+        read in parts and come as a single chunk.
+        
+        Args:
+            path (str): File or Parquet dataset folder (see load)
+            columns (list, optional): Compact schema columns to load
+            chunk_size (int, optional): Rows per chunk (default config.CHUNK_SIZE)
+        
+        Yields:
+            DataFrame: Next chunk of events in the compact schema
+        """
+        chunk_size = chunk_size or config.CHUNK_SIZE
+        if os.path.isdir(path):
+            for partition in DataLoader.partitions(path):
+                yield from DataLoader.iter_chunks(partition, columns, chunk_size)
+            return
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Input not found: {path}")
+        
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in FORMATS:
+            raise ValueError(f"Unknown input format '{extension}' (expected {', '.join(FORMATS)})")
+        if extension == '.xlsx':
+            yield DataLoader.load_excel(path, columns)
+            return
+        
+        import pyarrow as pa
+        
+        if extension == '.csv':
+            import pyarrow.csv as pv
+            
+            batches = pv.open_csv(
+                path,
+                read_options=pv.ReadOptions(block_size=chunk_size * CSV_ROW_BYTES),
+                convert_options=_csv_convert_options(_text_columns(columns))
+            )
+        elif extension == '.parquet':
+            import pyarrow.parquet as pq
+            
+            parquet_file = pq.ParquetFile(path, memory_map=True)
+            batches = parquet_file.iter_batches(
+                batch_size=chunk_size,
+                columns=_table_columns(columns, parquet_file.schema_arrow.names)
+            )
+        else:
+            import pyarrow.ipc as ipc
+            
+            reader = ipc.open_file(pa.memory_map(path))
+            wanted = _table_columns(columns, reader.schema.names)
+            batches = (
+                reader.get_batch(i).select(wanted).slice(start, chunk_size)
+                for i in range(reader.num_record_batches)
+                for start in range(0, reader.get_batch(i).num_rows, chunk_size)
+            )
+        
+        for batch in batches:
+            if batch.num_rows:
+                with metrics.stage('load.chunk', rows=batch.num_rows):
+                    df = _to_frame(pa.Table.from_batches([batch]))
+                yield df
+    
+    @staticmethod
+    def load_partials(path=None):
+        """
+        Load the partial aggregates published with the current snapshot.
+        
+        Args:
+            path (str, optional): Partials file (default config.PARTIALS_FILE)
+        
+        Returns:
+            dict: StreamingSafetyAnalyzer partial aggregates
+        
+        Raises:
+            FileNotFoundError: If no aggregates were published yet
+        """
+        path = path or config.PARTIALS_FILE
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No stored aggregates in {path}; run the full pipeline first")
+        with open(path, 'rb') as f:
+            return pickle.load(f)
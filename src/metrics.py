@@ -0,0 +1,347 @@
+# IMPORTANT DISCLAIMER
+# ====================
+# This project uses SYNTHETIC DATA for educational purposes.
+# Data does NOT represent any real actual fleet performance.
+# All incidents, costs, and metrics are RANDOMLY GENERATED.
+
+"""
+Module for run metrics and profiling.
+Records wall time, CPU time, peak allocation and rows for pipeline stages
+and hot paths, and writes them as JSON or Prometheus text.
+Made for demonstration, testing, and learning purposes.
+"""
+
+import contextlib
+import contextvars
+import functools
+import json
+import numbers
+import os
+import time
+import tracemalloc
+from datetime import datetime
+from . import config
+
+# Recorder collecting metrics in the current context (None: not recording).
+# New threads start unrecorded; a worker thread records with its own
+# recording() and the parent merges its stages.
+_active = contextvars.ContextVar('metrics_recorder', default=None)
+
+class MetricsRecorder:
+    """
+    Collects per-stage metrics.
+    
+    Stages may nest ('export' around 'export.csv'); each one reports its
+    own totals. Repeated stages (one per chunk, say) are aggregated by name.
+    Peak allocation comes from tracemalloc and is the highest traced memory
+    above the level at stage start.
+    """
+    
+    def __init__(self, trace_memory=False, profile_stage=None, profile_folder=None):
+        """
+        Initialize recorder.
+        
+        Args:
+            trace_memory (bool): Measure peak allocation with tracemalloc
+                (slows down pure-Python code)
+            profile_stage (str, optional): Stage to run under cProfile
+            profile_folder (str, optional): Folder for profile output
+                (default config.DATA_FOLDER)
+        """
+        self.trace_memory = trace_memory and hasattr(tracemalloc, 'reset_peak')
+        self.profile_stage = profile_stage
+        self.profile_folder = profile_folder or config.DATA_FOLDER
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self.stages = {}
+        self._frames = []
+    
+    def options(self):
+        """
+        Get the arguments of recording() that reproduce this recorder's setup.
+        
+        Returns:
+            dict: trace_memory, profile_stage and profile_folder
+        """
+        return {
+            'trace_memory': self.trace_memory,
+            'profile_stage': self.profile_stage,
+            'profile_folder': self.profile_folder
+        }
+    
+    @contextlib.contextmanager
+    def stage(self, name, rows=None):
+        """
+        Measure a block of code.
+        
+        Args:
+            name (str): Stage name
+            rows (int, optional): Rows processed (can also be set on the
+                yielded record)
+        
+        Yields:
+            dict: Record whose 'rows' entry may be updated inside the block
+        """
+        record = {'rows': rows}
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._frames:
+                self._frames[-1]['peak'] = max(self._frames[-1]['peak'], peak)
+            tracemalloc.reset_peak()
+            self._frames.append({'start': current, 'peak': current})
+        
+        profiler = None
+        if name == self.profile_stage:
+            import cProfile
+            profiler = cProfile.Profile()
+        wall_started = time.perf_counter()
+        cpu_started = time.process_time()
+        if profiler:
+            profiler.enable()
+        try:
+            yield record
+        finally:
+            if profiler:
+                profiler.disable()
+            wall = time.perf_counter() - wall_started
+            cpu = time.process_time() - cpu_started
+            
+            peak_bytes = None
+            if tracing:
+                frame = self._frames.pop()
+                peak = max(tracemalloc.get_traced_memory()[1], frame['peak'])
+                peak_bytes = peak - frame['start']
+                if self._frames:
+                    self._frames[-1]['peak'] = max(self._frames[-1]['peak'], peak)
+            
+            self.add(name, {
+                'calls': 1,
+                'wall_seconds': wall,
+                'cpu_seconds': cpu,
+                'peak_alloc_bytes': peak_bytes,
+                'rows': record['rows']
+            })
+            if profiler:
+                self.write_profile(name, profiler)
+    
+    def add(self, name, totals):
+        """
+        Fold stage totals into the aggregate of that stage.
+        
+        Args:
+            name (str): Stage name
+            totals (dict): calls, wall_seconds, cpu_seconds, peak_alloc_bytes, rows
+        """
+        current = self.stages.get(name)
+        if current is None:
+            self.stages[name] = dict(totals)
+            return
+        
+        current['calls'] += totals['calls']
+        current['wall_seconds'] += totals['wall_seconds']
+        current['cpu_seconds'] += totals['cpu_seconds']
+        for key, combine in (('peak_alloc_bytes', max), ('rows', lambda a, b: a + b)):
+            if totals[key] is not None:
+                current[key] = totals[key] if current[key] is None else combine(current[key], totals[key])
+    
+    def merge(self, stages):
+        """
+        Add the stages recorded by another recorder (e.g. a worker thread).
+        
+        Args:
+            stages (dict): Stage name -> totals
+        """
+        for name, totals in stages.items():
+            self.add(name, totals)
+    
+    def write_profile(self, name, profiler):
+        """
+        Write cProfile output for a stage.
+        
+        Writes '<folder>/profile-<stage>.prof' (for pstats or snakeviz) and
+        a text summary of the 30 most expensive calls next to it.
+        
+        Args:
+            name (str): Stage name
+            profiler (Profile): Finished profiler
+        """
+        import io
+        import pstats
+        
+        os.makedirs(self.profile_folder, exist_ok=True)
+        base = os.path.join(self.profile_folder, f'profile-{name}')
+        profiler.dump_stats(f'{base}.prof')
+        
+        text = io.StringIO()
+        pstats.Stats(profiler, stream=text).sort_stats('cumulative').print_stats(30)
+        with open(f'{base}.txt', 'w') as f:
+            f.write(text.getvalue())
+        print(f"✅ Profile of stage '{name}' saved: {base}.prof")
+    
+    def report(self):
+        """
+        Get the recorded metrics.
+        
+        Returns:
+            dict: Run start and per-stage totals with rows per second
+        """
+        stages = {}
+        for name, totals in self.stages.items():
+            rows = totals['rows']
+            wall = totals['wall_seconds']
+            stages[name] = {
+                'calls': totals['calls'],
+                'wall_seconds': round(wall, 6),
+                'cpu_seconds': round(totals['cpu_seconds'], 6),
+                'peak_alloc_bytes': totals['peak_alloc_bytes'],
+                'rows': rows,
+                'rows_per_sec': round(rows / wall, 1) if rows and wall > 0 else None
+            }
+        return {'started_at': self.started_at, 'stages': stages}
+    
+    def to_prometheus(self, prefix='flight_safety_stage'):
+        """
+        Format the metrics in the Prometheus text exposition format.
+        
+        Args:
+            prefix (str): Metric name prefix
+        
+        Returns:
+            str: One gauge per measure, labelled by stage
+        """
+        measures = [
+            ('calls', 'Number of times the stage ran'),
+            ('wall_seconds', 'Wall-clock time spent in the stage'),
+            ('cpu_seconds', 'CPU time of this process spent in the stage'),
+            ('peak_alloc_bytes', 'Peak traced allocation above the stage start'),
+            ('rows', 'Rows processed by the stage'),
+            ('rows_per_sec', 'Rows processed per second of wall time')
+        ]
+        stages = self.report()['stages']
+        lines = []
+        for measure, description in measures:
+            lines.append(f'# HELP {prefix}_{measure} {description}')
+            lines.append(f'# TYPE {prefix}_{measure} gauge')
+            for name, values in stages.items():
+                if values[measure] is not None:
+                    lines.append(f'{prefix}_{measure}{{stage="{name}"}} {values[measure]}')
+        return '\n'.join(lines) + '\n'
+    
+    def write(self, path=None, fmt=None):
+        """
+        Write the metrics file.
+        
+        Args:
+            path (str, optional): Output file (default config.METRICS_FILE)
+            fmt (str, optional): 'json' or 'prometheus' (default config.METRICS_FORMAT)
+        """
+        path = path or config.METRICS_FILE
+        fmt = fmt or config.METRICS_FORMAT
+        if fmt == 'json':
+            text = json.dumps(self.report(), indent=2)
+        elif fmt == 'prometheus':
+            text = self.to_prometheus()
+        else:
+            raise ValueError(f"Unknown metrics format: {fmt}")
+        
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(text)
+        print(f"✅ Metrics saved: {path}")
+
+@contextlib.contextmanager
+def recording(enabled=True, trace_memory=False, profile_stage=None, profile_folder=None):
+    """
+    Record metrics of everything instrumented inside the block.
+    
+    Args:
+        enabled (bool): Record at all (when False, yields None)
+        trace_memory (bool): Measure peak allocation with tracemalloc
+        profile_stage (str, optional): Stage to run under cProfile
+        profile_folder (str, optional): Folder for profile output
+    
+    Yields:
+        MetricsRecorder: Active recorder, or None when disabled
+    """
+    if not enabled:
+        yield None
+        return
+    
+    recorder = MetricsRecorder(trace_memory, profile_stage, profile_folder)
+    started_tracing = recorder.trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    token = _active.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _active.reset(token)
+        if started_tracing:
+            tracemalloc.stop()
+
+def active():
+    """
+    Get the recorder of the current context.
+    
+    Returns:
+        MetricsRecorder: Active recorder, or None when not recording
+    """
+    return _active.get()
+
+def stage(name, rows=None):
+    """
+    Measure a block of code if a recorder is active.
+    
+    Args:
+        name (str): Stage name
+        rows (int, optional): Rows processed
+    
+    Returns:
+        Context manager yielding the stage record (a throwaway dict when
+        not recording)
+    """
+    recorder = _active.get()
+    if recorder is None:
+        return contextlib.nullcontext({'rows': rows})
+    return recorder.stage(name, rows)
+
+def instrument(name, rows_arg=None, rows=None):
+    """
+    Decorate a function so each call is recorded as a stage.
+    
+    Args:
+        name (str): Stage name
+        rows_arg (int, optional): Position of the argument giving the row
+            count (a number or anything with a length)
+        rows (callable, optional): Function called with the same arguments
+            that returns the row count (instead of rows_arg)
+    
+    Returns:
+        callable: Decorator
+    """
+    if rows_arg is not None and rows is not None:
+        raise ValueError("Pass either rows_arg or rows, not both")
+    if rows is not None and not callable(rows):
+        raise TypeError("rows must be callable; use rows_arg for an argument position")
+    
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            recorder = _active.get()
+            if recorder is None:
+                return func(*args, **kwargs)
+            
+            if rows is not None:
+                count = rows(*args, **kwargs)
+            elif rows_arg is not None and rows_arg < len(args):
+                value = args[rows_arg]
+                count = int(value) if isinstance(value, numbers.Integral) else len(value)
+            else:
+                count = None
+            
+            with recorder.stage(name, count):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
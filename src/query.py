@@ -0,0 +1,306 @@
+# IMPORTANT DISCLAIMER
+# ====================
+# This project uses SYNTHETIC DATA for educational purposes.
+# Data does NOT represent any real actual fleet performance.
+# All incidents, costs, and metrics are RANDOMLY GENERATED.
+
+"""
+Module for indexed drill-down queries over the event set.
+Keeps one bitmap per value of the low-cardinality columns plus a sorted
+time index, and answers filters by intersecting bitmaps.
+Made for demonstration, testing, and learning purposes.
+"""
+
+import numpy as np
+import pandas as pd
+from . import schema
+
+INDEXED_COLUMNS = [
+    'severity', 'status', 'airport', 'incident_type',
+    'aircraft_model', 'flight_phase', 'investigator'
+]
+
+# Bitmaps are arrays of little-endian 64-bit words; bit i of word w is row w*64+i
+WORD = np.dtype('<u8')
+ALL_BITS = np.uint64(0xFFFFFFFFFFFFFFFF)
+POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+def _popcount(words):
+    """
+    Count the set bits of a bitmap.
+    
+    Args:
+        words (ndarray): Bitmap words
+    
+    Returns:
+        int: Number of set bits
+    """
+    if hasattr(np, 'bitwise_count'):
+        return int(np.bitwise_count(words).sum(dtype=np.int64))
+    return int(POPCOUNT_TABLE[words.view(np.uint8)].sum(dtype=np.int64))
+
+def _to_bitmap(mask, num_words):
+    """
+    Pack a boolean mask into bitmap words.
+    
+    Args:
+        mask (ndarray): One bool per row
+        num_words (int): Bitmap length in words
+    
+    Returns:
+        ndarray: Bitmap words
+    """
+    packed = np.zeros(num_words * 8, dtype=np.uint8)
+    bits = np.packbits(mask, bitorder='little')
+    packed[:len(bits)] = bits
+    return packed.view(WORD)
+
+def _range_words(first_row, stop_row):
+    """
+    Build the bitmap words covering rows first_row..stop_row-1.
+    
+    Args:
+        first_row (int): First row in the range
+        stop_row (int): Row after the last one
+    
+    Returns:
+        tuple: (first word number, words)
+    """
+    first_word = first_row // 64
+    words = np.full((stop_row + 63) // 64 - first_word, ALL_BITS, dtype=WORD)
+    if len(words):
+        words[0] &= ALL_BITS << np.uint64(first_row % 64)
+        if stop_row % 64:
+            words[-1] &= ALL_BITS >> np.uint64(64 - stop_row % 64)
+    return first_word, words
+
+class QueryResult:
+    """Rows matching a query, held as a bitmap slice."""
+    
+    def __init__(self, index, first_word, words):
+        """
+        Initialize result.
+        
+        Args:
+            index (EventIndex): Index that produced the result
+            first_word (int): Word number of words[0] in the full bitmap
+            words (ndarray): Bitmap words of the matching rows
+        """
+        self.index = index
+        self.first_word = first_word
+        self.words = words
+    
+    def count(self):
+        """
+        Count the matching events.
+        
+        Returns:
+            int: Number of events
+        """
+        return _popcount(self.words)
+    
+    def rows(self):
+        """
+        Get the positions of the matching events.
+        
+        Returns:
+            ndarray: Sorted row positions
+        """
+        nonzero = np.flatnonzero(self.words)
+        bits = np.unpackbits(self.words[nonzero].view(np.uint8), bitorder='little')
+        word_positions, bit_positions = np.nonzero(bits.reshape(-1, 64))
+        return (self.first_word + nonzero[word_positions]) * 64 + bit_positions
+    
+    def frame(self, columns=None):
+        """
+        Get the matching events.
+        
+        Args:
+            columns (list, optional): Columns to return (default all)
+        
+        Returns:
+            DataFrame: Matching events in the compact schema
+        """
+        df = self.index.df if columns is None else self.index.df[columns]
+        return df.iloc[self.rows()]
+    
+    def sum(self, column):
+        """
+        Sum a numeric column over the matching events.
+        
+        Args:
+            column (str): Column name
+        
+        Returns:
+            float: Sum (0 when nothing matches)
+        """
+        values = self.index.values(column)[self.rows()]
+        return float(np.nansum(values))
+    
+    def mean(self, column):
+        """
+        Average a numeric column over the matching events, skipping missing values.
+        
+        Args:
+            column (str): Column name
+        
+        Returns:
+            float: Mean (NaN when nothing matches)
+        """
+        values = self.index.values(column)[self.rows()]
+        values = values[~np.isnan(values)]
+        return float(values.mean()) if len(values) else np.nan
+    
+    def value_counts(self, column):
+        """
+        Count matching events per value of an indexed column.
+        
+        Args:
+            column (str): One of the indexed columns
+        
+        Returns:
+            Series: Event count per value (every value of the column listed)
+        """
+        counts = {}
+        for value in self.index.bitmaps[column]:
+            words = self.index.bitmap(column, value, self.first_word, len(self.words))
+            counts[value] = _popcount(self.words & words)
+        return pd.Series(counts, name='count')
+
+class EventIndex:
+    """
+    In-memory index for drill-down queries.
+    
+    One bitmap per value of each indexed column (1 bit per event) plus a
+    sorted time index (running max/min of the timestamps). A query ANDs the
+    bitmaps of its predicates; a date range narrows the work to the words
+    covering that range.
+    """
+    
+    def __init__(self, df, columns=None):
+        """
+        Build the index.
+        
+        Args:
+            df (DataFrame): Event data (compact schema or text layout)
+            columns (list, optional): Columns to index (default INDEXED_COLUMNS)
+        """
+        self.df = schema.to_compact(df)
+        self.size = len(self.df)
+        self.num_words = (self.size + 63) // 64
+        self._values = {}
+        
+        self.bitmaps = {}
+        for column in columns or INDEXED_COLUMNS:
+            categorical = pd.Categorical(self.df[column])
+            codes = categorical.codes
+            self.bitmaps[column] = {
+                value: _to_bitmap(codes == code, self.num_words)
+                for code, value in enumerate(categorical.categories)
+            }
+        
+        # Monotone envelopes of the timestamps: rows before the first
+        # prefix_max >= t are all earlier than t, rows from the first
+        # suffix_min >= t on are all at or after t
+        timestamps = self.df['timestamp'].to_numpy().astype('datetime64[ns]').view('int64')
+        self.timestamps = timestamps
+        self.prefix_max = np.maximum.accumulate(timestamps)
+        self.suffix_min = np.minimum.accumulate(timestamps[::-1])[::-1]
+    
+    def values(self, column):
+        """
+        Get a column as float64 (missing values as NaN), converting it once.
+        
+        Args:
+            column (str): Numeric column
+        
+        Returns:
+            ndarray: Column values
+        """
+        if column not in self._values:
+            self._values[column] = self.df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        return self._values[column]
+    
+    def bitmap(self, column, value, first_word=0, num_words=None):
+        """
+        Get the bitmap slice of one value (empty for unknown values).
+        
+        Args:
+            column (str): Indexed column
+            value: Column value
+            first_word (int): First word of the slice
+            num_words (int, optional): Slice length (default to the end)
+        
+        Returns:
+            ndarray: Bitmap words
+        """
+        if column not in self.bitmaps:
+            raise ValueError(f"Column is not indexed: {column}")
+        stop = self.num_words if num_words is None else first_word + num_words
+        words = self.bitmaps[column].get(value)
+        if words is None:
+            return np.zeros(stop - first_word, dtype=WORD)
+        return words[first_word:stop]
+    
+    def _time_range(self, start, end):
+        """
+        Get the bitmap of events with start <= timestamp < end.
+        
+        Rows between the envelope bounds are known to match without looking
+        at them; only the words at both edges of the range are checked row
+        by row. For data in time order (or day order, as generate_batch
+        produces) the cost follows the range size, not the event count.
+        
+        Args:
+            start: Range start (anything pd.Timestamp accepts) or None
+            end: Range end, exclusive, or None
+        
+        Returns:
+            tuple: (first word number, words)
+        """
+        low = np.iinfo(np.int64).min if start is None else pd.Timestamp(start).value
+        high = np.iinfo(np.int64).max if end is None else pd.Timestamp(end).value
+        
+        # Candidate rows first..stop-1, certain matches sure_first..sure_stop-1
+        first = int(np.searchsorted(self.prefix_max, low, side='left'))
+        stop = max(int(np.searchsorted(self.suffix_min, high, side='left')), first)
+        sure_first = min(max(int(np.searchsorted(self.suffix_min, low, side='left')), first), stop)
+        sure_stop = max(min(int(np.searchsorted(self.prefix_max, high, side='left')), stop), sure_first)
+        
+        first_word, words = _range_words(first, stop)
+        edges = [(first // 64, (sure_first + 63) // 64), (sure_stop // 64, (stop + 63) // 64)]
+        for edge_first, edge_stop in edges:
+            if edge_first < edge_stop:
+                rows = self.timestamps[edge_first * 64:min(edge_stop * 64, self.size)]
+                words[edge_first - first_word:edge_stop - first_word] = _to_bitmap(
+                    (rows >= low) & (rows < high), edge_stop - edge_first
+                )
+        return first_word, words
+    
+    def query(self, start=None, end=None, **predicates):
+        """
+        Select events matching every predicate.
+        
+        Example:
+            index.query(severity='Critical', airport='GRU - Guarulhos',
+                        flight_phase='Landing', start='2025-07-01', end='2025-10-01')
+        
+        Args:
+            start (optional): Keep events at or after this time
+            end (optional): Keep events before this time
+            **predicates: column=value or column=[values] (values are ORed)
+        
+        Returns:
+            QueryResult: Matching events
+        """
+        first_word, words = self._time_range(start, end)
+        num_words = len(words)
+        
+        for column, value in predicates.items():
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            selected = np.zeros(num_words, dtype=WORD)
+            for item in values:
+                selected |= self.bitmap(column, item, first_word, num_words)
+            words &= selected
+        
+        return QueryResult(self, first_word, words)
\ No newline at end of file
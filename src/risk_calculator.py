@@ -10,11 +10,37 @@ Implements algorithms for severity and probability assessment.
 Made for demonstration, testing, and learning purposes.
 """
 
+import numpy as np
 import pandas as pd
+from . import config, metrics, schema
 
 class RiskCalculator:
     """Risk score calculator for safety events."""
     
+    # Points per severity level (higher weight)
+    SEVERITY_SCORES = {
+        'Critical': 40,
+        'High': 30,
+        'Medium': 20,
+        'Low': 10
+    }
+    
+    # Points per aircraft damage level
+    DAMAGE_SCORES = {
+        'Severe': 20,
+        'Significant': 15,
+        'Moderate': 10,
+        'Minor': 5,
+        'None': 0
+    }
+    
+    # Flight phases with higher risk (takeoff and landing)
+    CRITICAL_PHASES = ['Takeoff', 'Landing']
+    
+    # Lower score bound of each risk category, in ascending order
+    RISK_THRESHOLDS = [30, 50, 70]
+    RISK_CATEGORIES = config.RISK_CATEGORIES
+    
     @staticmethod
     def calculate_individual_score(event):
         """
@@ -36,30 +62,17 @@ class RiskCalculator:
         score = 0
         
         # Severity (higher weight)
-        severity_scores = {
-            'Critical': 40,
-            'High': 30,
-            'Medium': 20,
-            'Low': 10
-        }
-        score += severity_scores.get(event['severity'], 0)
+        score += RiskCalculator.SEVERITY_SCORES.get(event['severity'], 0)
         
         # Injuries
         if event['injuries'] > 0:
             score += 20
         
         # Aircraft damage
-        damage_scores = {
-            'Severe': 20,
-            'Significant': 15,
-            'Moderate': 10,
-            'Minor': 5,
-            'None': 0
-        }
-        score += damage_scores.get(event['aircraft_damage'], 0)
+        score += RiskCalculator.DAMAGE_SCORES.get(event['aircraft_damage'], 0)
         
         # Critical flight phase (takeoff and landing are riskier)
-        if event['flight_phase'] in ['Takeoff', 'Landing']:
+        if event['flight_phase'] in RiskCalculator.CRITICAL_PHASES:
             score += 10
         
         # Status (events under investigation = unknown risk)
@@ -69,20 +82,72 @@ class RiskCalculator:
         return min(score, 100)  # Cap at 100
     
     @staticmethod
-    def add_scores_to_dataframe(df):
+    def _lookup_points(values, points):
         """
-        Add risk score column to DataFrame.
+        Map each value to its points through a lookup array over category codes.
+        
+        Args:
+            values (Series): Column values
+            points (dict): Points per known value (unknown values score 0)
+        
+        Returns:
+            ndarray: Points per row
+        """
+        keys = pd.Index(list(points))
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Match the few categories, then expand by code (-1 stays -1)
+            codes = np.append(keys.get_indexer(values.cat.categories), -1)[values.cat.codes]
+        else:
+            codes = keys.get_indexer(values)
+        # Code -1 (unknown or missing) picks the trailing 0
+        lookup = np.append(np.array(list(points.values()), dtype=np.int64), 0)
+        return lookup[codes]
+    
+    @staticmethod
+    def calculate_scores(df):
+        """
+        Calculate risk scores for all events at once.
+        
+        Vectorized equivalent of calculate_individual_score, which stays
+        the reference implementation.
         
         Args:
             df (DataFrame): DataFrame with events
             
+        Returns:
+            ndarray: Risk score per event (0-100)
+        """
+        score = RiskCalculator._lookup_points(df['severity'], RiskCalculator.SEVERITY_SCORES)
+        score += np.where(df['injuries'].to_numpy(dtype=float, na_value=0) > 0, 20, 0)
+        score += RiskCalculator._lookup_points(df['aircraft_damage'], RiskCalculator.DAMAGE_SCORES)
+        score += np.where(df['flight_phase'].isin(RiskCalculator.CRITICAL_PHASES), 10, 0)
+        score += np.where(df['status'] == 'Under Investigation', 10, 0)
+        return np.minimum(score, 100)
+    
+    @staticmethod
+    @metrics.instrument('score.risk_score', rows_arg=0)
+    def add_scores_to_dataframe(df, vectorized=True):
+        """
+        Add risk score column to DataFrame.
+        
+        Args:
+            df (DataFrame): DataFrame with events
+            vectorized (bool): Use calculate_scores instead of the per-event
+                reference implementation
+        
         Returns:
             DataFrame: DataFrame with 'risk_score' column added
         """
-        df['risk_score'] = df.apply(
-            RiskCalculator.calculate_individual_score,
-            axis=1
-        )
+        if vectorized:
+            scores = RiskCalculator.calculate_scores(df)
+            if schema.is_compact(df):
+                scores = scores.astype(schema.SCORE_SCHEMA['risk_score'])
+            df['risk_score'] = scores
+        else:
+            df['risk_score'] = df.apply(
+                RiskCalculator.calculate_individual_score,
+                axis=1
+            )
         return df
     
     @staticmethod
@@ -106,17 +171,62 @@ class RiskCalculator:
             return 'Low'
     
     @staticmethod
-    def add_classification(df):
+    def _risk_bins(scores):
+        """
+        Get the position of each score's category in RISK_CATEGORIES.
+        
+        Missing scores fall in the lowest category, as in classify_risk.
+        
+        Args:
+            scores (array-like): Risk scores
+        
+        Returns:
+            ndarray: Category position per score
+        """
+        scores = pd.Series(scores).to_numpy(dtype=float, na_value=np.nan)
+        bins = np.searchsorted(RiskCalculator.RISK_THRESHOLDS, scores, side='right')
+        bins[np.isnan(scores)] = 0
+        return bins
+    
+    @staticmethod
+    def classify_scores(scores):
+        """
+        Classify many risk scores at once by binning on RISK_THRESHOLDS.
+        
+        Vectorized equivalent of classify_risk.
+        
+        Args:
+            scores (array-like): Risk scores
+        
+        Returns:
+            ndarray: Risk category per score
+        """
+        bins = RiskCalculator._risk_bins(scores)
+        return np.array(RiskCalculator.RISK_CATEGORIES, dtype=object)[bins]
+    
+    @staticmethod
+    @metrics.instrument('score.classification', rows_arg=0)
+    def add_classification(df, vectorized=True):
         """
         Add risk classification to DataFrame.
         
         Args:
             df (DataFrame): DataFrame with risk_score
-            
+            vectorized (bool): Use classify_scores instead of the per-event
+                reference implementation
+        
         Returns:
             DataFrame: DataFrame with 'risk_classification' column
         """
-        df['risk_classification'] = df['risk_score'].apply(
-            RiskCalculator.classify_risk
-        )
+        if vectorized and schema.is_compact(df):
+            bins = RiskCalculator._risk_bins(df['risk_score'])
+            df['risk_classification'] = pd.Categorical.from_codes(
+                bins, dtype=schema.SCORE_SCHEMA['risk_classification']
+            )
+        elif vectorized:
+            df['risk_classification'] = RiskCalculator.classify_scores(df['risk_score'])
+        else:
+            df['risk_classification'] = df['risk_score'].apply(
+                RiskCalculator.classify_risk
+            )
         return df
\ No newline at end of file
@@ -0,0 +1,304 @@
+# IMPORTANT DISCLAIMER
+# ====================
+# This project uses SYNTHETIC DATA for educational purposes.
+# Data does NOT represent any real actual fleet performance.
+# All incidents, costs, and metrics are RANDOMLY GENERATED.
+
+"""
+Module for rolling-window time-series views.
+Computes rolling event rates, critical-event rates and costs per airport,
+aircraft model or incident type, over the full history or kept current
+for live data.
+Made for demonstration, testing, and learning purposes.
+"""
+
+import numpy as np
+import pandas as pd
+from . import config, schema
+
+ROLLING_DIMENSIONS = ['airport', 'aircraft_model', 'incident_type']
+
+# Severities counted as critical events
+CRITICAL_SEVERITIES = ['Critical', 'High']
+
+def _window_length(label):
+    """Parse a window label ('24h', '7d', ...) into a Timedelta."""
+    # pandas deprecates the lowercase day unit
+    return pd.Timedelta(label[:-1] + 'D' if label.endswith('d') else label)
+
+def _window_sizes(windows, bucket):
+    """
+    Get the length of each window in buckets.
+    
+    Args:
+        windows (list): Window labels ('24h', '7d', ...)
+        bucket (Timedelta): Bucket size
+    
+    Returns:
+        dict: Window label -> number of buckets
+    """
+    sizes = {}
+    for label in windows:
+        length = _window_length(label)
+        if length % bucket != pd.Timedelta(0):
+            raise ValueError(f"Window {label} is not a multiple of the bucket size {bucket}")
+        sizes[label] = int(length // bucket)
+    return sizes
+
+def _event_arrays(df, bucket):
+    """
+    Extract bucket numbers, critical flags and costs.
+    
+    Critical events are High and Critical ones (CRITICAL_SEVERITIES), as
+    in the KPIs and critical patterns of SafetyAnalyzer.
+    
+    Args:
+        df (DataFrame): Event data in the compact schema
+        bucket (Timedelta): Bucket size
+    
+    Returns:
+        tuple: (buckets, critical, cost) arrays
+    """
+    timestamps = df['timestamp'].to_numpy().astype('datetime64[ns]').view('int64')
+    buckets = timestamps // bucket.value
+    critical = df['severity'].isin(CRITICAL_SEVERITIES).to_numpy(dtype=np.float64)
+    cost = df['estimated_cost_usd'].to_numpy(dtype=np.float64)
+    return buckets, critical, cost
+
+def _group_codes(df, by):
+    """
+    Get the code of each event's group (-1 for groups not in the config lists).
+    
+    Args:
+        df (DataFrame): Event data in the compact schema
+        by (str): Grouping column
+    
+    Returns:
+        ndarray: Group codes
+    """
+    return pd.Categorical(df[by], dtype=schema.EVENT_SCHEMA[by]).codes
+
+def _bucket_sums(positions, codes, critical, cost, num_positions, num_groups):
+    """
+    Sum events, critical events and cost per (position, group) cell.
+    
+    Args:
+        positions (ndarray): Bucket position of each event (0..num_positions-1)
+        codes (ndarray): Group code of each event
+        critical (ndarray): 1.0 for critical (High or Critical) events
+        cost (ndarray): Event costs
+        num_positions (int): Number of bucket positions
+        num_groups (int): Number of groups
+    
+    Returns:
+        ndarray: Sums with shape (3, num_positions, num_groups)
+    """
+    cells = positions * num_groups + codes
+    size = num_positions * num_groups
+    return np.stack([
+        np.bincount(cells, minlength=size).astype(np.float64),
+        np.bincount(cells, weights=critical, minlength=size),
+        np.bincount(cells, weights=cost, minlength=size)
+    ]).reshape(3, num_positions, num_groups)
+
+def _window_metrics(label, sums):
+    """
+    Turn window sums into the published rolling metrics.
+    
+    Args:
+        label (str): Window label
+        sums (ndarray): Events, critical events and cost, shape (3, n)
+    
+    Returns:
+        dict: Column name -> values
+    """
+    events = np.rint(sums[0])
+    critical = np.rint(sums[1])
+    days = _window_length(label) / pd.Timedelta(days=1)
+    critical_rate = np.divide(
+        critical * 100, events, out=np.zeros_like(events), where=events > 0
+    )
+    
+    return {
+        f'events_{label}': events.astype(np.int64),
+        f'events_per_day_{label}': np.round(events / days, 2),
+        f'critical_events_{label}': critical.astype(np.int64),
+        f'critical_rate_{label}': np.round(critical_rate, 2),
+        f'cost_usd_{label}': np.round(sums[2], 2)
+    }
+
+def rolling_window_view(df, by='airport', windows=None, bucket=None):
+    """
+    Compute rolling-window metrics over the full history.
+    
+    Events are summed per (bucket, group) cell in one pass, and every
+    window sum is the difference of two cumulative sums, so the cost does
+    not grow with the window length.
+    
+    Args:
+        df (DataFrame): Event data (compact schema or text layout)
+        by (str): 'airport', 'aircraft_model' or 'incident_type'
+        windows (list, optional): Window labels (default config.ROLLING_WINDOWS)
+        bucket (str, optional): Bucket size (default config.ROLLING_BUCKET)
+    
+    Returns:
+        DataFrame: One row per (bucket end, group) with events, events per
+            day, critical (High or Critical) events, critical rate (%) and
+            cost per window
+    """
+    bucket = pd.Timedelta(bucket or config.ROLLING_BUCKET)
+    sizes = _window_sizes(windows or config.ROLLING_WINDOWS, bucket)
+    categories = schema.EVENT_SCHEMA[by].categories
+    df = schema.to_compact(df)
+    codes = _group_codes(df, by)
+    # Events whose group is not in the config lists are skipped
+    valid = codes >= 0
+    buckets, critical, cost = (values[valid] for values in _event_arrays(df, bucket))
+    codes = codes[valid]
+    
+    if len(buckets) == 0:
+        first, num_buckets = 0, 0
+    else:
+        first = int(buckets.min())
+        num_buckets = int(buckets.max()) - first + 1
+    
+    sums = _bucket_sums(buckets - first, codes, critical, cost, num_buckets, len(categories))
+    cumulative = np.concatenate([np.zeros((3, 1, len(categories))), sums.cumsum(axis=1)], axis=1)
+    
+    # Window ending at bucket t covers buckets t-size+1..t
+    end = np.arange(1, num_buckets + 1)
+    columns = {}
+    for label, size in sizes.items():
+        window = cumulative[:, end] - cumulative[:, np.maximum(end - size, 0)]
+        columns.update(_window_metrics(label, window.reshape(3, -1)))
+    
+    bucket_ends = pd.to_datetime((first + end) * bucket.value)
+    index = pd.MultiIndex.from_product([bucket_ends, categories], names=['timestamp', by])
+    return pd.DataFrame(columns, index=index)
+
+class RollingWindowTracker:
+    """
+    Rolling-window metrics kept current for live data.
+    
+    Per-bucket sums of the newest buckets are held in a fixed-size ring
+    buffer (one slot per bucket of the largest window), with running sums
+    per window. A batch costs O(batch) plus O(groups) for every bucket the
+    clock moves forward; history is never rescanned. Events older than the
+    largest window are counted in late_events and ignored.
+    """
+    
+    def __init__(self, by=None, windows=None, bucket=None):
+        """
+        Initialize tracker.
+        
+        Args:
+            by (list, optional): Grouping columns (default ROLLING_DIMENSIONS)
+            windows (list, optional): Window labels (default config.ROLLING_WINDOWS)
+            bucket (str, optional): Bucket size (default config.ROLLING_BUCKET)
+        """
+        self.by = list(by or ROLLING_DIMENSIONS)
+        self.bucket = pd.Timedelta(bucket or config.ROLLING_BUCKET)
+        self.sizes = _window_sizes(windows or config.ROLLING_WINDOWS, self.bucket)
+        self.capacity = max(self.sizes.values())
+        self.categories = {column: schema.EVENT_SCHEMA[column].categories for column in self.by}
+        self.ring = {
+            column: np.zeros((3, self.capacity, len(categories)))
+            for column, categories in self.categories.items()
+        }
+        self.sums = {
+            column: {label: np.zeros((3, len(categories))) for label in self.sizes}
+            for column, categories in self.categories.items()
+        }
+        self.head = None
+        self.late_events = 0
+    
+    def _slots(self, first, last):
+        """Get the ring slots of buckets first..last."""
+        return np.arange(first, last + 1) % self.capacity
+    
+    def _advance(self, newest):
+        """
+        Move the clock to a newer bucket, expiring buckets that leave a window.
+        
+        Args:
+            newest (int): New head bucket
+        """
+        if newest - self.head >= self.capacity:
+            for column in self.by:
+                self.ring[column].fill(0)
+                for sums in self.sums[column].values():
+                    sums.fill(0)
+        else:
+            for column in self.by:
+                ring = self.ring[column]
+                for label, size in self.sizes.items():
+                    leaving = self._slots(self.head - size + 1, min(newest - size, self.head))
+                    self.sums[column][label] -= ring[:, leaving].sum(axis=1)
+                ring[:, self._slots(self.head + 1, newest)] = 0
+        self.head = newest
+    
+    def update(self, df):
+        """
+        Add a batch of events.
+        
+        Args:
+            df (DataFrame): New event data (compact schema or text layout)
+        """
+        if len(df) == 0:
+            return
+        
+        df = schema.to_compact(df)
+        all_buckets, all_critical, all_cost = _event_arrays(df, self.bucket)
+        for column in self.by:
+            codes = _group_codes(df, column)
+            valid = codes >= 0
+            buckets, critical, cost = all_buckets[valid], all_critical[valid], all_cost[valid]
+            codes = codes[valid]
+            if len(buckets) == 0:
+                continue
+            
+            newest = int(buckets.max())
+            if self.head is None:
+                self.head = newest
+            elif newest > self.head:
+                self._advance(newest)
+            
+            ages = self.head - buckets
+            recent = ages < self.capacity
+            if column == self.by[0]:
+                self.late_events += int((~recent).sum())
+            ages = ages[recent]
+            if len(ages) == 0:
+                continue
+            
+            # Only the ages present in the batch are touched
+            num_ages = int(ages.max()) + 1
+            by_age = _bucket_sums(
+                ages, codes[recent], critical[recent], cost[recent],
+                num_ages, len(self.categories[column])
+            )
+            self.ring[column][:, self._slots(self.head - num_ages + 1, self.head)] += by_age[:, ::-1]
+            for label, size in self.sizes.items():
+                self.sums[column][label] += by_age[:, :size].sum(axis=1)
+    
+    @property
+    def as_of(self):
+        """End of the newest bucket (None before the first event)."""
+        if self.head is None:
+            return None
+        return pd.Timestamp((self.head + 1) * self.bucket.value)
+    
+    def snapshot(self, by='airport'):
+        """
+        Get the current rolling metrics per group.
+        
+        Args:
+            by (str): One of the tracked grouping columns
+        
+        Returns:
+            DataFrame: One row per group, same columns as rolling_window_view
+        """
+        columns = {}
+        for label in self.sizes:
+            columns.update(_window_metrics(label, self.sums[by][label]))
+        return pd.DataFrame(columns, index=pd.Index(self.categories[by], name=by))
\ No newline at end of file
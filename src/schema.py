@@ -0,0 +1,306 @@
+# IMPORTANT DISCLAIMER
+# ====================
+# This project uses SYNTHETIC DATA for educational purposes.
+# Data does NOT represent any real actual fleet performance.
+# All incidents, costs, and metrics are RANDOMLY GENERATED.
+
+"""
+Module defining the compact in-memory event schema.
+Converts between the compact schema and the published text layout.
+Made for demonstration, testing, and learning purposes.
+
+Compact schema:
+- Low-cardinality text columns are categoricals whose categories come
+  from the lists in config.py
+- Yes/No flags are booleans
+- 'date' and 'time' are merged into one datetime64 'timestamp' column
+- 'event_id' is stored as its number (EVT0042 -> 42)
+- Small counts are small ints, 'resolution_days' is a nullable UInt16
+- 'date', 'time', 'month', 'year', 'quarter' and 'day_of_week' are not
+  stored; they are derived on demand with derive()
+"""
+
+import datetime
+import numpy as np
+import pandas as pd
+from . import config
+
+DAYS_OF_WEEK = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+QUARTERS = ['Q1', 'Q2', 'Q3', 'Q4']
+INVESTIGATORS = [f'INV{i:02d}' for i in range(1, 16)]
+REGISTRATION_NUMBERS = range(100, 1000)
+
+def registration_prefixes():
+    """
+    List the distinct registration prefixes of the aircraft models.
+    
+    Returns:
+        list: Prefixes in model order (models may share a prefix)
+    """
+    prefixes = [model[:3].upper() for model in config.AIRCRAFT_MODELS['models']]
+    return list(dict.fromkeys(prefixes))
+
+def registration_categories():
+    """
+    List every registration the generator can produce.
+    
+    The code of a registration is prefix_index * 900 + number - 100.
+    
+    Returns:
+        list: Registrations
+    """
+    return [
+        f'PR-{prefix}{number}'
+        for prefix in registration_prefixes()
+        for number in REGISTRATION_NUMBERS
+    ]
+
+# Dtype of every stored column, in published column order
+EVENT_SCHEMA = {
+    'event_id': 'uint32',
+    'timestamp': 'datetime64[ns]',
+    'aircraft_model': pd.CategoricalDtype(config.AIRCRAFT_MODELS['models']),
+    'registration': pd.CategoricalDtype(registration_categories()),
+    'incident_type': pd.CategoricalDtype(config.INCIDENT_TYPES['types']),
+    'severity': pd.CategoricalDtype(config.SEVERITY_LEVELS, ordered=True),
+    'flight_phase': pd.CategoricalDtype(config.FLIGHT_PHASES),
+    'airport': pd.CategoricalDtype(config.BRAZILIAN_AIRPORTS),
+    'status': pd.CategoricalDtype(config.STATUS_OPTIONS),
+    'resolution_days': 'UInt16',
+    'injuries': 'int8',
+    'aircraft_damage': pd.CategoricalDtype(config.DAMAGE_LEVELS, ordered=True),
+    'delay_minutes': 'int16',
+    'investigator': pd.CategoricalDtype(INVESTIGATORS),
+    'immediate_action': 'bool',
+    'anac_notification': 'bool',
+    'estimated_cost_usd': 'float64'
+}
+
+# Columns added by RiskCalculator
+SCORE_SCHEMA = {
+    'risk_score': 'int8',
+    'risk_classification': pd.CategoricalDtype(config.RISK_CATEGORIES, ordered=True)
+}
+
+# Columns computed on demand from 'timestamp'
+DERIVED_COLUMNS = ['date', 'time', 'month', 'year', 'quarter', 'day_of_week']
+
+# Published text layout (CSV/XLSX)
+LEGACY_COLUMNS = [
+    'event_id', 'date', 'time', 'aircraft_model', 'registration',
+    'incident_type', 'severity', 'flight_phase', 'airport', 'status',
+    'resolution_days', 'injuries', 'aircraft_damage', 'delay_minutes',
+    'investigator', 'immediate_action', 'anac_notification',
+    'estimated_cost_usd', 'month', 'year', 'quarter', 'day_of_week'
+]
+
+FLAG_COLUMNS = ['immediate_action', 'anac_notification']
+
+def is_compact(df):
+    """
+    Check whether a DataFrame uses the compact schema.
+    
+    Args:
+        df (DataFrame): Event data
+    
+    Returns:
+        bool: True if events carry a 'timestamp' column
+    """
+    return 'timestamp' in df.columns
+
+def derive(df, name):
+    """
+    Compute a derived column from the 'timestamp' column.
+    
+    Args:
+        df (DataFrame): Event data in the compact schema
+        name (str): One of DERIVED_COLUMNS
+    
+    Returns:
+        Series: Derived values, aligned with df
+    """
+    ts = df['timestamp']
+    
+    if name == 'date':
+        values = ts.dt.normalize()
+    elif name == 'time':
+        minutes = (ts.dt.hour * 60 + ts.dt.minute).to_numpy()
+        times = np.array([f'{m // 60:02d}:{m % 60:02d}' for m in range(24 * 60)], dtype=object)
+        values = times[minutes]
+    elif name == 'month':
+        values = ts.dt.month.astype('int8')
+    elif name == 'year':
+        values = ts.dt.year.astype('int16')
+    elif name == 'quarter':
+        values = pd.Categorical.from_codes(ts.dt.quarter.to_numpy() - 1, QUARTERS)
+    elif name == 'day_of_week':
+        values = pd.Categorical.from_codes(ts.dt.dayofweek.to_numpy(), DAYS_OF_WEEK)
+    else:
+        raise ValueError(f"Unknown derived column: {name}")
+    
+    return pd.Series(values, index=df.index, name=name)
+
+def _to_category(values, dtype):
+    """
+    Convert values to a categorical, keeping values outside the config lists.
+    
+    Args:
+        values (Series): Text values
+        dtype (CategoricalDtype): Target dtype
+    
+    Returns:
+        Categorical: Converted values
+    """
+    categories = list(dtype.categories)
+    unknown = set(values.dropna().unique()) - set(categories)
+    if unknown:
+        dtype = pd.CategoricalDtype(categories + sorted(unknown), ordered=dtype.ordered)
+    return pd.Categorical(values, dtype=dtype)
+
+def _combine_timestamp(date, time):
+    """
+    Build event timestamps from the date and time columns.
+    
+    Typed columns (datetime64 date, timedelta64 time) are combined without
+    going through text; only text columns are parsed.
+    
+    Args:
+        date (Series): Event dates (text or datetime64)
+        time (Series): Event times (text 'HH:MM', datetime.time or timedelta64)
+    
+    Returns:
+        Series: datetime64 timestamps
+    """
+    if not pd.api.types.is_datetime64_any_dtype(date):
+        date = pd.to_datetime(date, format='%Y-%m-%d')
+    if not pd.api.types.is_timedelta64_dtype(time):
+        # Parse each distinct 'HH:MM' once; datetime.time values (e.g. read
+        # from Excel) are used as they are
+        # (missing times get code -1, which picks the trailing NaN)
+        codes, uniques = pd.factorize(time)
+        minutes = np.array([
+            t.hour * 60 + t.minute if isinstance(t, datetime.time)
+            else int(t[:2]) * 60 + int(t[3:5])
+            for t in uniques
+        ] + [np.nan])
+        time = pd.Series(pd.to_timedelta(minutes[codes], unit='min'), index=date.index)
+    return (date.dt.normalize() + time).astype('datetime64[ns]')
+
+def _event_numbers(event_ids):
+    """
+    Get event numbers from event ids.
+    
+    Args:
+        event_ids (Series): Text ids ('EVT0042') or numbers
+    
+    Returns:
+        Series: uint32 event numbers
+    """
+    if pd.api.types.is_integer_dtype(event_ids):
+        return event_ids.astype('uint32')
+    
+    event_ids = event_ids.astype(str)
+    if not event_ids.str.startswith('EVT').all():
+        raise ValueError("event_id values must look like 'EVT0001'")
+    return event_ids.str[3:].astype('uint32')
+
+def conform(df):
+    """
+    Cast event columns to the dtypes of the compact schema.
+    
+    Categoricals are recoded to the config categories (values outside them
+    are kept as extra categories), Yes/No flags become booleans, text event
+    ids become numbers and numeric columns get their compact dtype. Columns that already have their
+    compact dtype are reused as they are, so conforming compact data (e.g.
+    read back from Parquet) is cheap.
+    
+    Args:
+        df (DataFrame): Events with a 'timestamp' column (not modified)
+    
+    Returns:
+        DataFrame: New frame with the schema columns of df, in schema order
+    """
+    columns = {}
+    for column, dtype in list(EVENT_SCHEMA.items()) + list(SCORE_SCHEMA.items()):
+        if column not in df.columns:
+            continue
+        values = df[column]
+        if column == 'event_id':
+            values = _event_numbers(values)
+        elif isinstance(dtype, pd.CategoricalDtype):
+            # Always recoded: unordered dtypes compare equal in any category order
+            values = _to_category(values, dtype)
+        elif values.dtype == dtype:
+            pass
+        elif column in FLAG_COLUMNS:
+            if not pd.api.types.is_bool_dtype(values):
+                values = values.map({'Yes': True, 'No': False})
+            values = values.astype('boolean' if values.isna().any() else 'bool')
+        else:
+            values = values.astype(dtype)
+        columns[column] = values
+    
+    return pd.DataFrame(columns, index=df.index)
+
+def to_compact(df):
+    """
+    Convert events in the published text layout to the compact schema.
+    
+    Args:
+        df (DataFrame): Event data as produced by generate_all_events, or
+            read from an export (typed 'date'/'time' columns and numeric
+            event ids are used without parsing text)
+    
+    Returns:
+        DataFrame: Event data in the compact schema
+    """
+    if is_compact(df):
+        return df
+    
+    columns = [column for column in df.columns if column not in DERIVED_COLUMNS]
+    return conform(df[columns].assign(timestamp=_combine_timestamp(df['date'], df['time'])))
+
+def to_legacy(df):
+    """
+    Convert events in the compact schema to the published text layout.
+    
+    Args:
+        df (DataFrame): Event data in the compact schema
+    
+    Returns:
+        DataFrame: Event data with text dates, times, flags and event ids
+    """
+    if not is_compact(df):
+        return df
+    
+    legacy = pd.DataFrame(index=df.index)
+    for column in LEGACY_COLUMNS:
+        if column == 'event_id':
+            numbers = df['event_id'].to_numpy().astype(str)
+            # np.char.zfill fails on zero-length arrays
+            legacy[column] = (
+                np.char.add('EVT', np.char.zfill(numbers, 4)).astype(object) if len(numbers)
+                else np.empty(0, dtype=object)
+            )
+        elif column == 'date':
+            # Format each distinct day once
+            days, inverse = np.unique(
+                df['timestamp'].to_numpy().astype('datetime64[D]'), return_inverse=True
+            )
+            legacy[column] = pd.DatetimeIndex(days).strftime('%Y-%m-%d').to_numpy(dtype=object)[inverse]
+        elif column in DERIVED_COLUMNS:
+            legacy[column] = derive(df, column)
+        elif column in FLAG_COLUMNS:
+            # Missing flags stay missing instead of failing the conversion
+            flags = df[column]
+            text = np.where(flags.to_numpy(dtype=bool, na_value=False), 'Yes', 'No').astype(object)
+            text[flags.isna().to_numpy()] = None
+            legacy[column] = text
+        else:
+            legacy[column] = df[column]
+    
+    for column in SCORE_SCHEMA:
+        if column in df.columns:
+            legacy[column] = df[column]
+    
+    return legacy
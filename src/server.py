@@ -0,0 +1,610 @@
+# IMPORTANT DISCLAIMER
+# ====================
+# This project uses SYNTHETIC DATA for educational purposes.
+# Data does NOT represent any real actual fleet performance.
+# All incidents, costs, and metrics are RANDOMLY GENERATED.
+
+"""
+Module for the local KPI HTTP service.
+Keeps the scored events and the analyzer reports as in-memory materialized
+views, rendered once per refresh, and serves them as JSON or CSV with ETags
+so polling dashboards get 304 Not Modified until the data changes.
+Made for demonstration, testing, and learning purposes.
+"""
+
+import hashlib
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import numpy as np
+import pandas as pd
+from . import config, metrics, schema
+from .analyzers import IncrementalSafetyAnalyzer
+from .loaders import DataLoader
+from .query import INDEXED_COLUMNS, EventIndex
+from .risk_calculator import RiskCalculator
+
+# Response formats and their content types
+CONTENT_TYPES = {
+    'json': 'application/json',
+    'csv': 'text/csv; charset=utf-8'
+}
+
+# Report views: path -> analyzer method
+REPORT_VIEWS = {
+    'kpis': 'calculate_main_kpis',
+    'aircraft': 'analyze_by_aircraft',
+    'trend': 'generate_time_trend'
+}
+
+# Query parameters of /events besides the indexed columns
+SLICE_PARAMETERS = ['start', 'end', 'limit', 'format']
+
+class BadRequest(ValueError):
+    """Invalid request parameters (answered with 400)."""
+
+class View:
+    """A rendered response body with its ETag."""
+    
+    __slots__ = ('body', 'etag', 'content_type', 'headers')
+    
+    def __init__(self, body, content_type, headers=None):
+        """
+        Initialize view.
+        
+        The ETag is a hash of the body, so a refresh that leaves a report
+        unchanged keeps its ETag and clients keep getting 304.
+        
+        Args:
+            body (bytes): Response body
+            content_type (str): Content-Type header
+            headers (dict, optional): Extra response headers
+        """
+        self.body = body
+        self.etag = f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+        self.content_type = content_type
+        self.headers = headers or {}
+
+def _json_default(value):
+    """Convert NumPy scalars for json.dumps."""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+def render(report, fmt):
+    """
+    Render a report in a response format.
+    
+    CSV bodies match the files DataExporter writes.
+    
+    Args:
+        report (dict or DataFrame): KPIs, a report table or events
+        fmt (str): 'json' or 'csv'
+    
+    Returns:
+        View: Rendered report
+    """
+    if isinstance(report, dict):
+        if fmt == 'json':
+            body = json.dumps(report, default=_json_default)
+        else:
+            body = pd.DataFrame([report]).to_csv(index=False)
+    else:
+        # Named indexes (aircraft_model) become the first column
+        frame = report.reset_index() if report.index.name else report
+        if fmt == 'json':
+            body = frame.to_json(orient='records', date_format='iso')
+        else:
+            body = frame.to_csv(index=False)
+    return View(body.encode(), CONTENT_TYPES[fmt])
+
+def _response_format(fmt):
+    """
+    Check a requested response format.
+    
+    Args:
+        fmt (str): Format from the path extension or ?format= (None: JSON)
+    
+    Returns:
+        str: 'json' or 'csv'
+    
+    Raises:
+        BadRequest: For any other format
+    """
+    fmt = fmt or 'json'
+    if fmt not in CONTENT_TYPES:
+        raise BadRequest(f"Unknown format: {fmt}")
+    return fmt
+
+def _source_signature(path):
+    """
+    Identify the current version of a dataset on disk.
+    
+    Args:
+        path (str): Dataset file or Parquet folder (published paths are
+            links, followed to the snapshot they point to)
+    
+    Returns:
+        tuple: (file, inode, size, mtime) of every file, or None if missing
+    """
+    try:
+        return tuple(
+            (file, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            for file in DataLoader.partitions(path)
+            for stat in [os.stat(file)]
+        )
+    except OSError:
+        return None
+
+def _row_hashes(df):
+    """Hash every row of loaded events (to spot rewritten history)."""
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+class _Snapshot:
+    """Immutable state served between two refreshes."""
+    
+    def __init__(self, version, df, views, refreshed_at):
+        self.version = version
+        self.df = df
+        self.views = views
+        self.refreshed_at = refreshed_at
+        self.index = EventIndex(df) if len(df) else None
+        self.slices = OrderedDict()
+        self.slices_lock = threading.Lock()
+
+class MaterializedViews:
+    """
+    In-memory materialized views of the scored events and their reports.
+    
+    Reports come from an IncrementalSafetyAnalyzer, so new events are folded
+    into the aggregates in O(new events); every report is then rendered once
+    as JSON and CSV. The event table and the bitmap index behind filtered
+    slices (src/query.py) are not incremental: each refresh concatenates the
+    whole history and rebuilds the index, in O(history) vectorized work
+    (under 0.1 s per million events). Rendered slices are cached until the
+    next refresh. A refresh builds the new state aside and publishes it with
+    one assignment: requests never wait for it and never see half of it.
+    """
+    
+    def __init__(self, df=None, source=None, slice_cache_size=None):
+        """
+        Initialize views.
+        
+        Args:
+            df (DataFrame, optional): Initial events (scored or not)
+            source (str, optional): Dataset file or Parquet folder to load
+                and follow with refresh() (see DataLoader.load)
+            slice_cache_size (int, optional): Rendered slices kept per
+                refresh (default config.SERVER_SLICE_CACHE)
+        """
+        self.source = source
+        self.slice_cache_size = slice_cache_size or config.SERVER_SLICE_CACHE
+        self._lock = threading.Lock()
+        self._signature = None
+        self._row_hashes = np.empty(0, dtype=np.uint64)
+        self.analyzer = IncrementalSafetyAnalyzer()
+        self._snapshot = None
+        self._publish(pd.DataFrame(columns=list(schema.EVENT_SCHEMA)).astype(schema.EVENT_SCHEMA), 0)
+        if df is not None:
+            self.update(df)
+        if source is not None:
+            self.refresh()
+    
+    @property
+    def version(self):
+        """int: Number of refreshes that changed the data."""
+        return self._snapshot.version
+    
+    @property
+    def df(self):
+        """DataFrame: Scored events currently served."""
+        return self._snapshot.df
+    
+    @staticmethod
+    def _score(df):
+        """Score events like the pipeline does, unless they are already scored."""
+        df = schema.to_compact(df)
+        if 'risk_score' not in df.columns:
+            df = RiskCalculator.add_scores_to_dataframe(df)
+        if 'risk_classification' not in df.columns:
+            df = RiskCalculator.add_classification(df)
+        return df
+    
+    def _publish(self, df, version):
+        """Render every report of the current aggregates and swap them in."""
+        views = {}
+        if len(df):
+            for name, method in REPORT_VIEWS.items():
+                report = getattr(self.analyzer, method)()
+                views[name] = {fmt: render(report, fmt) for fmt in CONTENT_TYPES}
+        self._snapshot = _Snapshot(version, df, views, datetime.now().isoformat(timespec='seconds'))
+    
+    @metrics.instrument('serve.update', rows_arg=1)
+    def update(self, df):
+        """
+        Add new events to every view.
+        
+        Args:
+            df (DataFrame): New events (compact schema or text layout)
+        """
+        if df.empty:
+            return
+        df = self._score(df)
+        with self._lock:
+            self.analyzer.update(df)
+            current = self._snapshot.df
+            events = pd.concat([current, df], ignore_index=True) if len(current) else df.reset_index(drop=True)
+            self._publish(events, self._snapshot.version + 1)
+    
+    @metrics.instrument('serve.replace', rows_arg=1)
+    def replace(self, df):
+        """
+        Replace every event (the source was rewritten).
+        
+        Args:
+            df (DataFrame): Events (compact schema or text layout)
+        """
+        df = self._score(df).reset_index(drop=True)
+        with self._lock:
+            self.analyzer = IncrementalSafetyAnalyzer()
+            if len(df):
+                self.analyzer.update(df)
+            self._publish(df, self._snapshot.version + 1)
+    
+    def refresh(self):
+        """
+        Pick up new data from the source, if it changed.
+        
+        When the source still starts with the events already served (the
+        pipeline's append mode, or a feed appending to a CSV), only the new
+        rows are scored and folded in; otherwise every view is rebuilt.
+        
+        Returns:
+            int: Events added (or loaded on a rebuild); 0 when unchanged
+        """
+        if self.source is None:
+            return 0
+        signature = _source_signature(self.source)
+        if signature is None or signature == self._signature:
+            return 0
+        
+        df = DataLoader.load(self.source)
+        hashes = _row_hashes(df)
+        known = len(self._row_hashes)
+        self._signature = signature
+        if known and len(hashes) >= known and np.array_equal(hashes[:known], self._row_hashes):
+            self._row_hashes = hashes
+            self.update(df.iloc[known:])
+            return len(df) - known
+        
+        self._row_hashes = hashes
+        self.replace(df)
+        return len(df)
+    
+    def report(self, name, fmt='json'):
+        """
+        Get a rendered report.
+        
+        Args:
+            name (str): One of REPORT_VIEWS
+            fmt (str): 'json' or 'csv'
+        
+        Returns:
+            View: Rendered report, or None when there are no events yet
+        """
+        return self._snapshot.views.get(name, {}).get(fmt)
+    
+    def status(self):
+        """
+        Describe the data currently served.
+        
+        Returns:
+            dict: version, total_events, refreshed_at and source
+        """
+        snapshot = self._snapshot
+        return {
+            'version': snapshot.version,
+            'total_events': len(snapshot.df),
+            'refreshed_at': snapshot.refreshed_at,
+            'source': self.source
+        }
+    
+    def slice(self, params):
+        """
+        Get the events matching a filter, rendered.
+        
+        Args:
+            params (dict): Query parameters, each a list of strings:
+                indexed column names (see query.INDEXED_COLUMNS; several
+                values or comma-separated values match any of them), 'start'
+                and 'end' (time range, end exclusive), 'limit' (rows
+                returned, default config.SERVER_SLICE_LIMIT) and 'format'
+        
+        Returns:
+            View: Matching events in the published text layout (the total
+                match count is in the X-Total-Count header)
+        
+        Raises:
+            BadRequest: On unknown parameters or invalid values
+        """
+        key = tuple(sorted((name, tuple(values)) for name, values in params.items()))
+        snapshot = self._snapshot
+        with snapshot.slices_lock:
+            view = snapshot.slices.get(key)
+            if view is not None:
+                snapshot.slices.move_to_end(key)
+                return view
+        
+        view = self._render_slice(snapshot, params)
+        with snapshot.slices_lock:
+            snapshot.slices[key] = view
+            if len(snapshot.slices) > self.slice_cache_size:
+                snapshot.slices.popitem(last=False)
+        return view
+    
+    @staticmethod
+    def _render_slice(snapshot, params):
+        """Run a slice query and render its result."""
+        unknown = set(params) - set(INDEXED_COLUMNS) - set(SLICE_PARAMETERS)
+        if unknown:
+            raise BadRequest(f"Unknown parameters: {', '.join(sorted(unknown))}")
+        
+        def single(name, default=None):
+            values = params.get(name)
+            return values[-1] if values else default
+        
+        fmt = _response_format(single('format'))
+        limit = single('limit', str(config.SERVER_SLICE_LIMIT))
+        if not limit.isdigit():
+            raise BadRequest("limit must be a non-negative integer")
+        bounds = {}
+        for name in ['start', 'end']:
+            value = single(name)
+            if value is not None:
+                try:
+                    bounds[name] = pd.Timestamp(value)
+                except ValueError:
+                    bounds[name] = pd.NaT
+                if bounds[name] is pd.NaT:
+                    raise BadRequest(f"{name} is not a date or time: {value}")
+        predicates = {
+            column: [value for item in values for value in item.split(',')]
+            for column, values in params.items() if column in INDEXED_COLUMNS
+        }
+        
+        if snapshot.index is None:
+            total, events = 0, snapshot.df.iloc[:0]
+        else:
+            rows = snapshot.index.query(**bounds, **predicates).rows()
+            total, events = len(rows), snapshot.df.iloc[rows[:int(limit)]]
+        view = render(schema.to_legacy(events), fmt)
+        view.headers['X-Total-Count'] = str(total)
+        return view
+
+class KPIRequestHandler(BaseHTTPRequestHandler):
+    """
+    Request handler of the KPI service.
+    
+    Routes:
+        /kpis, /aircraft, /trend: reports (JSON, or CSV with a .csv suffix
+            or ?format=csv)
+        /events: filtered slice of the scored events (see MaterializedViews.slice)
+        /status: version and size of the data served (JSON or CSV)
+    """
+    
+    # Keep-alive connections: no TCP handshake per poll
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out as separate writes; without TCP_NODELAY the
+    # body waits for the client's delayed ACK (about 40 ms)
+    disable_nagle_algorithm = True
+    server_version = 'FlightSafetyKPI/1.0'
+    
+    def do_GET(self):
+        """Serve a GET request."""
+        self._respond(send_body=True)
+    
+    def do_HEAD(self):
+        """Serve a HEAD request."""
+        self._respond(send_body=False)
+    
+    def _respond(self, send_body):
+        """Look up the view of the request and send it (or 304)."""
+        url = urlsplit(self.path)
+        params = parse_qs(url.query)
+        name, _, extension = url.path.strip('/').partition('.')
+        views = self.server.views
+        
+        try:
+            if name == 'events':
+                if extension:
+                    params['format'] = [extension]
+                view = views.slice(params)
+            elif name in REPORT_VIEWS or name == 'status':
+                fmt = _response_format(extension or params.get('format', [None])[-1])
+                if name == 'status':
+                    view = render(views.status(), fmt)
+                else:
+                    view = views.report(name, fmt)
+                if view is None:
+                    return self._error(503, "No events loaded yet")
+            else:
+                return self._error(404, f"Unknown path: {url.path}")
+        except BadRequest as e:
+            return self._error(400, str(e))
+        except Exception:
+            self.log_error("Error serving %s", self.path)
+            traceback.print_exc()
+            return self._error(500, "Internal server error")
+        
+        if self.headers.get('If-None-Match') in (view.etag, '*'):
+            self.send_response(304)
+            self.send_header('ETag', view.etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        
+        self.send_response(200)
+        self.send_header('Content-Type', view.content_type)
+        self.send_header('Content-Length', str(len(view.body)))
+        self.send_header('ETag', view.etag)
+        self.send_header('Cache-Control', 'no-cache')
+        for header, value in view.headers.items():
+            self.send_header(header, value)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(view.body)
+    
+    def _error(self, code, message):
+        """Send a JSON error."""
+        body = json.dumps({'error': message}).encode()
+        self.send_response(code)
+        self.send_header('Content-Type', CONTENT_TYPES['json'])
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_request(self, code='-', size='-'):
+        """Do not log every request (errors still go to stderr)."""
+
+class KPIServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server over MaterializedViews.
+    
+    With a source and a refresh interval, a background thread calls
+    views.refresh() periodically, so new data is served without a restart.
+    """
+    
+    daemon_threads = True
+    # Pending connections accepted before refusing (the default 5 drops
+    # bursts of new clients into SYN retries)
+    request_queue_size = 128
+    
+    def __init__(self, views, host=None, port=None, refresh_seconds=None):
+        """
+        Initialize server (it listens once constructed).
+        
+        Args:
+            views (MaterializedViews): Views to serve
+            host (str, optional): Address to bind (default config.SERVER_HOST)
+            port (int, optional): Port (default config.SERVER_PORT, 0 = any free port)
+            refresh_seconds (float, optional): Source polling interval
+                (default config.SERVER_REFRESH_SECONDS, 0 = no polling)
+        """
+        host = config.SERVER_HOST if host is None else host
+        port = config.SERVER_PORT if port is None else port
+        super().__init__((host, port), KPIRequestHandler)
+        self.views = views
+        self.refresh_seconds = (
+            config.SERVER_REFRESH_SECONDS if refresh_seconds is None else refresh_seconds
+        )
+        self._stopped = threading.Event()
+        self._watcher = None
+    
+    @property
+    def url(self):
+        """str: Base URL of the server."""
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+    
+    def _watch(self):
+        """Poll the source until the server stops."""
+        while not self._stopped.wait(self.refresh_seconds):
+            try:
+                added = self.views.refresh()
+                if added:
+                    print(f" Views refreshed: {added} events (version {self.views.version})")
+            except Exception as e:
+                print(f" Refresh failed: {e}", file=sys.stderr)
+    
+    def serve_forever(self, poll_interval=0.5):
+        """Handle requests (and poll the source) until shutdown()."""
+        if self.views.source is not None and self.refresh_seconds:
+            self._watcher = threading.Thread(target=self._watch, daemon=True)
+            self._watcher.start()
+        try:
+            super().serve_forever(poll_interval)
+        finally:
+            self._stopped.set()
+    
+    def start(self):
+        """
+        Serve from a background thread.
+        
+        Returns:
+            Thread: Serving thread (stop it with shutdown())
+        """
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+def load_test(url, paths, clients=None, requests_per_client=None, conditional=False):
+    """
+    Measure latency of the service under concurrent clients.
+    
+    Every client thread keeps one connection open and requests the paths
+    in turn. Run it from another process than the server, or the clients
+    compete with it for the interpreter lock.
+    
+    Args:
+        url (str): Base URL, e.g. 'http://127.0.0.1:8050'
+        paths (list): Paths to request, e.g. ['/kpis', '/aircraft.csv']
+        clients (int, optional): Concurrent clients (default config.SERVER_LOAD_CLIENTS)
+        requests_per_client (int, optional): Requests per client
+            (default config.SERVER_LOAD_REQUESTS)
+        conditional (bool): Send If-None-Match with the ETag of the first
+            response, like a polling dashboard (answers are 304)
+    
+    Returns:
+        dict: requests, errors, requests_per_second and latency_ms_p50,
+            latency_ms_p99 and latency_ms_max
+    """
+    clients = clients or config.SERVER_LOAD_CLIENTS
+    requests_per_client = requests_per_client or config.SERVER_LOAD_REQUESTS
+    address = urlsplit(url)
+    latencies = np.zeros((clients, requests_per_client))
+    errors = [0] * clients
+    ready = threading.Barrier(clients + 1)
+    
+    def client(number):
+        connection = http.client.HTTPConnection(address.hostname, address.port)
+        etags = {}
+        ready.wait()
+        for i in range(requests_per_client):
+            path = paths[(number + i) % len(paths)]
+            headers = {'If-None-Match': etags[path]} if conditional and path in etags else {}
+            started = time.perf_counter()
+            connection.request('GET', path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            latencies[number, i] = time.perf_counter() - started
+            if response.status not in (200, 304):
+                errors[number] += 1
+            etags.setdefault(path, response.getheader('ETag'))
+        connection.close()
+    
+    threads = [threading.Thread(target=client, args=(number,)) for number in range(clients)]
+    for thread in threads:
+        thread.start()
+    ready.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    
+    latencies_ms = latencies.ravel() * 1000
+    return {
+        'requests': latencies_ms.size,
+        'errors': sum(errors),
+        'requests_per_second': round(latencies_ms.size / elapsed, 1),
+        'latency_ms_p50': round(float(np.percentile(latencies_ms, 50)), 3),
+        'latency_ms_p99': round(float(np.percentile(latencies_ms, 99)), 3),
+        'latency_ms_max': round(float(latencies_ms.max()), 3)
+    }
@@ -0,0 +1,238 @@
+# IMPORTANT DISCLAIMER
+# ====================
+# This project uses SYNTHETIC DATA for educational purposes.
+# Data does NOT represent any real actual fleet performance.
+# All incidents, costs, and metrics are RANDOMLY GENERATED.
+
+"""
+Module for Monte Carlo confidence intervals of the KPIs.
+Simulates many independent fleet-years with the generator's distributions
+and reports how much the KPIs of a single draw can vary, for the whole
+fleet, per aircraft model and per airport.
+Made for demonstration, testing, and learning purposes.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from . import config, metrics, schema
+from .data_generator import SafetyEventGenerator, _init_shard_worker
+
+# KPIs simulated per scenario (same definitions as SafetyAnalyzer, unrounded)
+SIMULATED_KPIS = ['safety_rate', 'total_cost_usd', 'avg_resolution_time']
+
+# Groupings with their own intervals
+SIMULATED_GROUPS = ['aircraft_model', 'airport']
+
+# Severities that lower the safety rate
+UNSAFE_SEVERITIES = ['Critical', 'High']
+
+def _group_sums(scenarios, codes, num_scenarios, num_groups, unsafe, cost, resolution, resolved):
+    """
+    Sum the KPI inputs per (scenario, group) cell with np.bincount.
+    
+    Args:
+        scenarios (ndarray): Scenario of each event
+        codes (ndarray): Group code of each event (zeros for the whole fleet)
+        num_scenarios (int): Number of scenarios
+        num_groups (int): Number of groups
+        unsafe (ndarray): 1.0 for High and Critical events
+        cost (ndarray): Event costs
+        resolution (ndarray): Resolution days (0 where unresolved)
+        resolved (ndarray): 1.0 for events with a resolution time
+    
+    Returns:
+        ndarray: Events, unsafe events, cost, resolution days and resolved
+            events, shape (5, num_scenarios, num_groups)
+    """
+    cells = scenarios * num_groups + codes
+    size = num_scenarios * num_groups
+    return np.stack([
+        np.bincount(cells, minlength=size).astype(np.float64),
+        np.bincount(cells, weights=unsafe, minlength=size),
+        np.bincount(cells, weights=cost, minlength=size),
+        np.bincount(cells, weights=resolution, minlength=size),
+        np.bincount(cells, weights=resolved, minlength=size)
+    ]).reshape(5, num_scenarios, num_groups)
+
+def _simulate_block(seed_sequence, num_scenarios, num_events):
+    """
+    Simulate a block of scenarios in one batch of draws (worker process).
+    
+    Every event of the block is sampled at once by
+    SafetyEventGenerator.sample_event_columns; events i*num_events ..
+    (i+1)*num_events-1 form scenario i.
+    
+    Args:
+        seed_sequence (SeedSequence): Block's own seed sequence
+        num_scenarios (int): Scenarios in the block
+        num_events (int): Events per scenario
+    
+    Returns:
+        dict: Grouping ('fleet', 'aircraft_model', 'airport') -> sums as
+            returned by _group_sums
+    """
+    rng = np.random.default_rng(seed_sequence)
+    # Events fall on uniformly drawn days, like the generator's day counts
+    day_offsets = rng.integers(0, config.PERIOD_DAYS + 1, size=num_scenarios * num_events)
+    columns = SafetyEventGenerator.sample_event_columns(rng, day_offsets.astype(np.int16))
+    
+    scenarios = np.repeat(np.arange(num_scenarios), num_events)
+    severity = columns['severity']
+    unsafe = np.isin(
+        severity.codes, severity.categories.get_indexer(UNSAFE_SEVERITIES)
+    ).astype(np.float64)
+    resolution = columns['resolution_days']
+    resolved = (~resolution.isna()).astype(np.float64)
+    inputs = (
+        unsafe,
+        columns['estimated_cost_usd'],
+        resolution.to_numpy(dtype=np.float64, na_value=0),
+        resolved
+    )
+    
+    sums = {'fleet': _group_sums(scenarios, 0, num_scenarios, 1, *inputs)}
+    for column in SIMULATED_GROUPS:
+        codes = columns[column].codes.astype(np.int64)
+        num_groups = len(schema.EVENT_SCHEMA[column].categories)
+        sums[column] = _group_sums(scenarios, codes, num_scenarios, num_groups, *inputs)
+    return sums
+
+def _kpis(sums):
+    """
+    Compute the KPIs of each scenario and group from their sums.
+    
+    Args:
+        sums (ndarray): Sums with shape (5, scenarios, groups)
+    
+    Returns:
+        dict: KPI name -> array (scenarios, groups); NaN where a group had no
+            (resolved) events in a scenario
+    """
+    events, unsafe, cost, resolution, resolved = sums
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {
+            'safety_rate': np.where(events > 0, (1 - unsafe / events) * 100, np.nan),
+            'total_cost_usd': cost,
+            'avg_resolution_time': np.where(resolved > 0, resolution / resolved, np.nan)
+        }
+
+class KPISimulator:
+    """
+    Monte Carlo engine for KPI distributions and confidence intervals.
+    
+    Each scenario is an independent fleet-year of events_per_scenario
+    events drawn from the generator's distributions. Scenarios are simulated
+    in blocks as batched NumPy draws (no Python loop per event or per
+    scenario) on a process pool. Every block has its own random stream
+    derived from the seed, so results depend on the seed and block size
+    only, not on the number of workers.
+    """
+    
+    def __init__(self, num_scenarios=None, events_per_scenario=None, seed=None,
+                 block_size=None, max_workers=None):
+        """
+        Initialize simulator.
+        
+        Args:
+            num_scenarios (int, optional): Fleet-years to simulate (default
+                config.MONTE_CARLO_SCENARIOS)
+            events_per_scenario (int, optional): Events per fleet-year
+                (default config.NUM_EVENTS)
+            seed (int, optional): Seed for reproducibility (default config.RANDOM_SEED)
+            block_size (int, optional): Scenarios per batch of draws
+                (default config.MONTE_CARLO_BLOCK)
+            max_workers (int, optional): Worker processes (default
+                config.NUM_WORKERS, None = all cores)
+        """
+        self.num_scenarios = num_scenarios or config.MONTE_CARLO_SCENARIOS
+        self.events_per_scenario = events_per_scenario or config.NUM_EVENTS
+        self.seed = config.RANDOM_SEED if seed is None else seed
+        self.block_size = block_size or config.MONTE_CARLO_BLOCK
+        self.max_workers = max_workers or config.NUM_WORKERS or os.cpu_count()
+        self.kpis = None
+    
+    def run(self):
+        """
+        Simulate every scenario.
+        
+        Returns:
+            dict: Grouping ('fleet', 'aircraft_model', 'airport') -> KPI
+                name -> DataFrame with one row per scenario and one column
+                per group
+        """
+        blocks = [
+            min(self.block_size, self.num_scenarios - start)
+            for start in range(0, self.num_scenarios, self.block_size)
+        ]
+        sequences = np.random.SeedSequence(self.seed).spawn(len(blocks))
+        max_workers = min(self.max_workers, len(blocks))
+        
+        with metrics.stage('simulate', rows=self.num_scenarios * self.events_per_scenario):
+            events = [self.events_per_scenario] * len(blocks)
+            if max_workers > 1:
+                with ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    initializer=_init_shard_worker,
+                    initargs=(config.START_DATE, config.END_DATE, config.PERIOD_DAYS)
+                ) as executor:
+                    results = list(executor.map(_simulate_block, sequences, blocks, events))
+            else:
+                results = list(map(_simulate_block, sequences, blocks, events))
+        
+        labels = {'fleet': pd.Index(['fleet'])}
+        labels.update({
+            column: pd.Index(schema.EVENT_SCHEMA[column].categories, name=column)
+            for column in SIMULATED_GROUPS
+        })
+        index = pd.RangeIndex(self.num_scenarios, name='scenario')
+        self.kpis = {}
+        for grouping, columns in labels.items():
+            sums = np.concatenate([result[grouping] for result in results], axis=1)
+            self.kpis[grouping] = {
+                name: pd.DataFrame(values, index=index, columns=columns)
+                for name, values in _kpis(sums).items()
+            }
+        return self.kpis
+    
+    def summary(self, by='fleet', confidence=None):
+        """
+        Summarize the simulated KPI distributions.
+        
+        The interval is the central range holding the confidence share of
+        the simulated fleet-years: a KPI from one draw outside it is
+        unlikely to be noise. Runs the simulation on first use.
+        
+        Args:
+            by (str): 'fleet', 'aircraft_model' or 'airport'
+            confidence (float, optional): Interval coverage (default
+                config.MONTE_CARLO_CONFIDENCE)
+        
+        Returns:
+            DataFrame: One row per (group, KPI) with mean, std, p5, p50,
+                p95, ci_low and ci_high (groups with no events in a
+                scenario are left out of that scenario's values)
+        """
+        if self.kpis is None:
+            self.run()
+        confidence = confidence or config.MONTE_CARLO_CONFIDENCE
+        tail = (1 - confidence) / 2 * 100
+        
+        stats = {}
+        for name in SIMULATED_KPIS:
+            values = self.kpis[by][name]
+            percentiles = np.nanpercentile(values.to_numpy(), [5, 50, 95, tail, 100 - tail], axis=0)
+            stats[name] = pd.DataFrame({
+                'mean': values.mean(),
+                'std': values.std(),
+                'p5': percentiles[0],
+                'p50': percentiles[1],
+                'p95': percentiles[2],
+                'ci_low': percentiles[3],
+                'ci_high': percentiles[4]
+            })
+        
+        result = pd.concat(stats, names=['kpi', by]).swaplevel()
+        order = pd.MultiIndex.from_product([values.columns, SIMULATED_KPIS], names=[by, 'kpi'])
+        return result.reindex(order)
@@ -0,0 +1,571 @@
+# IMPORTANT DISCLAIMER
+# ====================
+# This project uses SYNTHETIC DATA for educational purposes.
+# Data does NOT represent any real actual fleet performance.
+# All incidents, costs, and metrics are RANDOMLY GENERATED.
+
+"""
+Module for bounded-memory approximate analytics.
+Space-Saving top-k counters, relative-error quantile sketches and
+HyperLogLog distinct counts: fixed-size summaries that merge across shards
+and serialize to plain dicts, for views that must not grow with history.
+Made for demonstration, testing, and learning purposes.
+"""
+
+import numpy as np
+import pandas as pd
+from . import config, schema
+
+def _values(series):
+    """
+    Get the non-missing values of a column as a float array.
+    
+    Args:
+        series (Series): Numeric column
+    
+    Returns:
+        ndarray: Values without missing ones
+    """
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    return values[~np.isnan(values)]
+
+def _value_counts(series):
+    """
+    Count the occurrences of each value of a column.
+    
+    Categoricals are counted with np.bincount over their codes.
+    
+    Args:
+        series (Series): Column values
+    
+    Returns:
+        dict: Value -> count (missing values are skipped)
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+        present = np.flatnonzero(counts)
+        return dict(zip(series.cat.categories[present].tolist(), counts[present].tolist()))
+    return series.value_counts().to_dict()
+
+def _hashes(series):
+    """
+    Hash the values of a column to 64 bits.
+    
+    pd.util.hash_array uses a fixed key, so every process and shard
+    hashes a value the same way. Categoricals hash their categories once.
+    
+    Args:
+        series (Series): Column values
+    
+    Returns:
+        ndarray: uint64 hash per non-missing value
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        categories = np.asarray(series.cat.categories, dtype=object)
+        return pd.util.hash_array(categories)[codes[codes >= 0]]
+    values = series.dropna().to_numpy()
+    if values.dtype.kind in 'iub':
+        values = values.astype(str)
+    return pd.util.hash_array(np.asarray(values, dtype=object))
+
+class SpaceSaving:
+    """
+    Space-Saving top-k heavy hitters.
+    
+    At most capacity values are counted. Each reported count overestimates
+    the true count by at most its error, and every error is at most
+    N / capacity after N values, so any value seen more often than that is
+    guaranteed to be kept. With capacity at least the number of distinct
+    values, counts are exact.
+    """
+    
+    def __init__(self, capacity=None):
+        """
+        Initialize empty summary.
+        
+        Args:
+            capacity (int, optional): Counters kept (default config.SKETCH_TOP_K_CAPACITY)
+        """
+        self.capacity = capacity or config.SKETCH_TOP_K_CAPACITY
+        self.total = 0
+        self.counts = {}
+        self.errors = {}
+    
+    def _floor(self):
+        """Get the count a value missing from the summary may have had."""
+        return min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+    
+    def _combine(self, counts, errors, floor, total):
+        """
+        Merge other counters into this summary and keep the largest ones.
+        
+        A value missing from one side is given that side's floor, so
+        counts stay upper bounds (Cafaro et al., mergeable Space-Saving).
+        
+        Args:
+            counts (dict): Value -> count of the other side
+            errors (dict): Value -> error of the other side
+            floor (int): Count a value missing from the other side may have had
+            total (int): Values summarized by the other side
+        """
+        own_floor = self._floor()
+        merged_counts = {}
+        merged_errors = {}
+        for value in self.counts.keys() | counts.keys():
+            merged_counts[value] = self.counts.get(value, own_floor) + counts.get(value, floor)
+            merged_errors[value] = (
+                self.errors.get(value, own_floor) + errors.get(value, floor)
+            )
+        
+        # Ties keep the smallest value, so the result does not depend on merge order
+        kept = sorted(merged_counts, key=lambda value: (-merged_counts[value], str(value)))
+        kept = kept[:self.capacity]
+        self.counts = {value: merged_counts[value] for value in kept}
+        self.errors = {value: merged_errors[value] for value in kept}
+        self.total += total
+    
+    def update(self, series):
+        """
+        Add the values of a column.
+        
+        The batch is counted exactly first, so the cost is one pass over
+        the batch plus one step per distinct value in it.
+        
+        Args:
+            series (Series): Column values
+        """
+        counts = _value_counts(series)
+        self._combine(counts, {}, 0, sum(counts.values()))
+    
+    def merge(self, other):
+        """
+        Merge another summary (e.g. from another shard).
+        
+        Args:
+            other (SpaceSaving): Summary with the same capacity
+        
+        Returns:
+            SpaceSaving: New merged summary
+        """
+        merged = SpaceSaving.from_dict(self.to_dict())
+        merged._combine(other.counts, other.errors, other._floor(), other.total)
+        return merged
+    
+    def top(self, k=10):
+        """
+        Get the most frequent values.
+        
+        Args:
+            k (int): Number of values
+        
+        Returns:
+            list: (value, count, error) tuples, most frequent first; the
+                true count lies between count - error and count
+        """
+        return [(value, self.counts[value], self.errors[value]) for value in list(self.counts)[:k]]
+    
+    def to_dict(self):
+        """
+        Serialize the summary.
+        
+        Returns:
+            dict: JSON-compatible state
+        """
+        return {
+            'capacity': self.capacity,
+            'total': self.total,
+            'items': [[value, count, self.errors[value]] for value, count in self.counts.items()]
+        }
+    
+    @staticmethod
+    def from_dict(state):
+        """
+        Rebuild a summary serialized by to_dict.
+        
+        Args:
+            state (dict): Serialized state
+        
+        Returns:
+            SpaceSaving: Summary
+        """
+        summary = SpaceSaving(state['capacity'])
+        summary.total = state['total']
+        summary.counts = {value: count for value, count, _ in state['items']}
+        summary.errors = {value: error for value, _, error in state['items']}
+        return summary
+
+class QuantileSketch:
+    """
+    Relative-error quantile sketch for non-negative values (DDSketch).
+    
+    Values are counted in logarithmic buckets (gamma^(k-1), gamma^k] with
+    gamma = (1 + accuracy) / (1 - accuracy), so every quantile is within
+    accuracy * value of the true one. Memory is capped at max_bins buckets:
+    beyond that the lowest buckets are collapsed, which only affects the
+    accuracy of the lowest quantiles. Count, sum, min and max are exact, so
+    the mean is exact too.
+    """
+    
+    def __init__(self, accuracy=None, max_bins=None):
+        """
+        Initialize empty sketch.
+        
+        Args:
+            accuracy (float, optional): Relative accuracy (default
+                config.SKETCH_RELATIVE_ACCURACY)
+            max_bins (int, optional): Bucket limit (default config.SKETCH_MAX_BINS)
+        """
+        self.accuracy = accuracy or config.SKETCH_RELATIVE_ACCURACY
+        self.max_bins = max_bins or config.SKETCH_MAX_BINS
+        self.gamma = (1 + self.accuracy) / (1 - self.accuracy)
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.bins = np.zeros(0, dtype=np.int64)
+        self.zeros = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+    
+    def _add_bins(self, keys, bins):
+        """
+        Add bucket counts, collapsing the lowest buckets above max_bins.
+        
+        Args:
+            keys (ndarray): Bucket keys
+            bins (ndarray): Count per key
+        """
+        keys, inverse = np.unique(np.concatenate([self.keys, keys]), return_inverse=True)
+        bins = np.bincount(inverse, weights=np.concatenate([self.bins, bins])).astype(np.int64)
+        if len(keys) > self.max_bins:
+            collapsed = len(keys) - self.max_bins
+            bins[collapsed] += bins[:collapsed].sum()
+            keys, bins = keys[collapsed:], bins[collapsed:]
+        self.keys, self.bins = keys, bins
+    
+    def update(self, series):
+        """
+        Add the values of a column (missing values are skipped).
+        
+        Args:
+            series (Series): Non-negative numeric column
+        """
+        values = _values(series)
+        if not len(values):
+            return
+        if values.min() < 0:
+            raise ValueError("QuantileSketch only accepts non-negative values")
+        
+        positive = values[values > 0]
+        keys, bins = np.unique(
+            np.ceil(np.log(positive) / np.log(self.gamma)).astype(np.int64), return_counts=True
+        )
+        self._add_bins(keys, bins)
+        self.zeros += len(values) - len(positive)
+        self.count += len(values)
+        self.sum += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+    
+    def merge(self, other):
+        """
+        Merge another sketch (e.g. from another shard).
+        
+        Args:
+            other (QuantileSketch): Sketch with the same accuracy
+        
+        Returns:
+            QuantileSketch: New merged sketch
+        """
+        if other.accuracy != self.accuracy:
+            raise ValueError("Cannot merge quantile sketches of different accuracy")
+        merged = QuantileSketch.from_dict(self.to_dict())
+        merged._add_bins(other.keys, other.bins)
+        merged.zeros += other.zeros
+        merged.count += other.count
+        merged.sum += other.sum
+        merged.min = min(merged.min, other.min)
+        merged.max = max(merged.max, other.max)
+        return merged
+    
+    def quantile(self, q):
+        """
+        Estimate a quantile.
+        
+        Args:
+            q (float): Quantile between 0 and 1
+        
+        Returns:
+            float: Estimated value (NaN for an empty sketch)
+        """
+        if not self.count:
+            return np.nan
+        rank = q * (self.count - 1)
+        if rank < self.zeros:
+            return 0.0
+        position = np.searchsorted(np.cumsum(self.bins), rank - self.zeros, side='right')
+        value = 2 * self.gamma ** float(self.keys[position]) / (self.gamma + 1)
+        return float(min(max(value, self.min), self.max))
+    
+    def mean(self):
+        """
+        Get the exact mean of the values.
+        
+        Returns:
+            float: Mean (NaN for an empty sketch)
+        """
+        return self.sum / self.count if self.count else np.nan
+    
+    def to_dict(self):
+        """
+        Serialize the sketch.
+        
+        Returns:
+            dict: JSON-compatible state
+        """
+        return {
+            'accuracy': self.accuracy,
+            'max_bins': self.max_bins,
+            'keys': self.keys.tolist(),
+            'bins': self.bins.tolist(),
+            'zeros': self.zeros,
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None
+        }
+    
+    @staticmethod
+    def from_dict(state):
+        """
+        Rebuild a sketch serialized by to_dict.
+        
+        Args:
+            state (dict): Serialized state
+        
+        Returns:
+            QuantileSketch: Sketch
+        """
+        sketch = QuantileSketch(state['accuracy'], state['max_bins'])
+        sketch.keys = np.array(state['keys'], dtype=np.int64)
+        sketch.bins = np.array(state['bins'], dtype=np.int64)
+        sketch.zeros = state['zeros']
+        sketch.count = state['count']
+        sketch.sum = state['sum']
+        if state['count']:
+            sketch.min = state['min']
+            sketch.max = state['max']
+        return sketch
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct counter.
+    
+    Uses 2^precision one-byte registers; the standard error of the
+    estimate is 1.04 / sqrt(2^precision) (1.6% at precision 12), with
+    linear counting for small cardinalities. Merging takes the register
+    maxima, so shards can be counted separately.
+    """
+    
+    def __init__(self, precision=None):
+        """
+        Initialize empty counter.
+        
+        Args:
+            precision (int, optional): Register index bits, 4 to 16
+                (default config.SKETCH_HLL_PRECISION)
+        """
+        self.precision = precision or config.SKETCH_HLL_PRECISION
+        if not 4 <= self.precision <= 16:
+            raise ValueError("HyperLogLog precision must be between 4 and 16")
+        self.registers = np.zeros(1 << self.precision, dtype=np.uint8)
+    
+    def update(self, series):
+        """
+        Add the values of a column (missing values are skipped).
+        
+        Args:
+            series (Series): Column values
+        """
+        hashes = _hashes(series)
+        if not len(hashes):
+            return
+        p = np.uint64(self.precision)
+        index = (hashes >> (np.uint64(64) - p)).astype(np.intp)
+        # The top 52 of the remaining bits are exact as floats, so frexp gives
+        # their bit length; the rank is the position of the first 1 bit
+        rest = (hashes << p) >> np.uint64(12)
+        bit_length = np.frexp(rest.astype(np.float64))[1]
+        rank = np.minimum(53 - bit_length, 64 - self.precision + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+    
+    def merge(self, other):
+        """
+        Merge another counter (e.g. from another shard).
+        
+        Args:
+            other (HyperLogLog): Counter with the same precision
+        
+        Returns:
+            HyperLogLog: New merged counter
+        """
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog counters of different precision")
+        merged = HyperLogLog(self.precision)
+        merged.registers = np.maximum(self.registers, other.registers)
+        return merged
+    
+    def estimate(self):
+        """
+        Estimate the number of distinct values.
+        
+        Returns:
+            int: Estimated distinct count
+        """
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        empty = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and empty:
+            estimate = m * np.log(m / empty)
+        return int(round(estimate))
+    
+    def to_dict(self):
+        """
+        Serialize the counter.
+        
+        Returns:
+            dict: JSON-compatible state (registers as a hex string)
+        """
+        return {'precision': self.precision, 'registers': self.registers.tobytes().hex()}
+    
+    @staticmethod
+    def from_dict(state):
+        """
+        Rebuild a counter serialized by to_dict.
+        
+        Args:
+            state (dict): Serialized state
+        
+        Returns:
+            HyperLogLog: Counter
+        """
+        counter = HyperLogLog(state['precision'])
+        counter.registers = np.frombuffer(bytes.fromhex(state['registers']), dtype=np.uint8).copy()
+        return counter
+
+class SafetySketches:
+    """
+    Sketch-backed safety analytics in fixed memory.
+    
+    Keeps top-k counters for the dimensions whose mode the KPIs report,
+    quantile sketches (with exact means) for the numeric measures and
+    distinct counters for registrations and investigators. Memory does not
+    grow with the number of events; see each sketch for its error bound.
+    """
+    
+    TOP_K_COLUMNS = ['airport', 'aircraft_model', 'incident_type', 'registration']
+    QUANTILE_COLUMNS = ['resolution_days', 'delay_minutes', 'estimated_cost_usd', 'risk_score']
+    DISTINCT_COLUMNS = ['registration', 'investigator']
+    
+    def __init__(self):
+        """Initialize empty sketches."""
+        self.total_events = 0
+        self.top_k = {column: SpaceSaving() for column in self.TOP_K_COLUMNS}
+        self.quantiles = {column: QuantileSketch() for column in self.QUANTILE_COLUMNS}
+        self.distinct = {column: HyperLogLog() for column in self.DISTINCT_COLUMNS}
+    
+    def update(self, df):
+        """
+        Add a batch of scored events.
+        
+        Args:
+            df (DataFrame): Event data (compact schema or text layout)
+        """
+        df = schema.to_compact(df)
+        self.total_events += len(df)
+        for group in (self.top_k, self.quantiles, self.distinct):
+            for column, sketch in group.items():
+                sketch.update(df[column])
+    
+    def merge(self, other):
+        """
+        Merge the sketches of another shard.
+        
+        Args:
+            other (SafetySketches): Sketches built with the same settings
+        
+        Returns:
+            SafetySketches: New merged sketches
+        """
+        merged = SafetySketches()
+        merged.total_events = self.total_events + other.total_events
+        for name in ('top_k', 'quantiles', 'distinct'):
+            ours, theirs = getattr(self, name), getattr(other, name)
+            setattr(merged, name, {column: ours[column].merge(theirs[column]) for column in ours})
+        return merged
+    
+    def summary(self, k=5, quantiles=(0.5, 0.9, 0.99)):
+        """
+        Get the current approximate view.
+        
+        Args:
+            k (int): Values listed per top-k column
+            quantiles (tuple): Quantiles reported per numeric column
+        
+        Returns:
+            dict: total_events, 'top' (column -> [(value, count, error)]),
+                'quantiles' (column -> {'p50': ..., 'mean': ...}) and
+                'distinct' (column -> estimated count)
+        """
+        return {
+            'total_events': self.total_events,
+            'top': {column: sketch.top(k) for column, sketch in self.top_k.items()},
+            'quantiles': {
+                column: {
+                    **{f'p{q * 100:g}': sketch.quantile(q) for q in quantiles},
+                    'mean': sketch.mean()
+                }
+                for column, sketch in self.quantiles.items()
+            },
+            'distinct': {column: sketch.estimate() for column, sketch in self.distinct.items()}
+        }
+    
+    def to_dict(self):
+        """
+        Serialize every sketch.
+        
+        Returns:
+            dict: JSON-compatible state
+        """
+        return {
+            'total_events': self.total_events,
+            'top_k': {column: sketch.to_dict() for column, sketch in self.top_k.items()},
+            'quantiles': {column: sketch.to_dict() for column, sketch in self.quantiles.items()},
+            'distinct': {column: sketch.to_dict() for column, sketch in self.distinct.items()}
+        }
+    
+    @staticmethod
+    def from_dict(state):
+        """
+        Rebuild sketches serialized by to_dict.
+        
+        Args:
+            state (dict): Serialized state
+        
+        Returns:
+            SafetySketches: Sketches
+        """
+        sketches = SafetySketches()
+        sketches.total_events = state['total_events']
+        sketches.top_k = {
+            column: SpaceSaving.from_dict(value) for column, value in state['top_k'].items()
+        }
+        sketches.quantiles = {
+            column: QuantileSketch.from_dict(value) for column, value in state['quantiles'].items()
+        }
+        sketches.distinct = {
+            column: HyperLogLog.from_dict(value) for column, value in state['distinct'].items()
+        }
+        return sketches
@@ -0,0 +1,58 @@
+"""
+Shared fixtures for the test suite.
+Data is generated with a fixed seed and a pinned reference date, so every
+run sees the same events.
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src import config, schema
+from src.data_generator import SafetyEventGenerator
+from src.risk_calculator import RiskCalculator
+
+config.REFERENCE_DATE = '2026-01-31'
+
+SEED = 42
+NUM_EVENTS = 5_000
+
+@pytest.fixture(scope='session')
+def events():
+    """Scored events in the compact schema (do not modify)."""
+    df = SafetyEventGenerator(seed=SEED).generate_batch(NUM_EVENTS)
+    df = RiskCalculator.add_scores_to_dataframe(df)
+    return RiskCalculator.add_classification(df)
+
+@pytest.fixture(scope='session')
+def legacy_events(events):
+    """The same events in the published text layout (do not modify)."""
+    return schema.to_legacy(events)
+
+@pytest.fixture
+def data_folder(tmp_path, monkeypatch):
+    """Published outputs under tmp_path (CSV only unless a test enables more)."""
+    folder = str(tmp_path / 'data')
+    paths = {
+        'DATA_FOLDER': folder,
+        'MAIN_DATA_FILE': f'{folder}/flight_safety_data.csv',
+        'KPIS_FILE': f'{folder}/safety_kpis.csv',
+        'AIRCRAFT_ANALYSIS_FILE': f'{folder}/aircraft_analysis.csv',
+        'TREND_FILE': f'{folder}/monthly_trend.csv',
+        'EXCEL_FILE': f'{folder}/flight_safety_data.xlsx',
+        'PARQUET_FOLDER': f'{folder}/flight_safety_data_parquet',
+        'PARTIALS_FILE': f'{folder}/analysis_partials.pkl',
+        'MANIFEST_FILE': f'{folder}/manifest.json',
+        'SNAPSHOTS_FOLDER': f'{folder}/snapshots',
+        'CURRENT_SNAPSHOT': f'{folder}/current',
+        'EXPORT_CSV': True,
+        'EXPORT_EXCEL': False,
+        'EXPORT_PARQUET': False
+    }
+    for name, value in paths.items():
+        monkeypatch.setattr(config, name, value)
+    return folder
@@ -0,0 +1,131 @@
+"""Fused SafetyAnalyzer reports against the original per-report pandas code."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import schema
+from src.analyzers import SafetyAnalyzer
+
+def baseline_reports(df):
+    """Reports computed the way SafetyAnalyzer originally did, one scan each."""
+    total = len(df)
+    critical = len(df[df['severity'] == 'Critical'])
+    high = len(df[df['severity'] == 'High'])
+    kpis = {
+        'total_events': total,
+        'critical_events': critical,
+        'high_events': high,
+        'safety_rate': round((1 - (critical + high) / total) * 100, 2),
+        'total_injuries': int(df['injuries'].sum()),
+        'avg_resolution_time': round(df['resolution_days'].mean(), 1),
+        'total_cost_usd': round(df['estimated_cost_usd'].sum(), 2),
+        'pending_events': len(df[
+            df['status'].isin(['Under Investigation', 'Corrective Action'])
+        ]),
+        'most_incidents_model': df['aircraft_model'].mode()[0],
+        'most_common_type': df['incident_type'].mode()[0]
+    }
+    
+    aircraft_analysis = df.groupby('aircraft_model').agg({
+        'event_id': 'count',
+        'risk_score': 'mean',
+        'estimated_cost_usd': 'sum',
+        'resolution_days': 'mean'
+    }).rename(columns={'event_id': 'total_events'}).round(2)
+    
+    trend = df.groupby(['year', 'month']).size().reset_index(name='events')
+    trend['year_month'] = (
+        trend['year'].astype(str) + '-' + trend['month'].astype(str).str.zfill(2)
+    )
+    
+    critical_events = df[df['severity'].isin(['Critical', 'High'])]
+    patterns = {
+        'most_common_critical_type': critical_events['incident_type'].mode()[0],
+        'most_critical_phase': critical_events['flight_phase'].mode()[0],
+        'most_incidents_airport': critical_events['airport'].mode()[0],
+        'critical_percentage': round(len(critical_events) / total * 100, 2)
+    }
+    return kpis, aircraft_analysis, trend, patterns
+
+def text_columns(df):
+    """Copy of a frame with its categoricals turned back into text."""
+    df = df.copy()
+    for column in df.columns:
+        if isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype(object)
+    return df
+
+@pytest.fixture(scope='module')
+def expected(legacy_events):
+    # Plain text columns, as the original generator produced them
+    return baseline_reports(text_columns(legacy_events))
+
+@pytest.fixture(params=['compact', 'text_layout', 'text_columns'])
+def analyzer(request, events, legacy_events):
+    if request.param == 'compact':
+        return SafetyAnalyzer(events)
+    if request.param == 'text_layout':
+        return SafetyAnalyzer(legacy_events)
+    return SafetyAnalyzer(text_columns(events))
+
+def test_kpis_match_baseline(analyzer, expected):
+    assert analyzer.calculate_main_kpis() == pytest.approx(expected[0])
+
+def test_aircraft_analysis_matches_baseline(analyzer, expected):
+    analysis = analyzer.analyze_by_aircraft()
+    
+    assert list(analysis.index.astype(str)) == list(expected[1].index)
+    assert list(analysis.columns) == list(expected[1].columns)
+    np.testing.assert_allclose(
+        analysis.to_numpy(dtype=float), expected[1].to_numpy(dtype=float)
+    )
+
+def test_time_trend_matches_baseline(analyzer, expected):
+    trend = analyzer.generate_time_trend()
+    
+    assert list(trend.columns) == list(expected[2].columns)
+    for column in trend.columns:
+        assert list(trend[column]) == list(expected[2][column])
+
+def test_critical_patterns_match_baseline(analyzer, expected):
+    assert analyzer.identify_critical_patterns() == expected[3]
+
+def test_mode_ties_resolve_alphabetically(events):
+    # Same count for both models: Series.mode()[0] picks the smaller label
+    models = events['aircraft_model']
+    df = pd.concat([events[models == 'Model B'].head(3), events[models == 'Model A'].head(3)])
+    
+    assert SafetyAnalyzer(df).calculate_main_kpis()['most_incidents_model'] == 'Model A'
+
+def test_empty_input_raises(events):
+    with pytest.raises(ValueError):
+        SafetyAnalyzer(events.iloc[:0]).calculate_main_kpis()
+
+def test_copy_false_leaves_frame_unmodified(events):
+    original = events.copy()
+    analyzer = SafetyAnalyzer(events, copy=False)
+    
+    analyzer.compute_all_reports()
+    for name in ['date_datetime', 'week_of_year', *schema.DERIVED_COLUMNS]:
+        analyzer.derived(name)
+    analyzer.query(severity='Critical').count()
+    
+    assert analyzer.df is events
+    pd.testing.assert_frame_equal(events, original)
+
+def test_derived_columns_are_computed_once(events, monkeypatch):
+    computed = []
+    derive = schema.derive
+    def counting_derive(df, name):
+        computed.append(name)
+        return derive(df, name)
+    monkeypatch.setattr(schema, 'derive', counting_derive)
+    analyzer = SafetyAnalyzer(events, copy=False)
+    
+    for _ in range(2):
+        for name in ['date', 'date_datetime', 'week_of_year', 'month']:
+            analyzer.derived(name)
+    
+    assert computed == ['date', 'month']
+    pd.testing.assert_series_equal(analyzer.derived('month'), derive(events, 'month'))
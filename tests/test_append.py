@@ -0,0 +1,60 @@
+"""Append runs: new events added to the current snapshot without reprocessing it."""
+
+import os
+
+import pandas as pd
+import pytest
+
+from src import config, schema
+from src.analyzers import SafetyAnalyzer, StreamingSafetyAnalyzer
+from src.exporters import ExportCoordinator
+from src.loaders import DataLoader
+
+STORED_EVENTS = 4_000
+
+def append(df):
+    analyzer = StreamingSafetyAnalyzer()
+    analyzer.partials = DataLoader.load_partials()
+    analyzer.update(df)
+    ExportCoordinator().append(
+        df, analyzer.calculate_main_kpis(), analyzer.analyze_by_aircraft(),
+        analyzer.generate_time_trend(), analyzer.partials
+    )
+    return analyzer
+
+def parquet_files(folder):
+    return {
+        os.path.relpath(os.path.join(root, name), folder): os.stat(os.path.join(root, name)).st_ino
+        for root, _, names in os.walk(folder) for name in names
+    }
+
+def test_append_matches_a_full_export(data_folder, events, monkeypatch):
+    monkeypatch.setattr(config, 'EXPORT_PARQUET', True)
+    stored, new = events.iloc[:STORED_EVENTS], events.iloc[STORED_EVENTS:]
+    analyzer = SafetyAnalyzer(stored)
+    ExportCoordinator().export(
+        stored, analyzer.calculate_main_kpis(), analyzer.analyze_by_aircraft(),
+        analyzer.generate_time_trend()
+    )
+    before = parquet_files(os.path.realpath(config.PARQUET_FOLDER))
+    
+    appended = append(new)
+    
+    full = SafetyAnalyzer(events)
+    assert appended.calculate_main_kpis() == full.calculate_main_kpis()
+    assert DataLoader.load_partials()['last_event_id'] == len(events)
+    raw_events = events.drop(columns=list(schema.SCORE_SCHEMA))
+    pd.testing.assert_frame_equal(DataLoader.load(config.MAIN_DATA_FILE), raw_events)
+    pd.testing.assert_frame_equal(
+        DataLoader.load(config.PARQUET_FOLDER).sort_values('event_id', ignore_index=True),
+        raw_events
+    )
+    
+    # Stored Parquet files are linked, not rewritten
+    after = parquet_files(os.path.realpath(config.PARQUET_FOLDER))
+    assert all(after[name] == inode for name, inode in before.items())
+    assert len(after) > len(before)
+
+def test_append_needs_a_published_snapshot(data_folder, events):
+    with pytest.raises(FileNotFoundError):
+        append(events.iloc[:10])
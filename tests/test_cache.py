@@ -0,0 +1,108 @@
+"""Stage keys and the size-bounded LRU result cache."""
+
+import os
+import shutil
+
+import pytest
+
+from src import cache, config
+from src.cache import ResultCache, stage_keys
+
+def changed(before, after):
+    """Names of the stage keys that differ (exports as 'export.<kind>')."""
+    names = {name for name in before if name != 'export' and before[name] != after[name]}
+    names |= {f'export.{kind}' for kind in before['export'] if before['export'][kind] != after['export'][kind]}
+    return names
+
+def test_keys_are_stable():
+    assert stage_keys() == stage_keys()
+
+def test_generation_setting_invalidates_everything(monkeypatch):
+    before = stage_keys()
+    monkeypatch.setattr(config, 'NUM_EVENTS', config.NUM_EVENTS + 1)
+    
+    after = stage_keys()
+    assert changed(before, after) == set(before) - {'export'} | {f'export.{kind}' for kind in before['export']}
+
+def test_reference_date_invalidates_generation(monkeypatch):
+    before = stage_keys()
+    monkeypatch.setattr(config, 'REFERENCE_DATE', '2026-02-01')
+    
+    assert {'generate', 'score', 'kpis'} <= changed(before, stage_keys())
+
+def test_export_setting_invalidates_only_its_export(monkeypatch):
+    before = stage_keys()
+    monkeypatch.setattr(config, 'EXCEL_MAX_ROWS', 1_000)
+    
+    assert changed(before, stage_keys()) == {'export.excel'}
+
+def test_source_change_invalidates_downstream_only(monkeypatch, tmp_path):
+    source = tmp_path / 'src'
+    shutil.copytree(cache.SOURCE_FOLDER, source, ignore=shutil.ignore_patterns('__pycache__'))
+    monkeypatch.setattr(cache, 'SOURCE_FOLDER', str(source))
+    before = stage_keys()
+    
+    with open(source / 'analyzers.py', 'a') as f:
+        f.write('\n# changed\n')
+    
+    after = stage_keys()
+    assert changed(before, after) == {
+        'kpis', 'aircraft', 'trend', 'export.excel', 'export.partials',
+        'export.kpis', 'export.aircraft', 'export.trend'
+    }
+
+@pytest.fixture
+def result_cache(tmp_path):
+    return ResultCache(folder=str(tmp_path / 'cache'), max_bytes=10_000, enabled=True)
+
+def test_round_trip_and_fetch(result_cache):
+    assert result_cache.get('kpis', 'a') is None
+    result_cache.put('kpis', 'a', {'total_events': 3})
+    assert result_cache.get('kpis', 'a') == {'total_events': 3}
+    
+    calls = []
+    def compute():
+        calls.append(1)
+        return [1, 2]
+    assert result_cache.fetch('trend', 'b', compute) == [1, 2]
+    assert result_cache.fetch('trend', 'b', compute) == [1, 2]
+    assert len(calls) == 1
+
+def test_disabled_cache_always_misses(tmp_path):
+    disabled = ResultCache(folder=str(tmp_path), enabled=False)
+    disabled.put('kpis', 'a', 1)
+    
+    assert disabled.get('kpis', 'a') is None
+    assert not os.listdir(tmp_path)
+
+def test_get_refreshes_recency(result_cache):
+    for key in 'abc':
+        result_cache.put('stage', key, bytes(3_000))
+    for age, key in enumerate('abc'):
+        os.utime(result_cache.path('stage', key), (1_000 + age, 1_000 + age))
+    
+    result_cache.get('stage', 'a')
+    result_cache.put('stage', 'd', bytes(3_000))
+    
+    assert os.path.exists(result_cache.path('stage', 'a'))
+    assert not os.path.exists(result_cache.path('stage', 'b'))
+
+def test_eviction_fits_the_limit_and_keeps_the_new_entry(result_cache):
+    for key in 'abcdef':
+        result_cache.put('stage', key, bytes(3_000))
+        sizes = [os.path.getsize(os.path.join(result_cache.folder, name))
+                 for name in os.listdir(result_cache.folder)]
+        assert sum(sizes) <= result_cache.max_bytes
+        assert os.path.exists(result_cache.path('stage', key))
+    
+    # An entry larger than the limit is still kept; everything else goes
+    result_cache.put('stage', 'big', bytes(20_000))
+    assert os.listdir(result_cache.folder) == ['stage-big.pkl']
+
+def test_corrupt_entries_are_misses(result_cache):
+    result_cache.put('kpis', 'a', {'total_events': 3})
+    with open(result_cache.path('kpis', 'a'), 'wb') as f:
+        f.write(b'not a pickle')
+    
+    assert result_cache.get('kpis', 'a') is None
+    assert not os.path.exists(result_cache.path('kpis', 'a'))
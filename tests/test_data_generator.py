@@ -0,0 +1,97 @@
+"""Reproducibility of batch, chunked and sharded generation, and their distributions."""
+
+import pandas as pd
+
+from src import config, schema
+from src.data_generator import SafetyEventGenerator
+
+NUM_EVENTS = 2_000
+
+def test_sharded_generation_is_reproducible():
+    first = SafetyEventGenerator(seed=7).generate_sharded(NUM_EVENTS, num_shards=4, max_workers=2)
+    second = SafetyEventGenerator(seed=7).generate_sharded(NUM_EVENTS, num_shards=4, max_workers=4)
+    
+    pd.testing.assert_frame_equal(first, second)
+
+def test_sharded_generation_depends_on_seed():
+    first = SafetyEventGenerator(seed=7).generate_sharded(NUM_EVENTS, num_shards=2)
+    second = SafetyEventGenerator(seed=8).generate_sharded(NUM_EVENTS, num_shards=2)
+    
+    assert not first.equals(second)
+
+def test_sharded_events_are_numbered_and_sorted():
+    df = SafetyEventGenerator(seed=7).generate_sharded(NUM_EVENTS, num_shards=3)
+    
+    assert len(df) == NUM_EVENTS
+    assert list(df['event_id']) == list(range(1, NUM_EVENTS + 1))
+    assert df['timestamp'].dt.normalize().is_monotonic_increasing
+
+def test_batch_generation_is_reproducible():
+    pd.testing.assert_frame_equal(
+        SafetyEventGenerator(seed=7).generate_batch(NUM_EVENTS),
+        SafetyEventGenerator(seed=7).generate_batch(NUM_EVENTS)
+    )
+
+def test_generated_day_continues_numbering():
+    df = SafetyEventGenerator(seed=7).generate_day(100, first_index=NUM_EVENTS)
+    
+    assert list(df['event_id']) == list(range(NUM_EVENTS + 1, NUM_EVENTS + 101))
+    assert (df['timestamp'].dt.normalize() == pd.Timestamp(config.END_DATE.date())).all()
+
+def test_counter_generation_ignores_chunking():
+    whole = SafetyEventGenerator(seed=7).generate_counter(NUM_EVENTS, chunk_size=NUM_EVENTS)
+    chunked = SafetyEventGenerator(seed=7).generate_counter(NUM_EVENTS, chunk_size=333, max_workers=1)
+    parallel = SafetyEventGenerator(seed=7).generate_counter(NUM_EVENTS, chunk_size=700, max_workers=2)
+    
+    pd.testing.assert_frame_equal(whole, chunked)
+    pd.testing.assert_frame_equal(whole, parallel)
+    assert list(whole['event_id']) == list(range(1, NUM_EVENTS + 1))
+    assert whole['timestamp'].dt.normalize().is_monotonic_increasing
+
+def test_counter_range_matches_full_dataset():
+    generator = SafetyEventGenerator(seed=7)
+    whole = generator.generate_counter(NUM_EVENTS)
+    
+    for start, stop in [(0, 1), (1234, 1235), (500, 1500), (NUM_EVENTS - 10, NUM_EVENTS)]:
+        pd.testing.assert_frame_equal(
+            generator.generate_range(start, stop, NUM_EVENTS),
+            whole.iloc[start:stop].reset_index(drop=True)
+        )
+
+def test_counter_generation_follows_batch_distributions():
+    counter = SafetyEventGenerator(seed=7).generate_counter(20_000)
+    batch = SafetyEventGenerator(seed=7).generate_batch(20_000)
+    
+    assert not counter.equals(batch)
+    for column in ['aircraft_model', 'incident_type', 'severity', 'status', 'flight_phase']:
+        shares = counter[column].value_counts(normalize=True)
+        expected = batch[column].value_counts(normalize=True)
+        assert (shares - expected).abs().max() < 0.02, column
+    assert abs(counter['estimated_cost_usd'].mean() / batch['estimated_cost_usd'].mean() - 1) < 0.05
+
+def test_batch_generation_follows_event_distributions():
+    # Delay and cost bounds of calculate_consequences and calculate_cost,
+    # which draw High and Critical events from the same ranges
+    bounds = {
+        ('Low',): {'delay_minutes': (0, 59), 'estimated_cost_usd': (100, 50_000)},
+        ('Medium',): {'delay_minutes': (30, 179), 'estimated_cost_usd': (100, 50_000)},
+        ('High', 'Critical'): {'delay_minutes': (120, 599), 'estimated_cost_usd': (10_000, 500_000)}
+    }
+    per_event = pd.DataFrame(SafetyEventGenerator(seed=42).generate_all_events(4_000))
+    batch = schema.to_legacy(SafetyEventGenerator(seed=42).generate_batch(4_000))
+    
+    for column in ['aircraft_model', 'incident_type', 'severity', 'status', 'flight_phase',
+                   'airport', 'aircraft_damage']:
+        shares = batch[column].astype(str).value_counts(normalize=True)
+        expected = per_event[column].value_counts(normalize=True)
+        assert set(shares.index) <= set(expected.index), column
+        assert (shares - expected).abs().max() < 0.04, column
+    
+    for severities, ranges in bounds.items():
+        in_batch = batch[batch['severity'].isin(severities)]
+        in_per_event = per_event[per_event['severity'].isin(severities)]
+        for column, (low, high) in ranges.items():
+            assert in_batch[column].between(low, high).all(), (severities, column)
+            assert in_per_event[column].between(low, high).all(), (severities, column)
+            median = in_batch[column].astype(float).median()
+            assert abs(median - in_per_event[column].median()) < 0.1 * (high - low), (severities, column)
@@ -0,0 +1,78 @@
+"""ExportCoordinator snapshots and the streaming Excel writer."""
+
+import json
+import os
+
+import openpyxl
+import pytest
+
+from src import config, schema
+from src.analyzers import SafetyAnalyzer
+from src.exporters import DataExporter, ExportCoordinator, StreamingExcelWriter
+
+def export(df):
+    analyzer = SafetyAnalyzer(df)
+    return ExportCoordinator().export(
+        df, analyzer.calculate_main_kpis(), analyzer.analyze_by_aircraft(),
+        analyzer.generate_time_trend()
+    )
+
+def test_snapshot_is_published_with_manifest(data_folder, events):
+    manifest = export(events.iloc[:1000])
+    
+    with open(config.MANIFEST_FILE) as f:
+        assert json.load(f)['snapshot_id'] == manifest['snapshot_id']
+    for name, entry in manifest['files'].items():
+        assert os.path.getsize(os.path.join(data_folder, name)) == entry['bytes']
+    assert os.listdir(config.SNAPSHOTS_FOLDER) == [manifest['snapshot_id']]
+
+def test_failed_export_keeps_previous_snapshot(data_folder, events, monkeypatch):
+    previous = export(events.iloc[:1000])
+    with open(config.MAIN_DATA_FILE) as f:
+        published = f.read()
+    
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+    monkeypatch.setattr(DataExporter, 'export_trend', fail)
+    with pytest.raises(OSError):
+        export(events.iloc[:2000])
+    
+    with open(config.MAIN_DATA_FILE) as f:
+        assert f.read() == published
+    assert ExportCoordinator.load_manifest()['snapshot_id'] == previous['snapshot_id']
+    assert os.listdir(config.SNAPSHOTS_FOLDER) == [previous['snapshot_id']]
+
+def test_old_snapshots_are_pruned(data_folder, events, monkeypatch):
+    monkeypatch.setattr(config, 'SNAPSHOTS_KEPT', 2)
+    ids = [export(events.iloc[:100 * (i + 1)])['snapshot_id'] for i in range(3)]
+    
+    assert sorted(os.listdir(config.SNAPSHOTS_FOLDER)) == sorted(ids[1:])
+
+def test_excel_writer_splits_sheets_and_adds_reports(events, tmp_path):
+    path = str(tmp_path / 'events.xlsx')
+    analyzer = SafetyAnalyzer(events.iloc[:250])
+    writer = StreamingExcelWriter(path, max_rows=101)
+    for start in range(0, 250, 50):
+        writer.append(events.iloc[start:start + 50])
+    writer.add_reports(analyzer.calculate_main_kpis(), analyzer.analyze_by_aircraft(),
+                       analyzer.generate_time_trend())
+    result = writer.close()
+    
+    assert result['rows'] == 250
+    assert result['sheets'] == 3
+    workbook = openpyxl.load_workbook(path, read_only=True)
+    assert workbook.sheetnames == ['Events', 'Events 2', 'Events 3', 'KPIs', 'Aircraft Analysis', 'Monthly Trend']
+    
+    legacy = schema.to_legacy(events.iloc[:250])
+    event_ids = []
+    for title, expected_rows in [('Events', 101), ('Events 2', 101), ('Events 3', 51)]:
+        rows = list(workbook[title].values)
+        assert len(rows) == expected_rows
+        assert list(rows[0]) == list(legacy.columns)
+        event_ids += [row[0] for row in rows[1:]]
+    assert event_ids == list(legacy['event_id'])
+    
+    assert len(list(workbook['KPIs'].values)) == 2
+    assert len(list(workbook['Aircraft Analysis'].values)) == len(analyzer.analyze_by_aircraft()) + 1
+    assert len(list(workbook['Monthly Trend'].values)) == len(analyzer.generate_time_trend()) + 1
+    workbook.close()
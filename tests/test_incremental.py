@@ -0,0 +1,28 @@
+"""IncrementalSafetyAnalyzer updates against a one-shot SafetyAnalyzer."""
+
+import pytest
+
+from src.analyzers import IncrementalSafetyAnalyzer, SafetyAnalyzer
+
+def test_batches_events_and_text_layout_match_one_shot(events, legacy_events):
+    expected = SafetyAnalyzer(events).calculate_main_kpis()
+    
+    analyzer = IncrementalSafetyAnalyzer(events.iloc[:2000])
+    analyzer.update(legacy_events.iloc[2000:4000])
+    for event in legacy_events.iloc[4000:].to_dict('records'):
+        analyzer.add_event(event)
+    
+    assert analyzer.calculate_main_kpis() == pytest.approx(expected)
+
+def test_single_events_are_folded_in_before_reading(legacy_events):
+    analyzer = IncrementalSafetyAnalyzer()
+    for event in legacy_events.iloc[:10].to_dict('records'):
+        analyzer.add_event(event)
+    
+    assert analyzer.calculate_main_kpis()['total_events'] == 10
+
+def test_unscored_events_are_accepted(legacy_events):
+    unscored = legacy_events.drop(columns=['risk_score', 'risk_classification'])
+    expected = SafetyAnalyzer(legacy_events).calculate_main_kpis()
+    
+    assert IncrementalSafetyAnalyzer(unscored).calculate_main_kpis() == pytest.approx(expected)
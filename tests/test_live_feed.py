@@ -0,0 +1,63 @@
+"""Live feed: backpressure, pacing and the CSV sink."""
+
+import asyncio
+
+import numpy as np
+
+from src.analyzers import SafetyAnalyzer
+from src.live_feed import CsvSink, MemorySink, run_live_feed
+from src.loaders import DataLoader
+from src.risk_calculator import RiskCalculator
+
+class SlowSink(MemorySink):
+    """Memory sink that takes a while per batch, like a slow database."""
+    
+    def __init__(self, seconds):
+        super().__init__()
+        self.seconds = seconds
+    
+    async def write(self, df):
+        await asyncio.sleep(self.seconds)
+        await super().write(df)
+
+def test_slow_consumers_apply_backpressure():
+    sink = SlowSink(0.01)
+    stats = run_live_feed(
+        2_000, sink, events_per_second=1_000_000, batch_size=50, queue_size=2, consumers=1, seed=1
+    )
+    
+    assert stats['backpressure_waits'] > 0
+    assert stats['events'] == sink.events == 2_000
+    assert list(sink.to_frame()['event_id']) == list(range(1, 2_001))
+
+def test_fast_consumers_keep_up():
+    stats = run_live_feed(1_000, MemorySink(), events_per_second=5_000, batch_size=50, seed=1)
+    
+    assert stats['backpressure_waits'] == 0
+
+def test_producer_holds_the_target_rate():
+    stats = run_live_feed(1_000, MemorySink(), events_per_second=4_000, batch_size=100, seed=1)
+    
+    # The last batch is due after 900 events at 4,000/s
+    assert stats['seconds'] >= 0.9 * 900 / 4_000
+    assert stats['events_per_second'] <= 4_000 * 1.1
+
+def test_csv_sink_round_trip(tmp_path):
+    path = str(tmp_path / 'live.csv')
+    stats = run_live_feed(
+        1_000, CsvSink(path), events_per_second=1_000_000, batch_size=100, consumers=3, seed=1
+    )
+    
+    with open(path) as f:
+        lines = f.read().splitlines()
+    assert sum(line.startswith('event_id') for line in lines) == 1
+    
+    df = DataLoader.load(path)
+    event_ids = df['event_id'].to_numpy()
+    assert sorted(event_ids) == list(range(1, 1_001))
+    # Batches from concurrent consumers are written whole, never interleaved
+    for block in event_ids.reshape(-1, 100):
+        assert np.array_equal(np.sort(block), np.arange(block.min(), block.min() + 100))
+    
+    scored = RiskCalculator.add_scores_to_dataframe(df)
+    assert SafetyAnalyzer(scored).calculate_main_kpis() == stats['kpis']
@@ -0,0 +1,79 @@
+"""DataLoader: exported datasets read back into the compact schema."""
+
+import pandas as pd
+import pytest
+
+from src import schema
+from src.exporters import DataExporter
+from src.loaders import DataLoader
+
+@pytest.fixture(scope='module')
+def raw_events(events):
+    return events.drop(columns=list(schema.SCORE_SCHEMA))
+
+@pytest.mark.parametrize('engine', ['pyarrow', 'pandas'])
+def test_csv_export_is_read_back(tmp_path, events, raw_events, engine):
+    path = str(tmp_path / 'events.csv')
+    DataExporter.export_csv(events, path)
+    
+    df = DataLoader.load_csv(path, engine=engine)
+    
+    # Covers empty resolution days and the 'None' damage level
+    assert df['resolution_days'].isna().any()
+    pd.testing.assert_frame_equal(df, raw_events)
+
+def test_csv_reads_only_requested_columns(tmp_path, events):
+    path = str(tmp_path / 'events.csv')
+    DataExporter.export_csv(events, path)
+    
+    df = DataLoader.load(path, columns=['severity', 'risk_score'])
+    
+    assert list(df.columns) == ['event_id', 'timestamp', 'severity', 'risk_score']
+    pd.testing.assert_frame_equal(df, events[list(df.columns)])
+
+def test_excel_export_is_read_back(tmp_path, events, raw_events):
+    path = str(tmp_path / 'events.xlsx')
+    DataExporter.export_excel(events.iloc[:500], path=path)
+    
+    pd.testing.assert_frame_equal(DataLoader.load(path), raw_events.iloc[:500])
+
+def test_parquet_dataset_is_filtered_by_partition(tmp_path, events, raw_events):
+    folder = str(tmp_path / 'events_parquet')
+    DataExporter.export_parquet(events, folder=folder)
+    
+    df = DataLoader.load_parquet(folder, filters=[('year', '=', 2025), ('month', '=', 6)])
+    
+    expected = raw_events[
+        (raw_events['timestamp'].dt.year == 2025) & (raw_events['timestamp'].dt.month == 6)
+    ]
+    pd.testing.assert_frame_equal(
+        df.sort_values('event_id', ignore_index=True), expected.reset_index(drop=True)
+    )
+
+def test_arrow_file_is_read_back(tmp_path, events, raw_events):
+    pytest.importorskip('pyarrow')
+    path = str(tmp_path / 'events.arrow')
+    events.to_feather(path, compression='uncompressed')
+    
+    pd.testing.assert_frame_equal(DataLoader.load(path), raw_events)
+
+def test_unknown_format_is_rejected(tmp_path):
+    path = tmp_path / 'events.json'
+    path.write_text('[]')
+    
+    with pytest.raises(ValueError):
+        DataLoader.load(str(path))
+
+@pytest.mark.parametrize('name', ['events.csv', 'events_parquet'])
+def test_chunks_concatenate_to_the_full_load(tmp_path, events, raw_events, name):
+    path = str(tmp_path / name)
+    if name.endswith('.csv'):
+        DataExporter.export_csv(events, path)
+    else:
+        DataExporter.export_parquet(events, folder=path)
+    
+    chunks = list(DataLoader.iter_chunks(path, chunk_size=1000))
+    
+    assert len(chunks) > 1
+    df = pd.concat(chunks).sort_values('event_id', ignore_index=True)
+    pd.testing.assert_frame_equal(df, raw_events)
@@ -0,0 +1,92 @@
+"""Stage recording, aggregation and the JSON/Prometheus outputs."""
+
+import json
+
+import numpy as np
+import pytest
+
+from src import metrics
+
+@metrics.instrument('test.count', rows_arg=0)
+def count_rows(rows):
+    return rows
+
+@metrics.instrument('test.callable', rows=lambda items, extra=0: len(items) + extra)
+def count_items(items, extra=0):
+    return items
+
+def test_nothing_is_recorded_outside_recording():
+    assert metrics.active() is None
+    with metrics.stage('test.idle', rows=3) as record:
+        assert record == {'rows': 3}
+    assert count_rows(5) == 5
+
+def test_stages_are_aggregated_by_name():
+    with metrics.recording() as recorder:
+        for rows in [10, 20]:
+            with metrics.stage('test.outer', rows=rows):
+                with metrics.stage('test.inner') as record:
+                    record['rows'] = 1
+    
+    stages = recorder.report()['stages']
+    assert stages['test.outer']['calls'] == 2
+    assert stages['test.outer']['rows'] == 30
+    assert stages['test.inner']['rows'] == 2
+    assert stages['test.outer']['wall_seconds'] >= stages['test.inner']['wall_seconds']
+    assert metrics.active() is None
+
+def test_instrument_counts_rows():
+    with metrics.recording() as recorder:
+        count_rows(7)
+        count_rows(np.int64(3))
+        count_rows([1, 2])
+        count_items([1, 2, 3], extra=1)
+    
+    stages = recorder.report()['stages']
+    assert stages['test.count']['calls'] == 3
+    assert stages['test.count']['rows'] == 12
+    assert stages['test.callable']['rows'] == 4
+
+def test_instrument_rejects_ambiguous_row_counts():
+    with pytest.raises(ValueError):
+        metrics.instrument('test.bad', rows_arg=0, rows=len)
+    with pytest.raises(TypeError):
+        metrics.instrument('test.bad', rows=0)
+
+def test_merge_adds_worker_stages():
+    with metrics.recording() as worker:
+        with metrics.stage('test.work', rows=5):
+            pass
+    with metrics.recording() as recorder:
+        with metrics.stage('test.work', rows=1):
+            pass
+        recorder.merge(worker.stages)
+    
+    assert recorder.stages['test.work']['calls'] == 2
+    assert recorder.stages['test.work']['rows'] == 6
+
+def test_memory_tracing_reports_peaks():
+    with metrics.recording(trace_memory=True) as recorder:
+        with metrics.stage('test.alloc'):
+            buffer = bytearray(4_000_000)
+            del buffer
+    
+    assert recorder.report()['stages']['test.alloc']['peak_alloc_bytes'] >= 4_000_000
+
+def test_outputs(tmp_path):
+    with metrics.recording() as recorder:
+        with metrics.stage('test.write', rows=100):
+            pass
+    
+    path = tmp_path / 'metrics.json'
+    recorder.write(str(path), 'json')
+    report = json.loads(path.read_text())
+    assert report['stages']['test.write']['rows'] == 100
+    
+    text = recorder.to_prometheus()
+    assert '# TYPE flight_safety_stage_rows gauge' in text
+    assert 'flight_safety_stage_rows{stage="test.write"} 100' in text
+    assert 'peak_alloc_bytes{' not in text
+    
+    with pytest.raises(ValueError):
+        recorder.write(str(tmp_path / 'metrics.txt'), 'xml')
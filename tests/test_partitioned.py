@@ -0,0 +1,47 @@
+"""PartitionedSafetyAnalyzer map-reduce reports against a one-shot SafetyAnalyzer."""
+
+import pandas as pd
+import pytest
+
+from src.analyzers import PartitionedSafetyAnalyzer, SafetyAnalyzer
+from src.exporters import DataExporter
+
+@pytest.fixture(scope='module')
+def one_shot(events):
+    return SafetyAnalyzer(events)
+
+@pytest.fixture(scope='module')
+def parquet_dataset(tmp_path_factory, events):
+    folder = str(tmp_path_factory.mktemp('partitioned') / 'events_parquet')
+    DataExporter.export_parquet(events, folder=folder)
+    return folder
+
+def assert_reports_identical(analyzer, one_shot):
+    assert analyzer.calculate_main_kpis() == one_shot.calculate_main_kpis()
+    pd.testing.assert_frame_equal(analyzer.analyze_by_aircraft(), one_shot.analyze_by_aircraft())
+    pd.testing.assert_frame_equal(analyzer.generate_time_trend(), one_shot.generate_time_trend())
+    assert analyzer.identify_critical_patterns() == one_shot.identify_critical_patterns()
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_parquet_partitions_match_one_shot(parquet_dataset, one_shot, max_workers):
+    analyzer = PartitionedSafetyAnalyzer(parquet_dataset, max_workers=max_workers, chunk_size=150)
+    
+    assert_reports_identical(analyzer, one_shot)
+
+def test_csv_files_missing_models_match_one_shot(tmp_path, events, one_shot):
+    # Each file lacks the other file's models, so partials must align
+    in_first = events['aircraft_model'].isin(['Model A', 'Model B'])
+    paths = [str(tmp_path / 'first.csv'), str(tmp_path / 'second.csv')]
+    DataExporter.export_csv(events[in_first], paths[0])
+    DataExporter.export_csv(events[~in_first], paths[1])
+    
+    analyzer = PartitionedSafetyAnalyzer(paths, max_workers=2, chunk_size=700)
+    
+    assert_reports_identical(analyzer, one_shot)
+
+def test_reports_reuse_one_run(parquet_dataset, monkeypatch):
+    analyzer = PartitionedSafetyAnalyzer(parquet_dataset, max_workers=1)
+    analyzer.calculate_main_kpis()
+    monkeypatch.setattr(analyzer, 'run', lambda: pytest.fail("partitions were read again"))
+    
+    analyzer.analyze_by_aircraft()
@@ -0,0 +1,49 @@
+"""Bitmap-indexed queries against brute-force pandas filters."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analyzers import SafetyAnalyzer
+
+QUERIES = [
+    {'severity': 'Critical'},
+    {'severity': ['High', 'Critical'], 'flight_phase': 'Landing'},
+    {'airport': 'GRU - Guarulhos', 'status': 'Resolved', 'start': '2025-06-01', 'end': '2025-09-01'},
+    {'aircraft_model': 'Model C', 'start': '2025-12-15'},
+    {'incident_type': 'No such type'},
+    {'end': '2025-03-01'}
+]
+
+def brute_force(df, start=None, end=None, **predicates):
+    mask = pd.Series(True, index=df.index)
+    for column, value in predicates.items():
+        values = value if isinstance(value, list) else [value]
+        mask &= df[column].isin(values)
+    if start is not None:
+        mask &= df['timestamp'] >= pd.Timestamp(start)
+    if end is not None:
+        mask &= df['timestamp'] < pd.Timestamp(end)
+    return df[mask]
+
+@pytest.fixture(scope='module')
+def analyzer(events):
+    return SafetyAnalyzer(events)
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_query_matches_brute_force(analyzer, events, query):
+    expected = brute_force(events, **query)
+    
+    result = analyzer.query(**query)
+    
+    assert result.count() == len(expected)
+    np.testing.assert_array_equal(result.rows(), np.flatnonzero(events.index.isin(expected.index)))
+    assert result.sum('estimated_cost_usd') == pytest.approx(expected['estimated_cost_usd'].sum())
+    counts = result.value_counts('airport')
+    assert counts[counts > 0].to_dict() == expected['airport'].value_counts()[lambda c: c > 0].to_dict()
+
+def test_query_works_on_unsorted_events(events):
+    shuffled = events.sample(frac=1, random_state=0).reset_index(drop=True)
+    query = {'severity': 'High', 'start': '2025-05-01', 'end': '2025-11-01'}
+    
+    assert SafetyAnalyzer(shuffled).query(**query).count() == len(brute_force(shuffled, **query))
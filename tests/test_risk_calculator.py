@@ -0,0 +1,45 @@
+"""Vectorized scoring and classification against the per-event reference."""
+
+import numpy as np
+import pandas as pd
+
+from src.risk_calculator import RiskCalculator
+
+def test_calculate_scores_matches_reference(legacy_events):
+    expected = legacy_events.apply(RiskCalculator.calculate_individual_score, axis=1)
+    
+    scores = RiskCalculator.calculate_scores(legacy_events)
+    
+    np.testing.assert_array_equal(scores, expected.to_numpy())
+
+def test_compact_scores_match_text_layout(events, legacy_events):
+    np.testing.assert_array_equal(
+        RiskCalculator.calculate_scores(events),
+        RiskCalculator.calculate_scores(legacy_events)
+    )
+
+def test_unknown_values_and_missing_injuries_score_zero():
+    df = pd.DataFrame({
+        'severity': ['Unknown', 'High'],
+        'injuries': pd.array([pd.NA, 2], dtype='Int64'),
+        'aircraft_damage': [None, 'Minor'],
+        'flight_phase': ['Taxi', 'Landing'],
+        'status': ['Closed', 'Under Investigation']
+    })
+    
+    np.testing.assert_array_equal(RiskCalculator.calculate_scores(df), [0, 75])
+
+def test_classify_scores_matches_reference():
+    scores = [0, 29, 29.5, 30, 49, 50, 69, 70, 100, np.nan]
+    expected = [RiskCalculator.classify_risk(score) for score in scores]
+    
+    assert list(RiskCalculator.classify_scores(scores)) == expected
+
+def test_add_classification_matches_reference(events, legacy_events):
+    expected = legacy_events['risk_score'].apply(RiskCalculator.classify_risk)
+    
+    compact = RiskCalculator.add_classification(events.copy())
+    text = RiskCalculator.add_classification(legacy_events.copy())
+    
+    assert list(compact['risk_classification'].astype(str)) == list(expected)
+    assert list(text['risk_classification']) == list(expected)
@@ -0,0 +1,49 @@
+"""Rolling-window views and the live tracker against brute-force pandas windows."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.rolling import CRITICAL_SEVERITIES, RollingWindowTracker, rolling_window_view
+
+WINDOWS = {'24h': pd.Timedelta(hours=24), '7d': pd.Timedelta(days=7), '30d': pd.Timedelta(days=30)}
+
+def brute_force(df, by, group, end, length):
+    """Events, critical events and cost of one group in the window before end."""
+    selected = df[
+        (df[by] == group) & (df['timestamp'] >= end - length) & (df['timestamp'] < end)
+    ]
+    return (
+        len(selected),
+        int(selected['severity'].isin(CRITICAL_SEVERITIES).sum()),
+        round(float(selected['estimated_cost_usd'].sum()), 2)
+    )
+
+@pytest.mark.parametrize('by', ['airport', 'aircraft_model', 'incident_type'])
+def test_view_matches_brute_force(events, by):
+    view = rolling_window_view(events, by=by)
+    
+    bucket_ends = view.index.get_level_values('timestamp').unique()
+    rng = np.random.default_rng(0)
+    for end in rng.choice(bucket_ends, size=10, replace=False):
+        for group in events[by].cat.categories:
+            row = view.loc[(pd.Timestamp(end), group)]
+            for label, length in WINDOWS.items():
+                expected = brute_force(events, by, group, pd.Timestamp(end), length)
+                actual = (
+                    row[f'events_{label}'], row[f'critical_events_{label}'],
+                    row[f'cost_usd_{label}']
+                )
+                assert actual == pytest.approx(expected)
+
+def test_tracker_matches_view_at_the_end(events):
+    ordered = events.sort_values('timestamp', kind='stable')
+    tracker = RollingWindowTracker()
+    for start in range(0, len(ordered), 500):
+        tracker.update(ordered.iloc[start:start + 500])
+    
+    view = rolling_window_view(events, by='airport')
+    last = view.xs(tracker.as_of, level='timestamp')
+    snapshot = tracker.snapshot('airport')
+    
+    pd.testing.assert_frame_equal(snapshot, last, check_names=False, check_index_type=False)
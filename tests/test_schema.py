@@ -0,0 +1,44 @@
+"""Conversions between the compact schema and the published text layout."""
+
+import datetime
+
+import pandas as pd
+
+from src import schema
+
+def test_round_trip_keeps_events(events):
+    pd.testing.assert_frame_equal(schema.to_compact(schema.to_legacy(events)), events)
+
+def test_empty_frames_convert(events):
+    legacy = schema.to_legacy(events.iloc[:0])
+    
+    assert legacy.empty
+    assert list(legacy.columns) == schema.LEGACY_COLUMNS + list(schema.SCORE_SCHEMA)
+    assert schema.to_compact(legacy).empty
+
+def test_missing_flags_stay_missing(events):
+    df = events.head(3).copy()
+    df['immediate_action'] = pd.array([True, None, False], dtype='boolean')
+    
+    flags = schema.to_legacy(df)['immediate_action']
+    
+    assert list(flags.isna()) == [False, True, False]
+    assert list(flags.dropna()) == ['Yes', 'No']
+
+def test_times_read_from_excel_are_accepted():
+    dates = pd.Series(['2025-01-02', '2025-01-03'])
+    times = pd.Series([datetime.time(8, 30), '09:15'], dtype=object)
+    
+    timestamps = schema._combine_timestamp(dates, times)
+    
+    assert list(timestamps) == [pd.Timestamp('2025-01-02 08:30'), pd.Timestamp('2025-01-03 09:15')]
+
+def test_conform_returns_a_new_frame(legacy_events):
+    df = legacy_events.head(10).assign(timestamp=pd.Timestamp('2025-06-01'))
+    before = df.copy()
+    
+    conformed = schema.conform(df)
+    
+    pd.testing.assert_frame_equal(df, before)
+    assert conformed['immediate_action'].dtype == bool
+    assert 'date' not in conformed.columns
@@ -0,0 +1,150 @@
+"""KPI HTTP service: views against SafetyAnalyzer, ETags, slices and refresh."""
+
+import io
+import json
+import urllib.error
+import urllib.request
+
+import pandas as pd
+import pytest
+
+from src.analyzers import SafetyAnalyzer
+from src.exporters import DataExporter
+from src.server import KPIServer, MaterializedViews, load_test
+
+@pytest.fixture(scope='module')
+def server(events):
+    server = KPIServer(MaterializedViews(events), port=0, refresh_seconds=0)
+    server.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def get(server, path, headers=None):
+    request = urllib.request.Request(server.url + path, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+def test_reports_match_analyzer(server, events):
+    analyzer = SafetyAnalyzer(events)
+    
+    status, headers, body = get(server, '/kpis')
+    assert status == 200
+    assert json.loads(body) == pytest.approx(analyzer.calculate_main_kpis())
+    
+    _, headers, body = get(server, '/aircraft.csv')
+    assert headers['Content-Type'].startswith('text/csv')
+    expected = analyzer.analyze_by_aircraft()
+    expected.index = expected.index.astype(str)
+    pd.testing.assert_frame_equal(
+        pd.read_csv(io.BytesIO(body), index_col='aircraft_model'), expected, check_dtype=False
+    )
+    
+    _, _, body = get(server, '/trend?format=json')
+    assert json.loads(body) == analyzer.generate_time_trend().to_dict(orient='records')
+
+def test_conditional_get_returns_not_modified(server):
+    _, headers, _ = get(server, '/trend.csv')
+    
+    status, _, body = get(server, '/trend.csv', {'If-None-Match': headers['ETag']})
+    assert status == 304 and body == b''
+    assert get(server, '/trend.csv', {'If-None-Match': '"stale"'})[0] == 200
+
+def test_slices_use_the_index(server, events):
+    expected = events[events['severity'].isin(['High', 'Critical']) & (events['airport'] == 'GRU - Guarulhos')]
+    
+    status, headers, body = get(server, '/events?severity=High,Critical&airport=GRU%20-%20Guarulhos&limit=5')
+    rows = json.loads(body)
+    assert status == 200
+    assert int(headers['X-Total-Count']) == len(expected)
+    assert [row['event_id'] for row in rows] == [f'EVT{i:04d}' for i in expected['event_id'][:5]]
+    
+    _, _, body = get(server, '/events.csv?severity=Critical&start=2025-12-01&limit=1000000')
+    critical = events[(events['severity'] == 'Critical') & (events['timestamp'] >= '2025-12-01')]
+    assert len(pd.read_csv(io.BytesIO(body))) == len(critical)
+
+def test_empty_slices(server):
+    for path in ['/events?airport=XXX', '/events.csv?severity=Critical&end=2000-01-01']:
+        status, headers, body = get(server, path)
+        assert status == 200
+        assert headers['X-Total-Count'] == '0'
+    assert json.loads(get(server, '/events?airport=XXX')[2]) == []
+    
+    status, headers, body = get(server, '/events?severity=Critical&limit=0')
+    assert status == 200
+    assert int(headers['X-Total-Count']) > 0
+    assert json.loads(body) == []
+
+def test_empty_server():
+    server = KPIServer(MaterializedViews(), port=0, refresh_seconds=0)
+    server.start()
+    try:
+        status, headers, body = get(server, '/events')
+        assert status == 200 and headers['X-Total-Count'] == '0' and json.loads(body) == []
+        assert get(server, '/kpis')[0] == 503
+        assert json.loads(get(server, '/status')[2])['total_events'] == 0
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_status_formats(server, events):
+    _, headers, body = get(server, '/status.csv')
+    assert headers['Content-Type'].startswith('text/csv')
+    assert pd.read_csv(io.BytesIO(body))['total_events'][0] == len(events)
+    assert get(server, '/status.xml')[0] == 400
+
+def test_bad_requests(server):
+    assert get(server, '/events?colour=red')[0] == 400
+    assert get(server, '/events?limit=-5')[0] == 400
+    assert get(server, '/events?limit=ten')[0] == 400
+    assert get(server, '/events?start=someday')[0] == 400
+    assert get(server, '/kpis.xml')[0] == 400
+    assert get(server, '/nothing')[0] == 404
+
+def test_internal_errors_are_not_client_errors(server, monkeypatch):
+    def fail(params):
+        raise ValueError("internal")
+    monkeypatch.setattr(server.views, 'slice', fail)
+    
+    status, _, body = get(server, '/events')
+    assert status == 500
+    assert b'internal' not in body
+
+def test_update_folds_new_events(events):
+    first, second = events.iloc[:3000], events.iloc[3000:]
+    views = MaterializedViews(first)
+    trend_etag = views.report('trend').etag
+    
+    views.update(second)
+    
+    analyzer = SafetyAnalyzer(events)
+    assert views.version == 2
+    assert json.loads(views.report('kpis').body) == pytest.approx(analyzer.calculate_main_kpis())
+    assert views.report('trend').etag != trend_etag
+
+def test_refresh_follows_the_source(events, tmp_path):
+    path = str(tmp_path / 'events.csv')
+    DataExporter.export_csv(events.iloc[:4000], path)
+    views = MaterializedViews(source=path)
+    assert views.refresh() == 0
+    
+    DataExporter.export_csv(events.iloc[4000:], path, append=True)
+    assert views.refresh() == 1000
+    assert views.version == 2
+    assert views.status()['total_events'] == len(events)
+    assert views.analyzer.calculate_main_kpis() == SafetyAnalyzer(events).calculate_main_kpis()
+    
+    # Rewritten history: everything is rebuilt
+    DataExporter.export_csv(events.iloc[100:300], path)
+    assert views.refresh() == 200
+    assert views.status()['total_events'] == 200
+
+def test_load_test_reports_latencies(server):
+    result = load_test(server.url, ['/kpis', '/trend'], clients=2, requests_per_client=20, conditional=True)
+    
+    assert result['requests'] == 40
+    assert result['errors'] == 0
+    assert 0 < result['latency_ms_p50'] <= result['latency_ms_p99'] <= result['latency_ms_max']
@@ -0,0 +1,47 @@
+"""KPISimulator: reproducible Monte Carlo KPI distributions and intervals."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analyzers import SafetyAnalyzer
+from src.simulation import SIMULATED_KPIS, KPISimulator
+
+@pytest.fixture(scope='module')
+def simulator():
+    simulator = KPISimulator(num_scenarios=500, events_per_scenario=450, seed=7, block_size=200, max_workers=1)
+    simulator.run()
+    return simulator
+
+def test_results_do_not_depend_on_workers(simulator):
+    parallel = KPISimulator(num_scenarios=500, events_per_scenario=450, seed=7, block_size=200, max_workers=2)
+    parallel.run()
+    
+    for by in ['fleet', 'airport']:
+        pd.testing.assert_frame_equal(parallel.summary(by), simulator.summary(by))
+
+def test_groups_add_up_to_the_fleet(simulator):
+    fleet_cost = simulator.kpis['fleet']['total_cost_usd']['fleet']
+    
+    for by in ['aircraft_model', 'airport']:
+        np.testing.assert_allclose(simulator.kpis[by]['total_cost_usd'].sum(axis=1), fleet_cost)
+
+def test_fleet_means_match_a_large_draw(simulator, events):
+    kpis = SafetyAnalyzer(events).calculate_main_kpis()
+    summary = simulator.summary()
+    
+    assert summary.loc[('fleet', 'safety_rate'), 'mean'] == pytest.approx(kpis['safety_rate'], abs=1)
+    assert summary.loc[('fleet', 'avg_resolution_time'), 'mean'] == pytest.approx(
+        kpis['avg_resolution_time'], rel=0.05
+    )
+    assert summary.loc[('fleet', 'total_cost_usd'), 'mean'] == pytest.approx(
+        kpis['total_cost_usd'] / len(events) * 450, rel=0.05
+    )
+
+def test_summary_has_ordered_intervals(simulator):
+    summary = simulator.summary('aircraft_model', confidence=0.9)
+    
+    assert list(summary.index.get_level_values('kpi')[:3]) == SIMULATED_KPIS
+    assert (summary['ci_low'] <= summary['p50']).all()
+    assert (summary['p50'] <= summary['ci_high']).all()
+    np.testing.assert_allclose(summary['ci_low'], summary['p5'])
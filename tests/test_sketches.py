@@ -0,0 +1,104 @@
+"""Sketches: error bounds against exact answers, merging and serialization."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.live_feed import run_live_feed
+from src.sketches import HyperLogLog, QuantileSketch, SafetySketches, SpaceSaving
+
+SHARDS = 4
+
+def shards(events):
+    return [events.iloc[start::SHARDS] for start in range(SHARDS)]
+
+def sketch_of(sketch_type, series, **options):
+    sketch = sketch_type(**options)
+    sketch.update(series)
+    return sketch
+
+def test_top_k_is_exact_with_room_for_every_value(events):
+    summary = sketch_of(SpaceSaving, events['airport'], capacity=20)
+    expected = events['airport'].value_counts()
+    
+    for value, count, error in summary.top(5):
+        assert (count, error) == (expected[value], 0)
+
+def test_top_k_bounds_hold_when_merging_small_summaries(events):
+    capacity = 50
+    parts = [sketch_of(SpaceSaving, part['registration'], capacity=capacity) for part in shards(events)]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged = merged.merge(part)
+    expected = events['registration'].value_counts()
+    
+    assert merged.total == len(events)
+    for value, count, error in merged.top(capacity):
+        assert count - error <= expected[value] <= count
+        assert error <= len(events) / capacity
+
+def test_top_k_keeps_heavy_hitters():
+    values = pd.Series(['heavy'] * 300 + ['warm'] * 200 + [f'cold{i}' for i in range(1000)])
+    summary = SpaceSaving(capacity=10)
+    for start in range(0, len(values), 100):
+        summary.update(values.iloc[start:start + 100])
+    
+    assert [value for value, _, _ in summary.top(2)] == ['heavy', 'warm']
+
+@pytest.mark.parametrize('column', SafetySketches.QUANTILE_COLUMNS)
+def test_quantiles_are_within_relative_accuracy(events, column):
+    sketch = sketch_of(QuantileSketch, events[column], accuracy=0.01)
+    values = np.sort(events[column].dropna().to_numpy(dtype=float))
+    
+    for q in [0.01, 0.25, 0.5, 0.9, 0.99, 1.0]:
+        expected = values[int(q * (len(values) - 1))]
+        assert abs(sketch.quantile(q) - expected) <= 0.01 * expected + 1e-9
+    assert sketch.mean() == pytest.approx(values.mean())
+
+def test_quantile_sketch_keeps_at_most_max_bins(events):
+    sketch = sketch_of(QuantileSketch, events['estimated_cost_usd'], accuracy=0.001, max_bins=100)
+    
+    assert len(sketch.bins) == 100
+    assert sketch.quantile(0.99) == pytest.approx(
+        events['estimated_cost_usd'].quantile(0.99, interpolation='lower'), rel=0.001
+    )
+
+def test_distinct_count_is_within_three_standard_errors():
+    counter = HyperLogLog(precision=12)
+    counter.update(pd.Series(np.arange(200_000)))
+    
+    assert abs(counter.estimate() - 200_000) <= 3 * 1.04 / 2 ** 6 * 200_000
+
+def test_shard_merge_matches_one_pass(events):
+    merged = None
+    for part in shards(events):
+        sketches = SafetySketches()
+        sketches.update(part)
+        merged = sketches if merged is None else merged.merge(sketches)
+    one_pass = SafetySketches()
+    one_pass.update(events)
+    
+    # Registrations overflow the top-k capacity, so only their bounds are checked above
+    for column in ['airport', 'aircraft_model', 'incident_type']:
+        assert merged.top_k[column].top(20) == one_pass.top_k[column].top(20)
+    for column, sketch in merged.quantiles.items():
+        np.testing.assert_array_equal(sketch.bins, one_pass.quantiles[column].bins)
+    for column, counter in merged.distinct.items():
+        np.testing.assert_array_equal(counter.registers, one_pass.distinct[column].registers)
+    assert merged.summary()['distinct']['investigator'] == events['investigator'].nunique()
+
+def test_sketches_survive_json(events):
+    sketches = SafetySketches()
+    sketches.update(events)
+    
+    restored = SafetySketches.from_dict(json.loads(json.dumps(sketches.to_dict())))
+    
+    assert restored.summary() == sketches.summary()
+
+def test_live_feed_keeps_sketches_in_sketch_mode():
+    stats = run_live_feed(1_000, events_per_second=1e6, batch_size=100, seed=1, sketches=True)
+    
+    assert stats['sketches']['total_events'] == 1_000
+    assert sum(count for _, count, _ in stats['sketches']['top']['aircraft_model']) <= 1_000
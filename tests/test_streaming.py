@@ -0,0 +1,83 @@
+"""Chunked StreamingSafetyAnalyzer aggregates against a one-shot SafetyAnalyzer."""
+
+import numpy as np
+import pytest
+
+from src.analyzers import SafetyAnalyzer, StreamingSafetyAnalyzer
+
+CHUNK_SIZE = 700
+
+@pytest.fixture(scope='module')
+def one_shot(events):
+    return SafetyAnalyzer(events)
+
+@pytest.fixture(scope='module')
+def streamed(events):
+    analyzer = StreamingSafetyAnalyzer()
+    for start in range(0, len(events), CHUNK_SIZE):
+        analyzer.update(events.iloc[start:start + CHUNK_SIZE])
+    return analyzer
+
+def test_kpis_match_one_shot(streamed, one_shot):
+    assert streamed.calculate_main_kpis() == pytest.approx(one_shot.calculate_main_kpis())
+
+def test_aircraft_analysis_matches_one_shot(streamed, one_shot):
+    streamed_analysis = streamed.analyze_by_aircraft()
+    expected = one_shot.analyze_by_aircraft()
+    
+    assert list(streamed_analysis.index.astype(str)) == list(expected.index.astype(str))
+    np.testing.assert_allclose(
+        streamed_analysis.to_numpy(dtype=float), expected.to_numpy(dtype=float)
+    )
+
+def test_time_trend_matches_one_shot(streamed, one_shot):
+    trend = streamed.generate_time_trend()
+    expected = one_shot.generate_time_trend()
+    
+    for column in ['year', 'month', 'events', 'year_month']:
+        assert list(trend[column]) == list(expected[column])
+
+def test_merge_order_does_not_matter(events):
+    parts = [
+        StreamingSafetyAnalyzer.compute_partials(events.iloc[start:start + CHUNK_SIZE])
+        for start in range(0, len(events), CHUNK_SIZE)
+    ]
+    forward = StreamingSafetyAnalyzer()
+    backward = StreamingSafetyAnalyzer()
+    forward.partials = parts[0]
+    backward.partials = parts[-1]
+    for part in parts[1:]:
+        forward.partials = StreamingSafetyAnalyzer.merge_partials(forward.partials, part)
+    for part in reversed(parts[:-1]):
+        backward.partials = StreamingSafetyAnalyzer.merge_partials(backward.partials, part)
+    
+    assert forward.calculate_main_kpis() == pytest.approx(backward.calculate_main_kpis())
+
+def test_large_chunks_do_not_overflow_sums(events):
+    # Per-model resolution sums of eight 5000-event chunks exceed the UInt16 range
+    analyzer = StreamingSafetyAnalyzer()
+    for _ in range(8):
+        analyzer.update(events)
+    
+    np.testing.assert_allclose(
+        analyzer.analyze_by_aircraft()['resolution_days'].to_numpy(dtype=float),
+        SafetyAnalyzer(events).analyze_by_aircraft()['resolution_days'].to_numpy(dtype=float)
+    )
+
+def test_critical_patterns_match_one_shot(streamed, one_shot):
+    assert streamed.identify_critical_patterns() == one_shot.identify_critical_patterns()
+
+def test_unscored_chunks_leave_risk_unknown(events):
+    scored = events.iloc[:2000]
+    unscored = events.iloc[2000:4000].drop(columns='risk_score')
+    
+    for parts in [(scored, unscored), (unscored, scored)]:
+        analyzer = StreamingSafetyAnalyzer()
+        for part in parts:
+            analyzer.update(part)
+        analysis = analyzer.analyze_by_aircraft()
+        assert analysis['risk_score'].isna().all()
+        np.testing.assert_allclose(
+            analysis['total_events'].to_numpy(dtype=float),
+            SafetyAnalyzer(events.iloc[:4000]).analyze_by_aircraft()['total_events'].to_numpy(dtype=float)
+        )